@@ -285,3 +285,42 @@ color_families = {
 broad_neutrals = set(color_families['Neutrals'] + color_families['Greys'] + color_families['Browns'] + color_families['Metallics'])
 color_families['Broad Neutrals'] = sorted(list(broad_neutrals))
 
+
+# Families that hue-based palette generators draw their base color from.
+# The candidate list keeps duplicates (e.g. MAGENTA is both a Red and a Pink) so that
+# base colors are weighted exactly as the generators have always weighted them.
+BASE_COLOR_FAMILIES = ['Reds', 'Pinks', 'Oranges', 'Yellows', 'Greens', 'Blues', 'Purples']
+BASE_COLOR_CANDIDATES = [name for fam in BASE_COLOR_FAMILIES for name in color_families[fam]]
+
+# ----------------------------
+# Integer Color Registry
+# ----------------------------
+# Every color has a fixed index, and a bitmask of the families it belongs to
+# (one bit per color_families entry, including Broad Neutrals, Warm Colors and Cool Colors).
+COLOR_NAMES = list(COLORS.keys())
+COLOR_NAME_INDEX = {name: i for i, name in enumerate(COLOR_NAMES)}
+
+FAMILY_NAMES = list(color_families.keys())
+FAMILY_BITS = {family: 1 << i for i, family in enumerate(FAMILY_NAMES)}
+WARM_BIT = FAMILY_BITS['Warm Colors']
+COOL_BIT = FAMILY_BITS['Cool Colors']
+BROAD_NEUTRALS_BIT = FAMILY_BITS['Broad Neutrals']
+
+def _build_family_masks():
+    masks = dict.fromkeys(COLOR_NAMES, 0)
+    for family, members in color_families.items():
+        for name in members:
+            masks[name] = masks.get(name, 0) | FAMILY_BITS[family]
+    return masks
+
+# Color name -> family bitmask; COLOR_MASKS holds the same masks by color index.
+COLOR_FAMILY_MASKS = _build_family_masks()
+COLOR_MASKS = [COLOR_FAMILY_MASKS[name] for name in COLOR_NAMES]
+
+def family_bit(family):
+    """Bit for a color family name; 0 for "None" or an unknown family, which matches no color."""
+    return FAMILY_BITS.get(family, 0)
+
+def in_family(name, family_bits):
+    """True if the color belongs to any of the families in family_bits."""
+    return (COLOR_FAMILY_MASKS.get(name, 0) & family_bits) != 0
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+import colorsys
+import math
+import os
+import random
+from functools import lru_cache
+from .color_data import COLORS, BASE_COLOR_CANDIDATES
+from . import palette_stats
+
+# ----------------------------
+# Conversion & Utility Functions
+# ----------------------------
+def _pack_hex(hex_code):
+    """Convert a hex color code to a packed 24-bit integer (0xRRGGBB)."""
+    hex_code = hex_code.lstrip('#')
+    if len(hex_code) != 6:
+        raise ValueError("Hex code must be 6 digits long.")
+    return int(hex_code, 16)
+
+@lru_cache(maxsize=4096)
+def hex_to_rgb(hex_code):
+    """Convert a hex color code to an RGB tuple with components in the range [0, 1]."""
+    packed = _pack_hex(hex_code)
+    return ((packed >> 16) / 255.0, ((packed >> 8) & 0xFF) / 255.0, (packed & 0xFF) / 255.0)
+
+def rgb_to_hex(rgb):
+    """Convert an RGB tuple with components in the range [0, 1] to a hex color code."""
+    return '#{:02x}{:02x}{:02x}'.format(
+        int(rgb[0] * 255),
+        int(rgb[1] * 255),
+        int(rgb[2] * 255)
+    )
+
+@lru_cache(maxsize=4096)
+def hex_to_rgb_tuple(hex_code):
+    """Convert a hex code to an (R, G, B) tuple with values 0-255."""
+    packed = _pack_hex(hex_code)
+    return (packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF)
+
+@lru_cache(maxsize=4096)
+def hex_to_hls(hex_code):
+    """Convert a hex color code to an (H, L, S) tuple with components in the range [0, 1]."""
+    return colorsys.rgb_to_hls(*hex_to_rgb(hex_code))
+
+def hls_to_hex(h, l, s):
+    """Convert (H, L, S) components in the range [0, 1] to a hex color code."""
+    return rgb_to_hex(colorsys.hls_to_rgb(h, l, s))
+
+def color_distance(rgb1, rgb2):
+    """Compute the Euclidean distance between two RGB colors (in 0-255 space)."""
+    dr = rgb1[0] - rgb2[0]
+    dg = rgb1[1] - rgb2[1]
+    db = rgb1[2] - rgb2[2]
+    return (dr * dr + dg * dg + db * db) ** 0.5
+
+# ----------------------------
+# CIELAB & Delta E
+# ----------------------------
+# D65 reference white for XYZ -> Lab.
+_WHITE_X, _WHITE_Y, _WHITE_Z = 0.95047, 1.0, 1.08883
+
+def _srgb_to_linear(c):
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+def _lab_f(t):
+    return t ** (1.0 / 3.0) if t > 216.0 / 24389.0 else (24389.0 / 27.0 * t + 16.0) / 116.0
+
+def rgb_to_lab(rgb):
+    """Convert an (R, G, B) tuple with values 0-255 (sRGB, D65) to CIELAB (L*, a*, b*)."""
+    r, g, b = (_srgb_to_linear(c / 255.0) for c in rgb)
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / _WHITE_X
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / _WHITE_Y
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / _WHITE_Z
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    return (116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz))
+
+@lru_cache(maxsize=4096)
+def hex_to_lab(hex_code):
+    """Convert a hex color code to CIELAB (L*, a*, b*)."""
+    return rgb_to_lab(hex_to_rgb_tuple(hex_code))
+
+def delta_e76(lab1, lab2):
+    """CIE76 color difference: Euclidean distance in Lab space."""
+    dl = lab1[0] - lab2[0]
+    da = lab1[1] - lab2[1]
+    db = lab1[2] - lab2[2]
+    return (dl * dl + da * da + db * db) ** 0.5
+
+def delta_e2000(lab1, lab2):
+    """CIEDE2000 color difference (kL = kC = kH = 1)."""
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c_bar = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2.0
+    c_bar7 = c_bar ** 7
+    g = 0.5 * (1.0 - math.sqrt(c_bar7 / (c_bar7 + 25.0 ** 7)))
+    a1p = (1.0 + g) * a1
+    a2p = (1.0 + g) * a2
+    c1p = math.hypot(a1p, b1)
+    c2p = math.hypot(a2p, b2)
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360.0 if c1p else 0.0
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360.0 if c2p else 0.0
+
+    dlp = l2 - l1
+    dcp = c2p - c1p
+    if c1p * c2p == 0.0:
+        dhp = 0.0
+    else:
+        dhp = h2p - h1p
+        if dhp > 180.0:
+            dhp -= 360.0
+        elif dhp < -180.0:
+            dhp += 360.0
+    dhp_big = 2.0 * math.sqrt(c1p * c2p) * math.sin(math.radians(dhp) / 2.0)
+
+    lp_bar = (l1 + l2) / 2.0
+    cp_bar = (c1p + c2p) / 2.0
+    if c1p * c2p == 0.0:
+        hp_bar = h1p + h2p
+    elif abs(h1p - h2p) <= 180.0:
+        hp_bar = (h1p + h2p) / 2.0
+    elif h1p + h2p < 360.0:
+        hp_bar = (h1p + h2p + 360.0) / 2.0
+    else:
+        hp_bar = (h1p + h2p - 360.0) / 2.0
+
+    t = (1.0 - 0.17 * math.cos(math.radians(hp_bar - 30.0)) + 0.24 * math.cos(math.radians(2.0 * hp_bar))
+         + 0.32 * math.cos(math.radians(3.0 * hp_bar + 6.0)) - 0.20 * math.cos(math.radians(4.0 * hp_bar - 63.0)))
+    d_theta = 30.0 * math.exp(-(((hp_bar - 275.0) / 25.0) ** 2))
+    cp_bar7 = cp_bar ** 7
+    r_c = 2.0 * math.sqrt(cp_bar7 / (cp_bar7 + 25.0 ** 7))
+    lp50 = (lp_bar - 50.0) ** 2
+    s_l = 1.0 + 0.015 * lp50 / math.sqrt(20.0 + lp50)
+    s_c = 1.0 + 0.045 * cp_bar
+    s_h = 1.0 + 0.015 * cp_bar * t
+    r_t = -math.sin(math.radians(2.0 * d_theta)) * r_c
+
+    return math.sqrt((dlp / s_l) ** 2 + (dcp / s_c) ** 2 + (dhp_big / s_h) ** 2
+                     + r_t * (dcp / s_c) * (dhp_big / s_h))
+
+@lru_cache(maxsize=8192)
+def shift_hue(hex_code, degree_offset=15):
+    """
+    Shifts the hue of the given hex color by the specified degree offset.
+    The degree_offset is added to the hue (in degrees) and wrapped around if necessary.
+    Results are memoized per (hex_code, degree_offset).
+    """
+    h, l, s = hex_to_hls(hex_code)
+    new_h = (h + degree_offset / 360.0) % 1.0
+    return hls_to_hex(new_h, l, s)
+
+# ----------------------------
+# Base Color Selection
+# ----------------------------
+def generate_random_base_color(base_colors=None, rng=random):
+    """
+    Pick a random base color for a hue-based palette. Returns (name, hex).
+    base_colors optionally restricts the choice to a subset of BASE_COLOR_CANDIDATES.
+    """
+    if palette_stats.ENABLED:
+        palette_stats.count("base_draws")
+    name = rng.choice(BASE_COLOR_CANDIDATES if base_colors is None else base_colors)
+    return name, COLORS[name]
+
+# ----------------------------
+# Nearest Color Index
+# ----------------------------
+# Nearest-color metrics: "rgb" (Euclidean RGB distance, the default) or the perceptual CIELAB
+# differences "de76" and "de2000". Set the EBU_PROMPTHELPER_COLOR_METRIC environment variable to
+# pick the metric the palette generators use; it is read once at import.
+COLOR_METRICS = ("rgb", "de76", "de2000")
+COLOR_METRIC_ENV = "EBU_PROMPTHELPER_COLOR_METRIC"
+
+def _configured_metric():
+    metric = os.environ.get(COLOR_METRIC_ENV, "rgb").strip().lower() or "rgb"
+    if metric not in COLOR_METRICS:
+        print(f"Warning: unknown {COLOR_METRIC_ENV} value {metric!r}; using rgb.")
+        return "rgb"
+    return metric
+
+COLOR_METRIC = _configured_metric()
+
+class ColorIndex:
+    """
+    Nearest-name lookup over a fixed color dictionary.
+
+    The coordinates of every entry (RGB, or Lab for the perceptual metrics) are computed once
+    when the index is built. Lookups are memoized in a sparse 24-bit table keyed by the packed
+    RGB value, so repeated queries for the same hex code (which is what the palette generators
+    do) cost a single dict lookup. Ties are resolved the same way as the original linear scan:
+    the first entry in dictionary order wins.
+    """
+    # Upper bound for the memo table; palette generation touches a few thousand values at most.
+    MAX_CACHE_ENTRIES = 1 << 16
+
+    def __init__(self, color_dict, metric="rgb"):
+        if metric not in COLOR_METRICS:
+            raise ValueError("Unknown color metric: " + metric)
+        self.metric = metric
+        self.entries = []
+        for name, hex_code in color_dict.items():
+            if metric == "rgb":
+                packed = _pack_hex(hex_code)
+                self.entries.append((name, packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF))
+            else:
+                self.entries.append((name, hex_to_lab(hex_code)))
+        self._cache = {}
+
+    def _scan(self, packed):
+        r, g, b = packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF
+        if self.metric != "rgb":
+            return self._scan_lab(rgb_to_lab((r, g, b)))
+        closest_name = None
+        min_dist = 196608  # larger than any squared distance in 0-255 space
+        for name, cr, cg, cb in self.entries:
+            dr = r - cr
+            dg = g - cg
+            db = b - cb
+            dist = dr * dr + dg * dg + db * db
+            if dist < min_dist:
+                min_dist = dist
+                closest_name = name
+        return closest_name
+
+    def _scan_lab(self, lab):
+        distance = delta_e2000 if self.metric == "de2000" else delta_e76
+        closest_name = None
+        min_dist = float('inf')
+        for name, entry_lab in self.entries:
+            dist = distance(lab, entry_lab)
+            if dist < min_dist:
+                min_dist = dist
+                closest_name = name
+        return closest_name
+
+    def closest(self, target_hex):
+        """Return the name of the entry closest to target_hex under this index's metric."""
+        packed = _pack_hex(target_hex)
+        name = self._cache.get(packed)
+        if palette_stats.ENABLED:
+            palette_stats.count("nearest_lookups")
+            if name is None:
+                palette_stats.count("nearest_scans")
+        if name is None:
+            name = self._scan(packed)
+            if len(self._cache) >= self.MAX_CACHE_ENTRIES:
+                self._cache.clear()
+            self._cache[packed] = name
+        return name
+
+_COLOR_INDEXES = {}
+
+def get_color_index(metric=None):
+    """The shared index over COLORS for a metric (default COLOR_METRIC), built on first use."""
+    metric = metric or COLOR_METRIC
+    index = _COLOR_INDEXES.get(metric)
+    if index is None:
+        index = _COLOR_INDEXES[metric] = ColorIndex(COLORS, metric)
+    return index
+
+# Shared index over the master COLORS dictionary for the configured metric.
+COLOR_INDEX = get_color_index()
+
+def find_closest_color_name(target_hex, color_dict=COLORS, metric=None):
+    """
+    Given a target hex code and a dictionary mapping color names to hex codes, return the name
+    of the closest matching color under metric (default COLOR_METRIC). Lookups against COLORS
+    go through the shared precomputed index for that metric.
+    """
+    if color_dict is COLORS:
+        return get_color_index(metric).closest(target_hex)
+    if (metric or COLOR_METRIC) == "rgb":
+        return find_closest_color_name_linear(target_hex, color_dict)
+    return ColorIndex(color_dict, metric or COLOR_METRIC).closest(target_hex)
+
+def find_closest_color_name_linear(target_hex, color_dict):
+    """
+    Reference implementation kept for benchmarking: the original full linear scan that
+    re-parses every hex code on each call.
+    """
+    def parse(hex_code):
+        hex_code = hex_code.lstrip('#')
+        return (int(hex_code[0:2], 16), int(hex_code[2:4], 16), int(hex_code[4:6], 16))
+
+    target_rgb = parse(target_hex)
+    closest_name = None
+    min_dist = float('inf')
+    for name, hex_code in color_dict.items():
+        current_rgb = parse(hex_code)
+        dist = math.sqrt(sum((a - b) ** 2 for a, b in zip(target_rgb, current_rgb)))
+        if dist < min_dist:
+            min_dist = dist
+            closest_name = name
+    return closest_name
+
+def closest_color_names(hex_codes, metric=None):
+    """Return the closest COLORS names for a sequence of hex codes, as a tuple."""
+    index = get_color_index(metric)
+    return tuple(index.closest(h) for h in hex_codes)
+
+# Every color name mapped to the name its own hex code resolves to. These differ only for
+# colors that share a hex code with an earlier entry (e.g. SEAFOAM resolves to MINT GREEN).
+CANONICAL_COLOR_NAMES = {name: COLOR_INDEX.closest(hex_code) for name, hex_code in COLORS.items()}
+
+# ----------------------------
+# Precomputed Base Color Tables
+# ----------------------------
+class PaletteTable(dict):
+    """
+    Per-base-color palette data, keyed by base color name and computed by builder(base_hex).
+    Entries for every BASE_COLOR_CANDIDATES color are built at import time; any other color
+    name is computed on first use and kept.
+    """
+    def __init__(self, builder):
+        super().__init__()
+        self.builder = builder
+        for name in BASE_COLOR_CANDIDATES:
+            if name not in self:
+                self[name] = builder(COLORS[name])
+
+    def __missing__(self, name):
+        entry = self[name] = self.builder(COLORS[name])
+        return entry
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import glob
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Memory cap for cached file contents, in MB. Override with the EBU_PROMPTHELPER_FILE_CACHE_MB
+# environment variable (0 disables caching).
+DEFAULT_CACHE_MB = 64
+CACHE_MB_ENV = "EBU_PROMPTHELPER_FILE_CACHE_MB"
+
+def file_signature(path):
+    """(mtime_ns, size) of a file; raises OSError if it cannot be stat'ed."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class FileCache:
+    """
+    In-process LRU cache of decoded text files, keyed by (path, mtime_ns, size) so a changed file
+    is always re-read. Entries are evicted least-recently-used first once the cached files'
+    total size exceeds max_bytes; files larger than max_bytes are never cached.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, encoding, text)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def read_text(self, path, encoding='utf-8'):
+        """Return the file's text, from the cache when its mtime and size are unchanged."""
+        path = os.path.abspath(path)
+        mtime_ns, size = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[:3] == (mtime_ns, size, encoding):
+                self._entries.move_to_end(path)
+                return entry[3]
+
+        with open(path, 'r', encoding=encoding) as file:
+            text = file.read()
+
+        with self._lock:
+            self._discard(path)
+            if size <= self.max_bytes:
+                self._entries[path] = (mtime_ns, size, encoding, text)
+                self._total += size
+                while self._total > self.max_bytes:
+                    self._discard(next(iter(self._entries)))
+        return text
+
+    def _discard(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._total -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+def _configured_max_bytes():
+    try:
+        return int(float(os.environ.get(CACHE_MB_ENV, DEFAULT_CACHE_MB)) * 1024 * 1024)
+    except ValueError:
+        print(f"Warning: invalid {CACHE_MB_ENV} value; using {DEFAULT_CACHE_MB} MB.")
+        return DEFAULT_CACHE_MB * 1024 * 1024
+
+# Shared cache used by the file loading nodes.
+FILE_CACHE = FileCache(_configured_max_bytes())
+
+# ----------------------------
+# Parallel Reads & Prefetch
+# ----------------------------
+_EXECUTOR = ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) + 4), thread_name_prefix="ebu-file-cache")
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+def submit_read(path, encoding='utf-8'):
+    """
+    Start reading a file into FILE_CACHE on the shared thread pool and return its Future.
+    A read already in flight for the same file is reused rather than started again.
+    """
+    key = (os.path.abspath(path), encoding)
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        if future is not None:
+            return future
+        future = _EXECUTOR.submit(FILE_CACHE.read_text, key[0], encoding)
+        _INFLIGHT[key] = future
+    # Outside the lock: the callback runs immediately if the read has already finished.
+    future.add_done_callback(lambda done, key=key: _finish_read(key, done))
+    return future
+
+def _finish_read(key, future):
+    with _INFLIGHT_LOCK:
+        if _INFLIGHT.get(key) is future:
+            del _INFLIGHT[key]
+
+def prefetch(paths, encoding='utf-8'):
+    """Warm FILE_CACHE with the given files in the background."""
+    for path in paths:
+        submit_read(path, encoding)
+
+def read_texts(paths, encoding='utf-8'):
+    """
+    Read several files in parallel through FILE_CACHE. Returns a list of (path, text) pairs in
+    the given order; files that cannot be read are reported and left out.
+    """
+    futures = [(path, submit_read(path, encoding)) for path in paths]
+    results = []
+    for path, future in futures:
+        try:
+            results.append((path, future.result()))
+        except Exception as e:
+            print(f"Error reading file {path}: {e}")
+    return results
+
+def matching_files(directory, pattern="*.txt"):
+    """Sorted paths of the regular files in directory matching a glob pattern ('**' recurses)."""
+    paths = glob.glob(os.path.join(directory, pattern), recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Random access to the lines of large text files.
+
+A line-offset index is built once per file and saved next to it as <file>.lineidx. The index
+records the file's mtime and size and is rebuilt when either changes. Lines are read through
+mmap, so fetching k lines costs O(k) I/O no matter how large the file is.
+"""
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INDEX_SUFFIX = ".lineidx"
+_MAGIC = b"EBULIDX1"
+# magic, source mtime_ns, source size, line count
+_HEADER = struct.Struct("<8sQQQ")
+_CHUNK_SIZE = 1 << 22
+
+# ----------------------------
+# Index Building & Persistence
+# ----------------------------
+def _newline_positions(chunk):
+    """Positions of b'\\n' in a bytes chunk."""
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10).tolist()
+    positions = []
+    pos = chunk.find(b'\n')
+    while pos != -1:
+        positions.append(pos)
+        pos = chunk.find(b'\n', pos + 1)
+    return positions
+
+def build_line_offsets(path, size):
+    """Scan a file and return an array of the byte offset where each line starts."""
+    offsets = array('Q', [0] if size else [])
+    with open(path, 'rb') as f:
+        base = 0
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            offsets.extend(base + pos + 1 for pos in _newline_positions(chunk))
+            base += len(chunk)
+    # A trailing newline does not start another line.
+    if offsets and offsets[-1] == size:
+        offsets.pop()
+    return offsets
+
+def _load_saved_offsets(index_path, mtime_ns, size):
+    try:
+        with open(index_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                return None
+            magic, saved_mtime, saved_size, count = _HEADER.unpack(header)
+            if magic != _MAGIC or saved_mtime != mtime_ns or saved_size != size:
+                return None
+            offsets = array('Q')
+            offsets.fromfile(f, count)
+            return offsets
+    except (OSError, EOFError):
+        return None
+
+def _save_offsets(index_path, offsets, mtime_ns, size):
+    """Write the index atomically; an unwritable directory just means it is rebuilt next time."""
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, mtime_ns, size, len(offsets)))
+            offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        print(f"Warning: could not save line index {index_path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# ----------------------------
+# Line Access
+# ----------------------------
+def _decode_text(data):
+    """Decode UTF-8 bytes with newlines translated to '\\n', as reading the file in text mode would."""
+    text = data.decode('utf-8', errors='replace')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _strip_line_ending(data):
+    if data.endswith(b'\n'):
+        data = data[:-1]
+    if data.endswith(b'\r'):
+        data = data[:-1]
+    return data
+
+class LineIndex:
+    """
+    A text file viewed as a sequence of lines (len() and [i]), backed by a line-offset index
+    and an mmap of the file. Lines are decoded as UTF-8 without their line ending. The mmap is
+    opened on first access; use the index as a context manager (or call close()) to release it
+    when done, so the file is not held open. A closed index reopens the map if read again.
+    """
+    def __init__(self, path, offsets, mtime_ns, size):
+        self.path = path
+        self.offsets = offsets
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self._map = None
+
+    def _mapped(self):
+        mapped = self._map
+        if mapped is None:
+            with open(self.path, 'rb') as f:
+                mapped = self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self.offsets)
+        start = self.offsets[i]
+        end = self.offsets[i + 1] if i + 1 < len(self.offsets) else self.size
+        return _strip_line_ending(self._mapped()[start:end]).decode('utf-8', errors='replace')
+
+    def text(self, start=0, count=None):
+        """
+        Text of `count` lines beginning at line `start` (to the end of the file if count is None),
+        decoded from a single mmap slice. The final line ending is dropped and newlines are
+        translated to '\\n'.
+        """
+        n = len(self.offsets)
+        start = max(0, min(start, n))
+        end_line = n if count is None else max(start, min(start + count, n))
+        if start == end_line:
+            return ""
+        end = self.offsets[end_line] if end_line < n else self.size
+        return _decode_text(_strip_line_ending(self._mapped()[self.offsets[start]:end]))
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Line offsets kept in memory as path -> (mtime_ns, size, offsets), least recently used first.
+# They hold no open files: every get_line_index call gets its own LineIndex and mmap.
+MAX_INDEXES = 32
+_INDEXES = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+# Per-path locks held while an index is built, so one file is scanned once at a time without
+# blocking lookups of other files.
+_BUILD_LOCKS = {}
+
+def _cached_offsets(path, mtime_ns, size):
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(path)
+        if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+            _INDEXES.move_to_end(path)
+            return cached[2]
+        return None
+
+def get_line_index(path):
+    """
+    Return a LineIndex for path, reusing the in-memory or saved offsets while the file's mtime
+    and size are unchanged, and building (and saving) new ones otherwise. Close the index (or use
+    it in a with block) once done reading. Raises OSError if the file cannot be read.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    mtime_ns, size = stat.st_mtime_ns, stat.st_size
+    offsets = _cached_offsets(path, mtime_ns, size)
+    if offsets is None:
+        with _INDEXES_LOCK:
+            build_lock = _BUILD_LOCKS.setdefault(path, threading.Lock())
+        try:
+            with build_lock:
+                # Another thread may have built it while this one waited.
+                offsets = _cached_offsets(path, mtime_ns, size)
+                if offsets is None:
+                    index_path = path + INDEX_SUFFIX
+                    offsets = _load_saved_offsets(index_path, mtime_ns, size)
+                    if offsets is None:
+                        offsets = build_line_offsets(path, size)
+                        _save_offsets(index_path, offsets, mtime_ns, size)
+                    with _INDEXES_LOCK:
+                        _INDEXES.pop(path, None)
+                        _INDEXES[path] = (mtime_ns, size, offsets)
+                        while len(_INDEXES) > MAX_INDEXES:
+                            _INDEXES.popitem(last=False)
+        finally:
+            with _INDEXES_LOCK:
+                _BUILD_LOCKS.pop(path, None)
+    return LineIndex(path, offsets, mtime_ns, size)
+
+# ----------------------------
+# Byte Ranges
+# ----------------------------
+def _is_continuation_byte(byte):
+    return byte & 0xC0 == 0x80
+
+def read_byte_range(path, start=0, limit=None):
+    """
+    Decode up to `limit` bytes of a file starting at byte `start` (to the end if limit is None)
+    through mmap, so only that range is read. Both ends are moved to UTF-8 character boundaries:
+    the start forward past a partial character, the end back before one. Newlines are translated
+    to '\\n'.
+    """
+    size = os.path.getsize(path)
+    start = max(0, min(start, size))
+    end = size if limit is None else max(start, min(start + limit, size))
+    if start == end:
+        return ""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        while start < end and _is_continuation_byte(mapped[start]):
+            start += 1
+        if end < size:
+            while end > start and _is_continuation_byte(mapped[end]):
+                end -= 1
+        return _decode_text(mapped[start:end])
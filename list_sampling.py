@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import random
+import re
+
+# Leading list numbers followed by a dot (e.g., "1. ", "23. ").
+LEADING_NUMBER = re.compile(r'^\d+\.\s*')
+
+# ----------------------------
+# Line Cleanup
+# ----------------------------
+def clean_line(line):
+    """Remove a leading list number and surrounding whitespace from a line."""
+    return LEADING_NUMBER.sub('', line).strip()
+
+def is_blank_line(line):
+    """True if the line cleans to nothing (see clean_line)."""
+    return clean_line(line) == ''
+
+# ----------------------------
+# Sampling
+# ----------------------------
+def iter_shuffled_indices(n, rng=random):
+    """
+    Yield a random permutation of range(n) one index at a time (a lazy Fisher-Yates shuffle).
+    Taking the first k costs O(k) time and memory, independent of n.
+    """
+    swapped = {}
+    for i in range(n):
+        j = rng.randrange(i, n)
+        picked = swapped.get(j, j)
+        swapped[j] = swapped.pop(i, i)
+        yield picked
+
+def sample_lines(lines, k, rng=random):
+    """
+    Return up to k cleaned, non-empty lines from a sequence, in random order. Lines are drawn
+    without replacement and only drawn lines are cleaned; lines that clean to nothing are skipped.
+    """
+    selected = []
+    if k <= 0:
+        return selected
+    for index in iter_shuffled_indices(len(lines), rng):
+        line = clean_line(lines[index])
+        if line:
+            selected.append(line)
+            if len(selected) == k:
+                break
+    return selected
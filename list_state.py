@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Persistent, resumable walks through a list in random order.
+
+Each named list keeps a small state file holding the list's fingerprint, the seed of its
+shuffle and how far the walk has got. The shuffled order itself is never saved: it is rebuilt
+from the seed once per process and kept in memory, so each step after that costs O(1).
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+from array import array
+from functools import lru_cache
+
+# Directory for list state files. Override with the EBU_PROMPTHELPER_LIST_STATE_DIR environment variable.
+STATE_DIR_ENV = "EBU_PROMPTHELPER_LIST_STATE_DIR"
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "list_state")
+
+LIST_ACTIONS = ["consume", "peek", "reset"]
+
+_UNSAFE_ID_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+def state_dir():
+    return os.environ.get(STATE_DIR_ENV) or DEFAULT_STATE_DIR
+
+def text_fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=8)
+def text_items(text):
+    """(fingerprint, lines) of a newline-separated list, cached so repeated runs skip re-splitting."""
+    return text_fingerprint(text), tuple(text.splitlines())
+
+def _state_path(list_id):
+    # Sanitized for the file name, with a hash so distinct ids never share a file.
+    safe = _UNSAFE_ID_CHARS.sub('_', list_id)[:64]
+    return os.path.join(state_dir(), f"{safe}-{text_fingerprint(list_id)[:12]}.json")
+
+# ----------------------------
+# State Persistence
+# ----------------------------
+def _load_state(list_id):
+    try:
+        with open(_state_path(list_id), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return {key: state[key] for key in ("fingerprint", "seed", "cursor", "n")}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_state(list_id, state):
+    """Write the state atomically; failures only mean the walk will not survive a restart."""
+    path = _state_path(list_id)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not save list state {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+# ----------------------------
+# Stateful Walks
+# ----------------------------
+_LOCK = threading.Lock()
+
+@lru_cache(maxsize=8)
+def _permutation(n, seed):
+    """The shuffled order of a walk; a few are kept so walks over different lists don't evict each other."""
+    indices = list(range(n))
+    random.Random(seed).shuffle(indices)
+    return array('Q', indices)
+
+def step_list(list_id, items, fingerprint, seed, action="consume"):
+    """
+    Take the next item of the named list's shuffled walk. `items` is any sequence supporting
+    len() and indexing, and `fingerprint` identifies its contents. Empty items are passed over.
+
+    - consume: return the next item and advance past it.
+    - peek: return the next item without advancing.
+    - reset: start a new walk shuffled with `seed` and return "".
+
+    The walk also starts over (with `seed`) when the list's fingerprint changes. Returns "" once
+    the list is used up.
+    """
+    n = len(items)
+    with _LOCK:
+        state = _load_state(list_id)
+        fresh = action == "reset" or state is None or state["fingerprint"] != fingerprint or state["n"] != n
+        if fresh:
+            state = {"fingerprint": fingerprint, "seed": seed, "cursor": 0, "n": n}
+        if action == "reset":
+            _save_state(list_id, state)
+            return ""
+
+        order = _permutation(n, state["seed"])
+        cursor = state["cursor"]
+        item = ""
+        while cursor < n:
+            item = items[order[cursor]].strip()
+            if item:
+                break
+            cursor += 1
+        if action == "consume" and cursor < n:
+            cursor += 1
+        if fresh or cursor != state["cursor"]:
+            state["cursor"] = cursor
+            _save_state(list_id, state)
+        return item
@@ -1,68 +1,78 @@
 #!/usr/bin/env python3
 import sys
 import random
-from .color_data import COLORS, color_families
+from .color_data import COLORS, color_families, family_bit, in_family
+from . import palette_stats
 
-def generate_art_house_palette_4():
+def _valid_warm_colors():
+    """Warm colors that are not metallic, grey, or pastel, in color_families order (so seeded draws are reproducible)."""
+    excluded = family_bit("Metallics") | family_bit("Greys") | family_bit("Pastels")
+    return [c for c in dict.fromkeys(color_families.get("Warm Colors", [])) if not in_family(c, excluded)]
+
+def generate_art_house_palette_4(rng=random):
     greys = color_families.get("Greys", [])
     if len(greys) < 3:
         raise ValueError("Not enough grey colors available.")
 
-    warm_colors = set(color_families.get("Warm Colors", []))
-    excluded = set(color_families.get("Metallics", [])) | set(color_families.get("Greys", [])) | set(color_families.get("Pastels", []))
-    valid_warm = list(warm_colors - excluded)
+    valid_warm = _valid_warm_colors()
     if not valid_warm:
         raise ValueError("No valid Warm Colors available.")
 
     max_attempts = 50
     for _ in range(max_attempts):
-        grey_palette = random.sample(greys, 3)
-        warm_color = random.choice(valid_warm)
+        grey_palette = rng.sample(greys, 3)
+        warm_color = rng.choice(valid_warm)
         palette = grey_palette + [warm_color]
         if len(set(palette)) == 4:
             return palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # Fallback: If we couldn't get 4 unique colors after max attempts,
     # try different combinations of greys and warm colors
-    grey_palette = random.sample(greys, 3)
+    grey_palette = rng.sample(greys, 3)
     for warm_color in valid_warm:
         palette = grey_palette + [warm_color]
         if len(set(palette)) == 4:
             return palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Ultimate fallback - use any 3 unique greys and duplicate the last one
-    grey_palette = random.sample(greys, 3)
+    grey_palette = rng.sample(greys, 3)
     return grey_palette + [grey_palette[-1]]
 
-def generate_art_house_palette_5():
+def generate_art_house_palette_5(rng=random):
     greys = color_families.get("Greys", [])
     if len(greys) < 4:
         raise ValueError("Not enough grey colors available for 5-color palette.")
 
-    warm_colors = set(color_families.get("Warm Colors", []))
-    excluded = set(color_families.get("Metallics", [])) | set(color_families.get("Greys", [])) | set(color_families.get("Pastels", []))
-    valid_warm = list(warm_colors - excluded)
+    valid_warm = _valid_warm_colors()
     if not valid_warm:
         raise ValueError("No valid Warm Colors available.")
 
     max_attempts = 50
     for _ in range(max_attempts):
-        grey_palette = random.sample(greys, 4)
-        warm_color = random.choice(valid_warm)
+        grey_palette = rng.sample(greys, 4)
+        warm_color = rng.choice(valid_warm)
         palette = grey_palette + [warm_color]
         if len(set(palette)) == 5:
             return palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # Fallback: If we couldn't get 5 unique colors after max attempts,
     # try different combinations of greys and warm colors
-    grey_palette = random.sample(greys, 4)
+    grey_palette = rng.sample(greys, 4)
     for warm_color in valid_warm:
         palette = grey_palette + [warm_color]
         if len(set(palette)) == 5:
             return palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Ultimate fallback - use any 4 unique greys and duplicate the last one
-    grey_palette = random.sample(greys, 4)
+    grey_palette = rng.sample(greys, 4)
     return grey_palette + [grey_palette[-1]]
 
 if __name__ == '__main__':
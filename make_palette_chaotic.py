@@ -3,9 +3,10 @@ import sys
 import random
 from .color_data import COLORS
 
-def generate_chaotic_palette(num_colors=4):
-    all_colors = list(COLORS.keys())
-    return random.sample(all_colors, num_colors)
+def generate_chaotic_palette(num_colors=4, colors=None, rng=random):
+    """Sample num_colors distinct colors, from COLORS or from the given list of color names."""
+    all_colors = list(COLORS.keys()) if colors is None else colors
+    return rng.sample(all_colors, num_colors)
 
 if __name__ == '__main__':
     use_five = '-5' in sys.argv
@@ -1,46 +1,9 @@
 #!/usr/bin/env python3
 import sys
 import random
-import colorsys
-import math
-from .color_data import COLORS, color_families
-
-def hex_to_rgb(hex_code):
-    hex_code = hex_code.lstrip('#')
-    r = int(hex_code[0:2], 16) / 255.0
-    g = int(hex_code[2:4], 16) / 255.0
-    b = int(hex_code[4:6], 16) / 255.0
-    return (r, g, b)
-
-def rgb_to_hex(rgb):
-    return '#{:02x}{:02x}{:02x}'.format(int(rgb[0]*255), int(rgb[1]*255), int(rgb[2]*255))
-
-def hex_to_rgb_tuple(hex_code):
-    hex_code = hex_code.lstrip('#')
-    return (int(hex_code[0:2], 16), int(hex_code[2:4], 16), int(hex_code[4:6], 16))
-
-def color_distance(rgb1, rgb2):
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
-
-def find_closest_color_name(target_hex, color_dict):
-    target_rgb = hex_to_rgb_tuple(target_hex)
-    closest_name = None
-    min_dist = float('inf')
-    for name, hex_code in color_dict.items():
-        current_rgb = hex_to_rgb_tuple(hex_code)
-        dist = color_distance(target_rgb, current_rgb)
-        if dist < min_dist:
-            min_dist = dist
-            closest_name = name
-    return closest_name
-
-def shift_hue(hex_code, degree_offset):
-    r, g, b = hex_to_rgb(hex_code)
-    H, L, S = colorsys.rgb_to_hls(r, g, b)
-    offset = degree_offset / 360.0
-    new_H = (H + offset) % 1.0
-    new_rgb = colorsys.hls_to_rgb(new_H, L, S)
-    return rgb_to_hex(new_rgb)
+from .color_data import COLORS
+from .color_math import shift_hue, closest_color_names, generate_random_base_color, PaletteTable
+from . import palette_stats
 
 def complementary_palette(base_hex):
     """Returns 4 colors: base, complement, analogous (+15°), complement of analogous."""
@@ -62,80 +25,61 @@ def complementary_palette_5(base_hex):
     comp_analogous = shift_hue(analogous, 180)
     return [base, comp, analogous, extra, comp_analogous]
 
-def generate_random_base_color():
-    families = ['Reds', 'Pinks', 'Oranges', 'Yellows', 'Greens', 'Blues', 'Purples']
-    candidate_colors = []
-    for fam in families:
-        candidate_colors.extend(color_families.get(fam, []))
-    name = random.choice(candidate_colors)
-    return name, COLORS[name]
+def _palette_names(base_hex):
+    """Closest color names of the 4- and 5-color complementary palettes built from base_hex."""
+    return {
+        4: closest_color_names(complementary_palette(base_hex)),
+        5: closest_color_names(complementary_palette_5(base_hex)),
+    }
+
+# Complementary palettes (as color names) precomputed for every base color, keyed by size.
+COMPLEMENTARY_TABLE = PaletteTable(_palette_names)
 
-def generate_complementary_palette():
+def generate_complementary_palette(base_colors=None, rng=random):
     """Generate 4-color complementary palette ensuring unique names."""
     max_attempts = 50
 
     for _ in range(max_attempts):
-        _, base_hex = generate_random_base_color()
-        palette_hexes = complementary_palette(base_hex)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = list(COMPLEMENTARY_TABLE[base_name][4])
         if len(set(palette_names)) == 4:
             return palette_names
 
-    # Fallback: If we can't get 4 unique colors after max attempts,
-    # start with base and complement, then add unique colors
-    _, base_hex = generate_random_base_color()
-    comp_hex = shift_hue(base_hex, 180)
-    base_name = find_closest_color_name(base_hex, COLORS)
-    comp_name = find_closest_color_name(comp_hex, COLORS)
-
-    # Start with base and complement
-    palette = [base_name, comp_name]
-
-    # Try to add two more unique colors
-    all_colors = list(COLORS.keys())
-    while len(palette) < 4 and all_colors:
-        candidate = random.choice(all_colors)
-        if candidate not in palette:
-            palette.append(candidate)
-        all_colors.remove(candidate)
-
-    # If we still don't have 4 colors, pad with duplicates
-    while len(palette) < 4:
-        palette.append(palette[-1])
-
-    return palette
+    return complementary_fallback_palette(4, base_colors, rng=rng)
 
-def generate_complementary_palette_5():
+def generate_complementary_palette_5(base_colors=None, rng=random):
     """Generate 5-color complementary palette ensuring unique names."""
     max_attempts = 50
 
     for _ in range(max_attempts):
-        _, base_hex = generate_random_base_color()
-        palette_hexes = complementary_palette_5(base_hex)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = list(COMPLEMENTARY_TABLE[base_name][5])
         if len(set(palette_names)) == 5:
             return palette_names
 
-    # Fallback: If we can't get 5 unique colors after max attempts,
-    # start with base and complement, then add unique colors
-    _, base_hex = generate_random_base_color()
-    comp_hex = shift_hue(base_hex, 180)
-    base_name = find_closest_color_name(base_hex, COLORS)
-    comp_name = find_closest_color_name(comp_hex, COLORS)
+    return complementary_fallback_palette(5, base_colors, rng=rng)
 
+def complementary_fallback_palette(size, base_colors=None, rng=random):
+    """
+    Fallback used when no base color yields `size` unique names after max attempts:
+    start with base and complement, then add unique random colors.
+    """
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
+    base_name, _ = generate_random_base_color(base_colors, rng=rng)
     # Start with base and complement
-    palette = [base_name, comp_name]
+    palette = list(COMPLEMENTARY_TABLE[base_name][4][:2])
 
-    # Try to add three more unique colors
+    # Try to add more unique colors
     all_colors = list(COLORS.keys())
-    while len(palette) < 5 and all_colors:
-        candidate = random.choice(all_colors)
+    while len(palette) < size and all_colors:
+        candidate = rng.choice(all_colors)
         if candidate not in palette:
             palette.append(candidate)
         all_colors.remove(candidate)
 
-    # If we still don't have 5 colors, pad with duplicates
-    while len(palette) < 5:
+    # If we still don't have enough colors, pad with duplicates
+    while len(palette) < size:
         palette.append(palette[-1])
 
     return palette
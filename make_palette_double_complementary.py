@@ -1,55 +1,9 @@
 #!/usr/bin/env python3
 import sys
 import random
-import colorsys
-import math
-from .color_data import COLORS, color_families
-
-# ----------------------------
-# Conversion & Utility Functions
-# ----------------------------
-def hex_to_rgb(hex_code):
-    hex_code = hex_code.lstrip('#')
-    r = int(hex_code[0:2], 16) / 255.0
-    g = int(hex_code[2:4], 16) / 255.0
-    b = int(hex_code[4:6], 16) / 255.0
-    return (r, g, b)
-
-def rgb_to_hex(rgb):
-    return '#{:02x}{:02x}{:02x}'.format(
-        int(rgb[0] * 255),
-        int(rgb[1] * 255),
-        int(rgb[2] * 255)
-    )
-
-def hex_to_rgb_tuple(hex_code):
-    hex_code = hex_code.lstrip('#')
-    return (int(hex_code[0:2], 16),
-            int(hex_code[2:4], 16),
-            int(hex_code[4:6], 16))
-
-def color_distance(rgb1, rgb2):
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
-
-def find_closest_color_name(target_hex, color_dict):
-    target_rgb = hex_to_rgb_tuple(target_hex)
-    closest_name = None
-    min_dist = float('inf')
-    for name, hex_code in color_dict.items():
-        current_rgb = hex_to_rgb_tuple(hex_code)
-        dist = color_distance(target_rgb, current_rgb)
-        if dist < min_dist:
-            min_dist = dist
-            closest_name = name
-    return closest_name
-
-def shift_hue(hex_code, degree_offset):
-    r, g, b = hex_to_rgb(hex_code)
-    H, L, S = colorsys.rgb_to_hls(r, g, b)
-    offset = degree_offset / 360.0
-    new_H = (H + offset) % 1.0
-    new_rgb = colorsys.hls_to_rgb(new_H, L, S)
-    return rgb_to_hex(new_rgb)
+from .color_data import BASE_COLOR_CANDIDATES, family_bit, in_family
+from .color_math import hex_to_hls, hls_to_hex, shift_hue, closest_color_names, generate_random_base_color, PaletteTable
+from . import palette_stats
 
 # ----------------------------
 # Double Complementary (Tetradic) Palette Functions
@@ -59,49 +13,61 @@ def tetradic_palette(hex_code, shift_fraction=1/6):
     Generate a tetradic palette from a base hex color.
     Returns 4 hex color codes that form two complementary pairs.
     """
-    base_rgb = hex_to_rgb(hex_code)
-    base_h, base_l, base_s = colorsys.rgb_to_hls(*base_rgb)
+    base_h, base_l, base_s = hex_to_hls(hex_code)
     h1 = base_h
     h2 = (base_h + 0.5) % 1.0
     h3 = (base_h + shift_fraction) % 1.0
     h4 = (base_h + shift_fraction + 0.5) % 1.0
-    return [rgb_to_hex(colorsys.hls_to_rgb(h1, base_l, base_s)),
-            rgb_to_hex(colorsys.hls_to_rgb(h2, base_l, base_s)),
-            rgb_to_hex(colorsys.hls_to_rgb(h3, base_l, base_s)),
-            rgb_to_hex(colorsys.hls_to_rgb(h4, base_l, base_s))]
+    return [hls_to_hex(h1, base_l, base_s),
+            hls_to_hex(h2, base_l, base_s),
+            hls_to_hex(h3, base_l, base_s),
+            hls_to_hex(h4, base_l, base_s)]
 
-def generate_random_base_color():
-    families = ['Reds', 'Pinks', 'Oranges', 'Yellows', 'Greens', 'Blues', 'Purples']
-    candidate_colors = []
-    for fam in families:
-        candidate_colors.extend(color_families.get(fam, []))
-    random_color_name = random.choice(candidate_colors)
-    return random_color_name, COLORS[random_color_name]
+def _palette_names(base_hex):
+    """Closest color names of the 4- and 5-color tetradic palettes built from base_hex."""
+    palette_hexes = tetradic_palette(base_hex)
+    return {
+        4: closest_color_names(palette_hexes),
+        5: closest_color_names(palette_hexes + [shift_hue(base_hex, 30)]),
+    }
 
-def generate_double_complementary_palette_4():
-    """Generate a 4-color double complementary (tetradic) palette."""
-    greys = set(color_families.get("Greys", []))
-    while True:
-        _, base_hex = generate_random_base_color()
-        palette_hexes = tetradic_palette(base_hex)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
-        if len(set(palette_names)) == 4 and not any(palette_names.count(n) > 1 for n in greys):
+# Tetradic palettes (as color names) precomputed for every base color, keyed by size.
+TETRADIC_TABLE = PaletteTable(_palette_names)
+
+def _is_valid_palette(palette_names, size):
+    greys = family_bit("Greys")
+    return len(set(palette_names)) == size and not any(
+        palette_names.count(n) > 1 for n in palette_names if in_family(n, greys))
+
+def _tetradic_palette(size, base_colors, rng):
+    max_attempts = 50
+
+    for _ in range(max_attempts):
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = list(TETRADIC_TABLE[base_name][size])
+        if _is_valid_palette(palette_names, size):
             return palette_names
 
-def generate_double_complementary_palette_5():
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
+    # Fallback: draw only from the base colors whose palette has unique names.
+    candidates = BASE_COLOR_CANDIDATES if base_colors is None else base_colors
+    valid_bases = [name for name in candidates if _is_valid_palette(list(TETRADIC_TABLE[name][size]), size)]
+    if not valid_bases:
+        raise ValueError(f"None of the base colors gives a {size}-color tetradic palette with unique names.")
+    return list(TETRADIC_TABLE[rng.choice(valid_bases)][size])
+
+def generate_double_complementary_palette_4(base_colors=None, rng=random):
+    """Generate a 4-color double complementary (tetradic) palette."""
+    return _tetradic_palette(4, base_colors, rng)
+
+def generate_double_complementary_palette_5(base_colors=None, rng=random):
     """
     Generate a 5-color double complementary (tetradic) palette.
     We start with the 4-color palette and add an extra analogous variant of the base (e.g. base+30°)
     if it’s unique.
     """
-    while True:
-        base_name, base_hex = generate_random_base_color()
-        base_palette = tetradic_palette(base_hex)
-        extra = shift_hue(base_hex, 30)
-        palette_hexes = base_palette + [extra]
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
-        if len(set(palette_names)) == 5:
-            return palette_names
+    return _tetradic_palette(5, base_colors, rng)
 
 if __name__ == '__main__':
     five_flag = '-5' in sys.argv
@@ -1,55 +1,9 @@
 #!/usr/bin/env python3
 import sys
 import random
-import colorsys
-import math
-from .color_data import COLORS, color_families
-
-# ----------------------------
-# Conversion & Utility Functions
-# ----------------------------
-def hex_to_rgb(hex_code):
-    hex_code = hex_code.lstrip('#')
-    r = int(hex_code[0:2], 16) / 255.0
-    g = int(hex_code[2:4], 16) / 255.0
-    b = int(hex_code[4:6], 16) / 255.0
-    return (r, g, b)
-
-def rgb_to_hex(rgb):
-    return '#{:02x}{:02x}{:02x}'.format(
-        int(rgb[0] * 255),
-        int(rgb[1] * 255),
-        int(rgb[2] * 255)
-    )
-
-def hex_to_rgb_tuple(hex_code):
-    hex_code = hex_code.lstrip('#')
-    return (int(hex_code[0:2], 16),
-            int(hex_code[2:4], 16),
-            int(hex_code[4:6], 16))
-
-def color_distance(rgb1, rgb2):
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
-
-def find_closest_color_name(target_hex, color_dict):
-    target_rgb = hex_to_rgb_tuple(target_hex)
-    closest_name = None
-    min_dist = float('inf')
-    for name, hex_code in color_dict.items():
-        current_rgb = hex_to_rgb_tuple(hex_code)
-        dist = color_distance(target_rgb, current_rgb)
-        if dist < min_dist:
-            min_dist = dist
-            closest_name = name
-    return closest_name
-
-def shift_hue(hex_code, degree_offset):
-    r, g, b = hex_to_rgb(hex_code)
-    H, L, S = colorsys.rgb_to_hls(r, g, b)
-    offset = degree_offset / 360.0
-    new_H = (H + offset) % 1.0
-    new_rgb = colorsys.hls_to_rgb(new_H, L, S)
-    return rgb_to_hex(new_rgb)
+from .color_data import COLORS
+from .color_math import shift_hue, closest_color_names, generate_random_base_color, PaletteTable
+from . import palette_stats
 
 # ----------------------------
 # Compound (Double Split-Complementary) 5-Color Palette Function
@@ -62,45 +16,52 @@ def compound_palette_five(base_hex, analogous_offset=15, split_offset=30):
     color5 = shift_hue(base_hex, -analogous_offset)
     return [color1, color2, color3, color4, color5]
 
-def generate_random_base_color():
-    families = ['Reds', 'Pinks', 'Oranges', 'Yellows', 'Greens', 'Blues', 'Purples']
-    candidate_colors = []
-    for fam in families:
-        candidate_colors.extend(color_families.get(fam, []))
-    name = random.choice(candidate_colors)
-    return name, COLORS[name]
+def _palette_names(base_hex):
+    """Closest color names of the standard 5-color compound palette built from base_hex."""
+    return closest_color_names(compound_palette_five(base_hex, analogous_offset=15, split_offset=30))
+
+# Standard compound palettes (as color names) precomputed for every base color.
+COMPOUND_TABLE = PaletteTable(_palette_names)
 
-def generate_modified_compound_palette_five():
+def generate_modified_compound_palette_five(base_colors=None, rng=random):
     """
     Generate a 5-color compound (double split-complementary) palette.
     """
     max_attempts = 50
 
     for _ in range(max_attempts):
-        _, base_hex = generate_random_base_color()
-        palette_hexes = compound_palette_five(base_hex, analogous_offset=15, split_offset=30)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = list(COMPOUND_TABLE[base_name])
         if len(set(palette_names)) == 5:
             return palette_names
 
-    # Fallback: If we can't get 5 unique colors after max attempts,
-    # try with different offset values
+    return compound_fallback_palette_five(base_colors, rng=rng)
+
+def compound_fallback_palette_five(base_colors=None, rng=random):
+    """
+    Fallback used when the standard compound palette doesn't give 5 unique names
+    after max attempts: try larger offsets, then any 5 unique colors.
+    """
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     for offset_mult in [1.2, 1.5, 2.0]:  # Try larger offsets
-        _, base_hex = generate_random_base_color()
+        _, base_hex = generate_random_base_color(base_colors, rng=rng)
         palette_hexes = compound_palette_five(
             base_hex,
             analogous_offset=15 * offset_mult,
             split_offset=30 * offset_mult
         )
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        palette_names = list(closest_color_names(palette_hexes))
         if len(set(palette_names)) == 5:
             return palette_names
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Ultimate fallback - generate any 5 unique colors
     all_colors = list(COLORS.keys())
     palette = []
     while len(palette) < 5 and all_colors:
-        candidate = random.choice(all_colors)
+        candidate = rng.choice(all_colors)
         if candidate not in palette:
             palette.append(candidate)
         all_colors.remove(candidate)
@@ -111,21 +72,23 @@ def generate_modified_compound_palette_five():
 
     return palette
 
-def generate_modified_compound_palette_four_from_five():
+def generate_modified_compound_palette_four_from_five(base_colors=None, rng=random):
     """
     Generate a 4-color palette by randomly sampling 4 colors from the 5-color compound palette.
     """
     max_attempts = 50
 
     for _ in range(max_attempts):
-        five_palette = generate_modified_compound_palette_five()
-        four_palette = random.sample(five_palette, 4)
+        five_palette = generate_modified_compound_palette_five(base_colors, rng=rng)
+        four_palette = rng.sample(five_palette, 4)
         if len(set(four_palette)) == 4:
             return four_palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # Fallback: If we can't get 4 unique colors after max attempts,
     # generate a new 5-color palette and take the first 4 unique colors
-    five_palette = generate_modified_compound_palette_five()
+    five_palette = generate_modified_compound_palette_five(base_colors, rng=rng)
     unique_colors = []
     seen = set()
 
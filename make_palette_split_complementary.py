@@ -1,92 +1,53 @@
 #!/usr/bin/env python3
 import sys
 import random
-import colorsys
-import math
-from .color_data import COLORS, color_families
-
-# ----------------------------
-# Conversion & Utility Functions
-# ----------------------------
-def hex_to_rgb(hex_code):
-    hex_code = hex_code.lstrip('#')
-    r = int(hex_code[0:2], 16) / 255.0
-    g = int(hex_code[2:4], 16) / 255.0
-    b = int(hex_code[4:6], 16) / 255.0
-    return (r, g, b)
-
-def rgb_to_hex(rgb):
-    return '#{:02x}{:02x}{:02x}'.format(
-        int(rgb[0]*255),
-        int(rgb[1]*255),
-        int(rgb[2]*255)
-    )
-
-def hex_to_rgb_tuple(hex_code):
-    hex_code = hex_code.lstrip('#')
-    return (int(hex_code[0:2], 16), int(hex_code[2:4], 16), int(hex_code[4:6], 16))
-
-def color_distance(rgb1, rgb2):
-    return math.sqrt(sum((a - b) ** 2 for a, b in zip(rgb1, rgb2)))
-
-def find_closest_color_name(target_hex, color_dict):
-    target_rgb = hex_to_rgb_tuple(target_hex)
-    closest_name = None
-    min_dist = float('inf')
-    for name, hex_code in color_dict.items():
-        current_rgb = hex_to_rgb_tuple(hex_code)
-        dist = color_distance(target_rgb, current_rgb)
-        if dist < min_dist:
-            min_dist = dist
-            closest_name = name
-    return closest_name
-
-def shift_hue(hex_code, degree_offset):
-    r, g, b = hex_to_rgb(hex_code)
-    H, L, S = colorsys.rgb_to_hls(r, g, b)
-    offset = degree_offset / 360.0
-    new_H = (H + offset) % 1.0
-    new_rgb = colorsys.hls_to_rgb(new_H, L, S)
-    return rgb_to_hex(new_rgb)
+from .color_data import COLORS, color_families, in_family, BROAD_NEUTRALS_BIT
+from .color_math import (hex_to_hls, hls_to_hex, shift_hue, find_closest_color_name, closest_color_names,
+                         generate_random_base_color, PaletteTable, CANONICAL_COLOR_NAMES)
+from . import palette_stats
 
 # ----------------------------
 # Split-Complementary Palette Functions
 # ----------------------------
-def split_complementary_palette_4(base_hex, split_offset_degrees=30, analogous_offset_degrees=15):
+def split_complementary_core(base_hex, split_offset_degrees=30):
     """
-    Returns 4 colors:
-      - Color 1: Base.
-      - Colors 2 & 3: Two split-complementary variants (computed from the base's complement).
-      - Color 4: Chosen by a 50/50 decision: either an analogous variant of the base (using +15°)
-        or a random color from Broad Neutrals.
+    Returns the 3 deterministic colors of a split-complementary palette:
+    the base and the two variants split around the base's complement.
     """
     # Convert base to HLS.
-    base_rgb = hex_to_rgb(base_hex)
-    H, L, S = colorsys.rgb_to_hls(*base_rgb)
+    H, L, S = hex_to_hls(base_hex)
     # Complement of base.
     comp_H = (H + 0.5) % 1.0
     # Compute split offsets.
     offset = split_offset_degrees / 360.0
     split1_H = (comp_H + offset) % 1.0
     split2_H = (comp_H - offset) % 1.0
-    color1 = rgb_to_hex(colorsys.hls_to_rgb(H, L, S))
-    color2 = rgb_to_hex(colorsys.hls_to_rgb(split1_H, L, S))
-    color3 = rgb_to_hex(colorsys.hls_to_rgb(split2_H, L, S))
+    return [hls_to_hex(H, L, S), hls_to_hex(split1_H, L, S), hls_to_hex(split2_H, L, S)]
+
+def split_complementary_palette_4(base_hex, split_offset_degrees=30, analogous_offset_degrees=15, rng=random):
+    """
+    Returns 4 colors:
+      - Color 1: Base.
+      - Colors 2 & 3: Two split-complementary variants (computed from the base's complement).
+      - Color 4: Chosen by a 50/50 decision: either an analogous variant of the base (using +15°)
+        or a random color from Broad Neutrals.
+    """
+    color1, color2, color3 = split_complementary_core(base_hex, split_offset_degrees)
     # Decide on fourth color.
-    use_analogous = random.choice([True, False])
+    use_analogous = rng.choice([True, False])
     broad_neutrals = color_families.get("Broad Neutrals", [])
     # Check if any of the first three (by name) are in Broad Neutrals.
     first3_names = {find_closest_color_name(c, COLORS) for c in [color1, color2, color3]}
-    if not use_analogous and any(n in broad_neutrals for n in first3_names):
+    if not use_analogous and any(in_family(n, BROAD_NEUTRALS_BIT) for n in first3_names):
         use_analogous = True
     if use_analogous:
         color4 = shift_hue(base_hex, analogous_offset_degrees)
     else:
-        random_neutral = random.choice(broad_neutrals)
+        random_neutral = rng.choice(broad_neutrals)
         color4 = COLORS[random_neutral]
     return [color1, color2, color3, color4]
 
-def split_complementary_palette_5(base_hex, split_offset_degrees=30, analogous_offset_degrees=15):
+def split_complementary_palette_5(base_hex, split_offset_degrees=30, analogous_offset_degrees=15, rng=random):
     """
     Returns 5 colors. We start with the 4-color split-complementary palette and then add an extra color.
     The extra color is chosen as follows:
@@ -96,18 +57,18 @@ def split_complementary_palette_5(base_hex, split_offset_degrees=30, analogous_o
     """
     max_attempts = 50  # Prevent infinite loops
     for attempt in range(max_attempts):
-        base_palette = split_complementary_palette_4(base_hex, split_offset_degrees, analogous_offset_degrees)
+        base_palette = split_complementary_palette_4(base_hex, split_offset_degrees, analogous_offset_degrees, rng=rng)
         # Determine what the fourth color was.
         fourth_name = find_closest_color_name(base_palette[3], COLORS)
         extra_color = None
 
-        if fourth_name in color_families.get("Broad Neutrals", []):
+        if in_family(fourth_name, BROAD_NEUTRALS_BIT):
             # Fourth was a Broad Neutral; pick another different one.
             current_names = [find_closest_color_name(h, COLORS) for h in base_palette]
             candidates = [n for n in color_families.get("Broad Neutrals", [])
                         if n not in current_names]
             if candidates:
-                extra_color = COLORS[random.choice(candidates)]
+                extra_color = COLORS[rng.choice(candidates)]
         else:
             # Fourth was analogous; add the opposite analogous variant.
             extra_color = shift_hue(base_hex, -analogous_offset_degrees)
@@ -120,53 +81,127 @@ def split_complementary_palette_5(base_hex, split_offset_degrees=30, analogous_o
         if len(set([find_closest_color_name(h, COLORS) for h in full_palette])) == 5:
             return full_palette
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # If we couldn't generate a valid 5-color palette after max attempts,
     # fall back to the 4-color palette plus a random color
-    base_palette = split_complementary_palette_4(base_hex, split_offset_degrees, analogous_offset_degrees)
+    base_palette = split_complementary_palette_4(base_hex, split_offset_degrees, analogous_offset_degrees, rng=rng)
     all_colors = list(COLORS.keys())
     current_names = [find_closest_color_name(h, COLORS) for h in base_palette]
 
     while all_colors:
-        random_color = random.choice(all_colors)
+        random_color = rng.choice(all_colors)
         if random_color not in current_names:
             return base_palette + [COLORS[random_color]]
         all_colors.remove(random_color)
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Absolute fallback - just duplicate the last color if everything else fails
     return base_palette + [base_palette[-1]]
 
-def generate_random_base_color():
-    families = ['Reds', 'Pinks', 'Oranges', 'Yellows', 'Greens', 'Blues', 'Purples']
-    candidate_colors = []
-    for fam in families:
-        candidate_colors.extend(color_families.get(fam, []))
-    random_color_name = random.choice(candidate_colors)
-    return random_color_name, COLORS[random_color_name]
+# ----------------------------
+# Precomputed Split-Complementary Palettes
+# ----------------------------
+def _palette_names(base_hex):
+    """
+    Closest color names for the deterministic parts of a split-complementary palette of base_hex:
+    (base + split pair, +15° analogous, -15° analogous).
+    """
+    return (closest_color_names(split_complementary_core(base_hex)),
+            find_closest_color_name(shift_hue(base_hex, 15), COLORS),
+            find_closest_color_name(shift_hue(base_hex, -15), COLORS))
 
-def generate_split_complementary_palette_4():
+# Split-complementary palette names precomputed for every base color.
+SPLIT_COMPLEMENTARY_TABLE = PaletteTable(_palette_names)
+
+def split_complementary_names_4(base_name, rng=random):
+    """
+    Name-based equivalent of split_complementary_palette_4 with the default offsets,
+    served from SPLIT_COMPLEMENTARY_TABLE.
+    """
+    core_names, analogous_name, _ = SPLIT_COMPLEMENTARY_TABLE[base_name]
+    use_analogous = rng.choice([True, False])
+    broad_neutrals = color_families.get("Broad Neutrals", [])
+    if not use_analogous and any(in_family(n, BROAD_NEUTRALS_BIT) for n in core_names):
+        use_analogous = True
+    if use_analogous:
+        fourth_name = analogous_name
+    else:
+        fourth_name = CANONICAL_COLOR_NAMES[rng.choice(broad_neutrals)]
+    return list(core_names) + [fourth_name]
+
+def split_complementary_names_5(base_name, rng=random):
+    """
+    Name-based equivalent of split_complementary_palette_5 with the default offsets,
+    served from SPLIT_COMPLEMENTARY_TABLE.
+    """
+    broad_neutrals = color_families.get("Broad Neutrals", [])
+    opposite_name = SPLIT_COMPLEMENTARY_TABLE[base_name][2]
+    max_attempts = 50  # Prevent infinite loops
+    for attempt in range(max_attempts):
+        names = split_complementary_names_4(base_name, rng=rng)
+        extra_name = None
+
+        if in_family(names[3], BROAD_NEUTRALS_BIT):
+            # Fourth was a Broad Neutral; pick another different one.
+            candidates = [n for n in broad_neutrals if n not in names]
+            if candidates:
+                extra_name = CANONICAL_COLOR_NAMES[rng.choice(candidates)]
+        else:
+            # Fourth was analogous; add the opposite analogous variant.
+            extra_name = opposite_name
+
+        if extra_name is None:
+            continue
+
+        full_palette = names + [extra_name]
+        if len(set(full_palette)) == 5:
+            return full_palette
+
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
+    # Fall back to the 4-color palette plus a random color
+    names = split_complementary_names_4(base_name, rng=rng)
+    all_colors = list(COLORS.keys())
+    while all_colors:
+        random_color = rng.choice(all_colors)
+        if random_color not in names:
+            return names + [CANONICAL_COLOR_NAMES[random_color]]
+        all_colors.remove(random_color)
+
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
+    # Absolute fallback - just duplicate the last color if everything else fails
+    return names + [names[-1]]
+
+def generate_split_complementary_palette_4(base_colors=None, rng=random):
     """Generate a 4-color split-complementary palette ensuring unique names."""
     max_attempts = 50
 
     for _ in range(max_attempts):
-        _, base_hex = generate_random_base_color()
-        palette_hexes = split_complementary_palette_4(base_hex)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = split_complementary_names_4(base_name, rng=rng)
         if len(set(palette_names)) == 4:
             return palette_names
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # Fallback: Try with different offset values
     for split_offset in [45, 60]:  # Try larger split offsets
-        _, base_hex = generate_random_base_color()
-        palette_hexes = split_complementary_palette_4(base_hex, split_offset_degrees=split_offset)
+        _, base_hex = generate_random_base_color(base_colors, rng=rng)
+        palette_hexes = split_complementary_palette_4(base_hex, split_offset_degrees=split_offset, rng=rng)
         palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
         if len(set(palette_names)) == 4:
             return palette_names
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Ultimate fallback - generate any 4 unique colors
     all_colors = list(COLORS.keys())
     palette = []
     while len(palette) < 4 and all_colors:
-        candidate = random.choice(all_colors)
+        candidate = rng.choice(all_colors)
         if candidate not in palette:
             palette.append(candidate)
         all_colors.remove(candidate)
@@ -177,30 +212,33 @@ def generate_split_complementary_palette_4():
 
     return palette
 
-def generate_split_complementary_palette_5():
+def generate_split_complementary_palette_5(base_colors=None, rng=random):
     """Generate a 5-color split-complementary palette ensuring unique names."""
     max_attempts = 50
 
     for _ in range(max_attempts):
-        _, base_hex = generate_random_base_color()
-        palette_hexes = split_complementary_palette_5(base_hex)
-        palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
+        base_name, _ = generate_random_base_color(base_colors, rng=rng)
+        palette_names = split_complementary_names_5(base_name, rng=rng)
         if len(set(palette_names)) == 5:
             return palette_names
 
+    if palette_stats.ENABLED:
+        palette_stats.count("fallbacks")
     # Fallback: Try with different offset values
     for split_offset in [45, 60]:  # Try larger split offsets
-        _, base_hex = generate_random_base_color()
-        palette_hexes = split_complementary_palette_5(base_hex, split_offset_degrees=split_offset)
+        _, base_hex = generate_random_base_color(base_colors, rng=rng)
+        palette_hexes = split_complementary_palette_5(base_hex, split_offset_degrees=split_offset, rng=rng)
         palette_names = [find_closest_color_name(h, COLORS) for h in palette_hexes]
         if len(set(palette_names)) == 5:
             return palette_names
 
+    if palette_stats.ENABLED:
+        palette_stats.count("ultimate_fallbacks")
     # Ultimate fallback - generate any 5 unique colors
     all_colors = list(COLORS.keys())
     palette = []
     while len(palette) < 5 and all_colors:
-        candidate = random.choice(all_colors)
+        candidate = rng.choice(all_colors)
         if candidate not in palette:
             palette.append(candidate)
         all_colors.remove(candidate)
@@ -1,9 +1,8 @@
 import random
-import re
 import os
 from datetime import datetime, timedelta
 from .weather_utils import generate_weather_description
-from .color_data import COLORS, color_families
+from .color_data import COLORS, family_bit, in_family
 # Palette generation module imports:
 from .make_palette_analogous import generate_analogous_palette_4, generate_analogous_palette_5
 from .make_palette_art_house import generate_art_house_palette_4, generate_art_house_palette_5
@@ -13,6 +12,17 @@ from .make_palette_double_complementary import generate_double_complementary_pal
 from .make_palette_modified_compound import generate_modified_compound_palette_five, generate_modified_compound_palette_four_from_five
 from .make_palette_split_complementary import generate_split_complementary_palette_4, generate_split_complementary_palette_5
 from .make_palette_triadic import generate_four_color_palette, generate_triadic_palette_5
+from .palette_table import HUE_PALETTE_TYPES, eligible_base_colors, palette_satisfies
+from . import palette_stats
+from .weighted_sampler import WeightedSampler
+from .text_replace import replace_words
+from .random_options import parse_options
+from .template_engine import render_template
+from .list_sampling import sample_lines, iter_shuffled_indices
+from .line_index import get_line_index, read_byte_range
+from .list_state import LIST_ACTIONS, step_list, text_items
+from .palette_stream import next_palette
+from .file_cache import FILE_CACHE, file_signature, matching_files, prefetch, read_texts
 
 
 # Import weighted option lists for female character describer
@@ -52,10 +62,9 @@ from .expression_male            import WEIGHTED_OPTIONS as MALE_EXPRESSION_OPTI
 from .hair_male                  import STYLE_OPTIONS  as MALE_HAIR_STYLE_OPTIONS, \
                                         COLOR_OPTIONS  as MALE_HAIR_COLOR_OPTIONS
 
-def pick_weighted(options, seed):
-    random.seed(seed)
-    descs, weights = zip(*options)
-    return random.choices(descs, weights)[0]
+def pick_weighted(sampler, seed):
+    """Pick from a WeightedSampler using a random stream seeded with seed."""
+    return sampler.pick(random.Random(seed))
 
 class EbuPromptHelperRandomColorPalette:
     """
@@ -75,11 +84,11 @@ class EbuPromptHelperRandomColorPalette:
       - prefer_color_family (STRING): Drop‑down for a preferred color family.
            Options: "None", "Reds", "Pinks", "Oranges", "Yellows", "Greens", "Blues", "Purples",
            "Browns", "Greys", "Neutrals", "Metallics", "Pastels", "Peaches", "Warm Colors", "Cool Colors".
-           (If not "None", the palette is regenerated up to 50 times until the condition is met.)
+           (If not "None", base colors are drawn only from those whose palettes can meet the condition.)
       - avoid_color_family (STRING): Drop‑down for a color family to avoid.
            Options: "None", "Reds", "Pinks", "Oranges", "Yellows", "Greens", "Blues", "Purples",
            "Browns", "Greys", "Neutrals", "Metallics", "Pastels", "Peaches", "Warm Colors", "Cool Colors".
-           (If not "None", the palette is regenerated up to 50 times until the condition is met.)
+           (If not "None", base colors are drawn only from those whose palettes can meet the condition.)
       - seed (INT): Seed for random generation (0 means non‑deterministic).
     Returns:
       - palette (STRING): A comma‑separated list of color names (always at least 3), in lower-case.
@@ -138,9 +147,34 @@ class EbuPromptHelperRandomColorPalette:
             avoid_color_family,
             seed):
 
-        # Set the random seed.
-        random.seed(seed)
+        # Draw from a random stream owned by this call.
+        rng = random.Random(seed)
 
+        settings = self.palette_settings(
+            include_analogous_palettes, include_art_house_palettes, include_chaotic_palettes,
+            include_complementary_palettes, include_compound_palettes, include_split_complementary_palettes,
+            include_tetradic_palettes, include_triadic_palettes,
+            palette_size, prefer_color_family, avoid_color_family)
+        return self.palette_outputs(*self.pick_palette(*settings, rng=rng))
+
+    @staticmethod
+    def palette_settings(
+            include_analogous_palettes,
+            include_art_house_palettes,
+            include_chaotic_palettes,
+            include_complementary_palettes,
+            include_compound_palettes,
+            include_split_complementary_palettes,
+            include_tetradic_palettes,
+            include_triadic_palettes,
+            palette_size,
+            prefer_color_family,
+            avoid_color_family):
+        """
+        Validate the node inputs and resolve them into (candidates, target_size, prefer_color_family,
+        avoid_color_family), where candidates maps each usable palette type to its eligible base colors
+        (or None when unrestricted). The result can be reused for any number of pick_palette calls.
+        """
         # If the same color family is specified for both prefer and avoid, cancel them out.
         if (prefer_color_family != "None" and
             avoid_color_family != "None" and
@@ -186,111 +220,118 @@ class EbuPromptHelperRandomColorPalette:
         else:
             raise Exception("Invalid palette size: " + palette_size)
 
+        # Narrow each palette type to the base colors whose precomputed palette can meet the
+        # color family settings, so constrained requests succeed on the first pass instead of
+        # regenerating whole palettes until one happens to fit.
+        candidates = {}
+        constrained = prefer_color_family != "None" or avoid_color_family != "None"
+        for palette_type in enabled_types:
+            if not constrained:
+                candidates[palette_type] = None
+            elif palette_type in HUE_PALETTE_TYPES:
+                base_colors = eligible_base_colors(palette_type, target_size, prefer_color_family, avoid_color_family)
+                if base_colors:
+                    candidates[palette_type] = base_colors
+            elif palette_type == "chaotic" and avoid_color_family not in ["None", "Warm Colors", "Cool Colors"]:
+                avoid_bit = family_bit(avoid_color_family)
+                candidates[palette_type] = [color for color in COLORS if not in_family(color, avoid_bit)]
+            else:
+                candidates[palette_type] = None
+        if not candidates:
+            print("Warning: None of the enabled palette types can meet the color preferences.")
+            candidates = {palette_type: None for palette_type in enabled_types}
+        return candidates, target_size, prefer_color_family, avoid_color_family
+
+    @staticmethod
+    def pick_palette(candidates, target_size, prefer_color_family, avoid_color_family, rng=random):
+        """Draw one palette from rng. Returns (palette, palette_type)."""
+        candidate_types = list(candidates)
+
         max_attempts = 50
         chosen_palette = None
         chosen_type = None  # To record which palette type was chosen.
 
         for attempt in range(max_attempts):
-            chosen_type = random.choice(enabled_types)
+            chosen_type = rng.choice(candidate_types)
+            base_colors = candidates[chosen_type]
+            if palette_stats.ENABLED:
+                palette_stats.begin_attempt(chosen_type, target_size)
             if chosen_type == "analogous":
                 if target_size == 5:
-                    palette = generate_analogous_palette_5()
+                    palette = generate_analogous_palette_5(base_colors, rng=rng)
                 else:
-                    palette = generate_analogous_palette_4()
+                    palette = generate_analogous_palette_4(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "art house":
                 if target_size == 5:
-                    palette = generate_art_house_palette_5()
+                    palette = generate_art_house_palette_5(rng=rng)
                 else:
-                    palette = generate_art_house_palette_4()
+                    palette = generate_art_house_palette_4(rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "chaotic":
                 if target_size == 5:
-                    palette = generate_chaotic_palette(num_colors=5)
+                    palette = generate_chaotic_palette(num_colors=5, colors=base_colors, rng=rng)
                 elif target_size == 4:
-                    palette = generate_chaotic_palette(num_colors=4)
+                    palette = generate_chaotic_palette(num_colors=4, colors=base_colors, rng=rng)
                 elif target_size == 3:
-                    palette = generate_chaotic_palette(num_colors=4)[:3]
+                    palette = generate_chaotic_palette(num_colors=4, colors=base_colors, rng=rng)[:3]
             elif chosen_type == "complementary":
                 if target_size == 5:
-                    palette = generate_complementary_palette_5()
+                    palette = generate_complementary_palette_5(base_colors, rng=rng)
                 else:
-                    palette = generate_complementary_palette()
+                    palette = generate_complementary_palette(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "compound":
                 if target_size == 5:
-                    palette = generate_modified_compound_palette_five()
+                    palette = generate_modified_compound_palette_five(base_colors, rng=rng)
                 else:
-                    palette = generate_modified_compound_palette_four_from_five()
+                    palette = generate_modified_compound_palette_four_from_five(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "split complementary":
                 if target_size == 5:
-                    palette = generate_split_complementary_palette_5()
+                    palette = generate_split_complementary_palette_5(base_colors, rng=rng)
                 else:
-                    palette = generate_split_complementary_palette_4()
+                    palette = generate_split_complementary_palette_4(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "tetradic":
                 if target_size == 5:
-                    palette = generate_double_complementary_palette_5()
+                    palette = generate_double_complementary_palette_5(base_colors, rng=rng)
                 else:
-                    palette = generate_double_complementary_palette_4()
+                    palette = generate_double_complementary_palette_4(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             elif chosen_type == "triadic":
                 if target_size == 5:
-                    palette = generate_triadic_palette_5()
+                    palette = generate_triadic_palette_5(base_colors, rng=rng)
                 else:
-                    palette = generate_four_color_palette()
+                    palette = generate_four_color_palette(base_colors, rng=rng)
                     if target_size == 3:
                         palette = palette[:3]
             else:
                 raise Exception("Unknown palette type chosen: " + chosen_type)
+            if palette_stats.ENABLED:
+                palette_stats.end_attempt()
 
-            # --- Check the "prefer" condition ---
-            condition_preferred = True
-            if prefer_color_family != "None":
-                if prefer_color_family in ["Warm Colors", "Cool Colors"]:
-                    warm_list = color_families.get("Warm Colors", [])
-                    cool_list = color_families.get("Cool Colors", [])
-                    warm_count = sum(1 for color in palette if color in warm_list)
-                    cool_count = sum(1 for color in palette if color in cool_list)
-                    if prefer_color_family == "Warm Colors":
-                        condition_preferred = (warm_count >= cool_count + 1)
-                    else:
-                        condition_preferred = (cool_count >= warm_count + 1)
-                else:
-                    preferred_list = color_families.get(prefer_color_family, [])
-                    condition_preferred = any(color in preferred_list for color in palette)
-
-            # --- Check the "avoid" condition ---
-            condition_avoid = True
-            if avoid_color_family != "None":
-                if avoid_color_family in ["Warm Colors", "Cool Colors"]:
-                    warm_list = color_families.get("Warm Colors", [])
-                    cool_list = color_families.get("Cool Colors", [])
-                    warm_count = sum(1 for color in palette if color in warm_list)
-                    cool_count = sum(1 for color in palette if color in cool_list)
-                    if avoid_color_family == "Warm Colors":
-                        condition_avoid = (warm_count <= cool_count - 1)
-                    else:
-                        condition_avoid = (cool_count <= warm_count - 1)
-                else:
-                    avoid_list = color_families.get(avoid_color_family, [])
-                    condition_avoid = not any(color in avoid_list for color in palette)
-
-            if condition_preferred and condition_avoid:
+            if palette_satisfies(palette, prefer_color_family, avoid_color_family):
                 chosen_palette = palette
                 break
 
+        if palette_stats.ENABLED:
+            palette_stats.record_palette(attempt + 1, chosen_palette is not None)
         if chosen_palette is None:
             print(f"Warning: Attempted {max_attempts} times to meet color preferences but wasn't able to.")
             chosen_palette = palette
 
+        return chosen_palette, chosen_type
+
+    @staticmethod
+    def palette_outputs(chosen_palette, chosen_type):
+        """Format a palette as the node's output tuple."""
         display_palette = [color.lower() for color in chosen_palette]
         palette_str = ", ".join(display_palette)
         padded_display = display_palette.copy()
@@ -302,6 +343,160 @@ class EbuPromptHelperRandomColorPalette:
 
         return (palette_str, color1, color2, color3, color4, color5, chosen_type, hex_values_str)
 
+class EbuPromptHelperRandomColorPaletteBatch(EbuPromptHelperRandomColorPalette):
+    """
+    EBU Random Color Palette Batch Node
+
+    Generates `count` palettes in a single execution, using the same inputs as the Random Color
+    Palette node. Inputs are validated once and every palette is drawn from a single random stream
+    seeded with `seed`, so the first palette matches what the single-palette node returns for the
+    same seed.
+
+    Inputs:
+      - (all inputs of EBU PromptHelper Color Palette)
+      - count (INT): Number of palettes to generate (default 64).
+    Returns:
+      - Lists (one entry per palette) of palette_string, color1 ... color5, palette_type and hex_values.
+    """
+    @classmethod
+    def INPUT_TYPES(s):
+        inputs = super().INPUT_TYPES()
+        inputs["required"]["count"] = ("INT", {"default": 64, "min": 1, "max": 4096})
+        return inputs
+
+    OUTPUT_IS_LIST = (True, True, True, True, True, True, True, True)
+    FUNCTION = "generate_palettes"
+
+    def generate_palettes(
+            self,
+            include_analogous_palettes,
+            include_art_house_palettes,
+            include_chaotic_palettes,
+            include_complementary_palettes,
+            include_compound_palettes,
+            include_split_complementary_palettes,
+            include_tetradic_palettes,
+            include_triadic_palettes,
+            palette_size,
+            prefer_color_family,
+            avoid_color_family,
+            seed,
+            count):
+
+        # Seed once; every palette in the batch continues the same random stream.
+        rng = random.Random(seed)
+
+        settings = self.palette_settings(
+            include_analogous_palettes, include_art_house_palettes, include_chaotic_palettes,
+            include_complementary_palettes, include_compound_palettes, include_split_complementary_palettes,
+            include_tetradic_palettes, include_triadic_palettes,
+            palette_size, prefer_color_family, avoid_color_family)
+        rows = [self.palette_outputs(*self.pick_palette(*settings, rng=rng)) for _ in range(count)]
+        return tuple(list(column) for column in zip(*rows))
+
+class EbuPromptHelperRandomColorPaletteStream(EbuPromptHelperRandomColorPalette):
+    """
+    EBU Random Color Palette Stream Node
+
+    Each run returns the next palette of a session-long stream for the given palette settings,
+    redrawing any palette (same colors in any order) that the stream returned in its last `window`
+    runs. The seed only starts a stream (on first use or reset), so the stream continues whatever
+    the seed widget does between runs; the first palette matches the single-palette node's output
+    for that seed. New palette settings use a separate stream.
+
+    Inputs:
+      - (all inputs of EBU PromptHelper Color Palette)
+      - window (INT): How many recent palettes must not repeat (default 64).
+      - reset (BOOLEAN): Start the stream over from the seed.
+    Returns:
+      - (all outputs of EBU PromptHelper Color Palette)
+      - stream_index (INT): Position of this palette in the stream, starting at 0.
+    """
+    @classmethod
+    def INPUT_TYPES(s):
+        inputs = super().INPUT_TYPES()
+        inputs["required"]["window"] = ("INT", {"default": 64, "min": 0, "max": 4096})
+        inputs["required"]["reset"] = ("BOOLEAN", {"default": False})
+        return inputs
+
+    RETURN_TYPES = EbuPromptHelperRandomColorPalette.RETURN_TYPES + ("INT",)
+    RETURN_NAMES = EbuPromptHelperRandomColorPalette.RETURN_NAMES + ("stream_index",)
+    FUNCTION = "next_palette"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # Every run advances the stream.
+        return float("NaN")
+
+    def next_palette(
+            self,
+            include_analogous_palettes,
+            include_art_house_palettes,
+            include_chaotic_palettes,
+            include_complementary_palettes,
+            include_compound_palettes,
+            include_split_complementary_palettes,
+            include_tetradic_palettes,
+            include_triadic_palettes,
+            palette_size,
+            prefer_color_family,
+            avoid_color_family,
+            seed,
+            window,
+            reset):
+
+        inputs = (include_analogous_palettes, include_art_house_palettes, include_chaotic_palettes,
+                  include_complementary_palettes, include_compound_palettes, include_split_complementary_palettes,
+                  include_tetradic_palettes, include_triadic_palettes,
+                  palette_size, prefer_color_family, avoid_color_family)
+        settings = self.palette_settings(*inputs)
+        palette, palette_type, index = next_palette(
+            inputs, seed, window, lambda rng: self.pick_palette(*settings, rng=rng), reset=reset)
+        return self.palette_outputs(palette, palette_type) + (index,)
+
+class EbuPromptHelperPaletteStats:
+    """
+    EBU PromptHelper Palette Stats Node
+
+    Reports palette generation telemetry (see palette_stats.py) as JSON: attempts, fallbacks,
+    nearest-color lookups and generator time per palette type and size.
+
+    Inputs:
+      - collect (BOOLEAN): Turn stats collection on or off from now on.
+      - reset (BOOLEAN): Clear the counters after reporting them.
+
+    Returns:
+      - stats_json (STRING): The current stats snapshot.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "collect": ("BOOLEAN", {"default": True}),
+                "reset": ("BOOLEAN", {"default": False}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("stats_json",)
+    FUNCTION = "report"
+    CATEGORY = "Prompts"
+
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        # The counters change between runs without any input changing.
+        return float("NaN")
+
+    def report(self, collect, reset):
+        stats_json = palette_stats.to_json()
+        if reset:
+            palette_stats.reset()
+        if collect:
+            palette_stats.enable()
+        else:
+            palette_stats.disable()
+        return (stats_json,)
+
 class EbuPromptHelperReplace:
     """
     EBU Prompt Helper Replace Node
@@ -339,17 +534,7 @@ class EbuPromptHelperReplace:
     def replace_text(self, prompt_text, word_to_replace, replace_with, case_sensitive):
         if not word_to_replace.strip():
             return (prompt_text,)
-        words = word_to_replace.split("|")
-        revised = prompt_text
-        if case_sensitive:
-            for word in words:
-                revised = revised.replace(word, replace_with)
-        else:
-            import re
-            for word in words:
-                pattern = re.compile(re.escape(word), re.IGNORECASE)
-                revised = pattern.sub(replace_with, revised)
-        return (revised,)
+        return (replace_words(prompt_text, word_to_replace, replace_with, case_sensitive),)
 
 class EbuPromptHelperRandomize:
     """
@@ -357,7 +542,8 @@ class EbuPromptHelperRandomize:
 
     This node takes an input prompt and replaces occurrences of a specified target substring
     (word_to_replace) with a randomly selected option from a provided string of options.
-    Supports weighted options: prefix an option with `N>>` (where N is an integer) to weight it N times.
+    Supports weighted options: prefix an option with `N>>` (where N is a whole or decimal number, e.g. 3>> or 0.5>>)
+    to weight it N times.
     The seed input controls the random selection, allowing for deterministic output if desired.
 
     Inputs:
@@ -392,52 +578,61 @@ class EbuPromptHelperRandomize:
     CATEGORY = "Prompts"
 
     def randomize_text(self, prompt_text, word_to_replace, replacement_options, seed, case_sensitive, delimit_options_with):
-        import re
-        import random
-        random.seed(seed)
-
-        # Split options based on chosen delimiter
-        if delimit_options_with == "newlines":
-            opts = [opt.strip() for opt in replacement_options.splitlines() if opt.strip()]
-        elif delimit_options_with == "commas":
-            opts = [opt.strip() for opt in replacement_options.split(',') if opt.strip()]
-        elif delimit_options_with == "semi-colons":
-            opts = [opt.strip() for opt in replacement_options.split(';') if opt.strip()]
-        else:
-            opts = [opt.strip() for opt in replacement_options.splitlines() if opt.strip()]
-
-        if not opts:
-            return (prompt_text, "")
-
-        # Expand weighted options (syntax: N>>option)
-        expanded = []
-        pattern = re.compile(r'^\s*(\d+)\s*>>(.*)$')
-        for item in opts:
-            m = pattern.match(item)
-            if m:
-                count = int(m.group(1))
-                text = m.group(2).strip()
-                expanded.extend([text] * count)
-            else:
-                expanded.append(item)
+        rng = random.Random(seed)
 
-        if not expanded:
+        # Options are parsed (split, stripped and weighted) once per distinct options text.
+        sampler = parse_options(replacement_options, delimit_options_with)
+        if sampler is None:
             return (prompt_text, "")
 
         # Select one option based on weights
-        selected = random.choice(expanded)
+        selected = sampler.pick_repeated(rng)
 
         # Perform replacement
-        words = word_to_replace.split("|")
-        if case_sensitive:
-            for w in words:
-                prompt_text = prompt_text.replace(w, selected)
-        else:
-            for w in words:
-                prompt_text = re.compile(re.escape(w), re.IGNORECASE).sub(selected, prompt_text)
+        prompt_text = replace_words(prompt_text, word_to_replace, selected, case_sensitive)
 
         return (prompt_text, selected)
 
+class EbuPromptHelperTemplate:
+    """
+    EBU PromptHelper Template Node
+
+    Renders a prompt template in one pass: {a|b|3>>c} picks one option (weighted like Randomize,
+    and nestable), and __name__ picks a random line of name.txt from the wildcard directory. Templates
+    are compiled once and cached, so many substitutions cost a single node execution.
+
+    Inputs:
+      - template (STRING): The template text. Use \\{ \\} \\| \\_ for literal characters.
+      - seed (INT): A seed for the random number generator.
+      - wildcard_dir (STRING, optional): Directory of wildcard .txt files. Unresolved wildcards are left as written.
+
+    Returns:
+      - prompt_text (STRING): The rendered prompt, or the template unchanged if it cannot be parsed.
+    """
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "template": ("STRING", {"multiline": True, "default": ""}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+            },
+            "optional": {
+                "wildcard_dir": ("STRING", {"default": ""}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("prompt_text",)
+    FUNCTION = "render"
+    CATEGORY = "Prompts"
+
+    def render(self, template, seed, wildcard_dir=""):
+        try:
+            return (render_template(template, random.Random(seed), wildcard_dir.strip()),)
+        except ValueError as e:
+            print(f"Error rendering template: {e}")
+            return (template,)
+
 class EbuPromptHelperCombineTwoStrings:
     """
     EBU PromptHelper Combine Two Strings Node
@@ -496,11 +691,12 @@ class EbuPromptHelperListSampler:
     """
     EBU PromptHelper List Sampler Node
 
-    This node takes a multi-line string (representing a list) as input, processes each line
-    by removing any leading numbers (e.g., "1. ", "23. ") and trimming whitespace, and then
-    randomly shuffles the remaining non-empty lines. It returns a sample containing a specified
-    number of lines (or all lines if there are fewer than requested). If the toggle is enabled,
-    the sampled list will be numbered starting at 1.
+    This node takes a multi-line string (representing a list) as input and returns a random sample
+    of its non-empty lines, in random order, with any leading numbers (e.g., "1. ", "23. ") and
+    surrounding whitespace removed. It returns the specified number of lines (or all lines if there
+    are fewer than requested). Sampling is a partial Fisher-Yates shuffle, so its cost grows with the
+    sample size rather than the list size. If the toggle is enabled, the sampled list will be
+    numbered starting at 1.
 
     Inputs:
       - list (STRING): A multi-line string containing the list items. Each line may optionally
@@ -508,6 +704,8 @@ class EbuPromptHelperListSampler:
       - seed (INT): A seed for the random number generator. Use 0 for non-deterministic output.
       - number_of_elements (INT, optional): The maximum number of list elements to sample. Defaults to 10.
       - number_sampled_list (BOOLEAN, optional): If True, the sampled list will be numbered (default False).
+      - file_path (STRING, optional): Sample from the lines of this file instead of `list`. Only the sampled
+        lines are read, using a line index saved next to the file (<file>.lineidx).
 
     Returns:
       - (STRING): A newline-separated string of the sampled list items.
@@ -522,6 +720,7 @@ class EbuPromptHelperListSampler:
             "optional": {
                 "number_of_elements": ("INT", {"default": 10, "min": 1, "max": 1000}),
                 "number_sampled_list": ("BOOLEAN", {"default": False}),
+                "file_path": ("STRING", {"default": ""}),
             }
         }
 
@@ -529,27 +728,19 @@ class EbuPromptHelperListSampler:
     FUNCTION = "sample_list"
     CATEGORY = "Prompts"
 
-    def sample_list(self, list, seed, number_of_elements=10, number_sampled_list=False):
-        # Split the input string into lines.
-        lines = list.split('\n')
-
-        # Process lines: remove leading numbers and ignore empty or whitespace-only lines.
-        processed_lines = []
-        for line in lines:
-            # Remove leading numbers followed by a dot (e.g., "1. ", "23. ").
-            processed_line = re.sub(r'^\d+\.\s*', '', line)
-            processed_line = processed_line.strip()
-            if processed_line:  # Only add non-empty lines.
-                processed_lines.append(processed_line)
-
-        # Set the random seed.
-        random.seed(seed)
-
-        # Shuffle the processed lines.
-        random.shuffle(processed_lines)
-
-        # Select the specified number of elements, or all available if there are fewer.
-        selected_lines = processed_lines[:min(number_of_elements, len(processed_lines))]
+    def sample_list(self, list, seed, number_of_elements=10, number_sampled_list=False, file_path=""):
+        # Draw up to number_of_elements non-empty lines without shuffling the whole list;
+        # only the drawn lines have their leading numbers removed.
+        rng = random.Random(seed)
+        if file_path.strip():
+            try:
+                with get_line_index(file_path.strip()) as lines:
+                    selected_lines = sample_lines(lines, number_of_elements, rng)
+            except OSError as e:
+                print(f"Error reading file: {e}")
+                return ("",)
+        else:
+            selected_lines = sample_lines(list.split('\n'), number_of_elements, rng)
 
         # If numbering is enabled, number each line starting at 1.
         if number_sampled_list:
@@ -569,11 +760,17 @@ class EbuPromptHelperLoadFileAsString:
 
     This node loads the contents of a file as a string. Provide the directory and file name, and the node
     will attempt to read the file using UTF-8 encoding. If an error occurs (e.g., if the file is not found),
-    the node will print an error message and return an empty string.
+    the node will print an error message and return an empty string. Contents are cached in memory until
+    the file's modification time or size changes, and the node only re-executes when they do.
 
     Inputs:
       - directory (STRING): The directory path where the file is located.
       - file_name (STRING): The name of the file to load.
+      - slice_mode (STRING, optional): "whole file" (default), "lines" or "bytes". The slice modes return only
+        `limit` lines/bytes starting at `start` (0-based), decoded from a memory map of the file, so slices can
+        be pulled from very large files without loading them. Byte slices are trimmed to whole UTF-8 characters.
+      - start (INT, optional): First line or byte of the slice.
+      - limit (INT, optional): Number of lines or bytes in the slice (0 = to the end of the file).
 
     Returns:
       - (STRING): The content of the file as a string, or an empty string if an error occurred.
@@ -585,22 +782,98 @@ class EbuPromptHelperLoadFileAsString:
                 "directory": ("STRING", {"default": ""}),
                 "file_name": ("STRING", {"default": ""}),
             },
+            "optional": {
+                "slice_mode": (["whole file", "lines", "bytes"], {"default": "whole file"}),
+                "start": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "limit": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+            },
         }
 
     RETURN_TYPES = ("STRING",)
     FUNCTION = "load_file"
     CATEGORY = "File Operations"
 
-    def load_file(self, directory, file_name):
+    @classmethod
+    def IS_CHANGED(cls, directory, file_name, **kwargs):
+        # Re-run only when the file's modification time or size changes.
+        try:
+            mtime_ns, size = file_signature(os.path.join(directory, file_name))
+        except OSError:
+            return float("nan")
+        return f"{mtime_ns}:{size}"
+
+    def load_file(self, directory, file_name, slice_mode="whole file", start=0, limit=0):
         full_path = os.path.join(directory, file_name)
         try:
-            with open(full_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            return (content,)
+            # Slices are decoded straight from a memory map; the whole file is never read.
+            if slice_mode == "lines":
+                with get_line_index(full_path) as lines:
+                    return (lines.text(start, limit or None),)
+            if slice_mode == "bytes":
+                return (read_byte_range(full_path, start, limit or None),)
+            return (FILE_CACHE.read_text(full_path),)
         except Exception as e:
             print(f"Error reading file: {e}")
             return ("",)
 
+DIRECTORY_JOINERS = {"newlines": "\n", "blank lines": "\n\n", "commas": ", ", "spaces": " "}
+
+class EbuPromptHelperLoadDirectory:
+    """
+    EBU PromptHelper Load Directory Node
+
+    Loads every file in a directory that matches a glob pattern, reading them in parallel on a
+    thread pool through the same content cache as Load File as String. Matching files start loading
+    in the background as soon as ComfyUI checks the node for changes, and unchanged files are served
+    from the cache on later runs.
+
+    Inputs:
+      - directory (STRING): The directory to load files from.
+      - pattern (STRING): Glob pattern for the files to load (default "*.txt"; use "**/" to recurse).
+      - join_with (STRING): Dropdown with options ["newlines", "blank lines", "commas", "spaces"]
+          for the separator placed between files in the joined output.
+
+    Returns:
+      - joined_text (STRING): The contents of all matching files, in file name order, joined by join_with.
+      - file_contents (STRING list): The contents of each file.
+      - file_names (STRING list): The matching files' paths relative to directory.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "directory": ("STRING", {"default": ""}),
+                "pattern": ("STRING", {"default": "*.txt"}),
+                "join_with": (list(DIRECTORY_JOINERS), {"default": "newlines"}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING", "STRING")
+    RETURN_NAMES = ("joined_text", "file_contents", "file_names")
+    OUTPUT_IS_LIST = (False, True, True)
+    FUNCTION = "load_directory"
+    CATEGORY = "File Operations"
+
+    @classmethod
+    def IS_CHANGED(cls, directory, pattern, **kwargs):
+        # Start reading the matching files now so they are ready when the node executes.
+        paths = matching_files(directory, pattern)
+        prefetch(paths)
+        signature = []
+        for path in paths:
+            try:
+                signature.append((path, *file_signature(path)))
+            except OSError:
+                signature.append((path,))
+        return repr(signature)
+
+    def load_directory(self, directory, pattern, join_with):
+        paths = matching_files(directory, pattern)
+        loaded = read_texts(paths)
+        contents = [text for _, text in loaded]
+        names = [os.path.relpath(path, directory) for path, _ in loaded]
+        return (DIRECTORY_JOINERS[join_with].join(contents), contents, names)
+
 class EbuPromptHelperCurrentDateTime:
     """
     EBU PromptHelper Current DateTime Node
@@ -657,6 +930,13 @@ class EbuPromptHelperConsumeListItem:
       - list (STRING): A newline-separated list of options.
       - seed (INT): A seed for the random number generator (0 means non-deterministic).
       - prompt_text (STRING, optional): A multiline string representing the input prompt. Defaults to an empty string.
+      - file_path (STRING, optional): Pick from the lines of this file instead of `list`. Only the picked line is
+        read (see the List Sampler). The file is not modified, so revised_list is empty in this mode.
+      - list_id (STRING, optional): Name for a persistent walk through the list (or file). When set, each run
+        hands out the next item of a shuffled order that is saved across runs and restarts, instead of
+        returning a revised list; revised_list is empty in this mode.
+      - action (STRING, optional): With list_id, "consume" (take the next item), "peek" (show it without
+        taking it) or "reset" (start over with a new order from the seed).
 
     Returns:
       - updated_prompt_text (STRING): The prompt with the target substring replaced by the selected option.
@@ -673,7 +953,10 @@ class EbuPromptHelperConsumeListItem:
                 "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
             },
             "optional": {
-                "prompt_text": ("STRING", {"multiline": True, "default": ""})
+                "prompt_text": ("STRING", {"multiline": True, "default": ""}),
+                "file_path": ("STRING", {"default": ""}),
+                "list_id": ("STRING", {"default": ""}),
+                "action": (LIST_ACTIONS, {"default": "consume"}),
             }
         }
 
@@ -682,16 +965,25 @@ class EbuPromptHelperConsumeListItem:
     FUNCTION = "consume_list_item"
     CATEGORY = "Prompts"
 
-    def consume_list_item(self, word_to_replace, list, seed, prompt_text=""):
+    @classmethod
+    def IS_CHANGED(cls, list_id="", **kwargs):
+        # A persistent walk moves on every run, so it must never be served from ComfyUI's cache.
+        return float("NaN") if list_id.strip() else ""
+
+    def consume_list_item(self, word_to_replace, list, seed, prompt_text="", file_path="", list_id="", action="consume"):
+        if list_id.strip():
+            return self.step_list_item(word_to_replace, list, seed, prompt_text, file_path.strip(), list_id.strip(), action)
+        if file_path.strip():
+            return self.consume_file_item(word_to_replace, file_path.strip(), seed, prompt_text)
+
         # Split the input string into a list of options using newlines.
         options = [opt.strip() for opt in list.splitlines() if opt.strip()]
 
-        # Set the random seed.
-        random.seed(seed)
+        rng = random.Random(seed)
 
         if options:
             # Randomly select an option.
-            word_selected = random.choice(options)
+            word_selected = rng.choice(options)
 
             # Remove the selected option from the list.
             options.remove(word_selected)
@@ -708,6 +1000,42 @@ class EbuPromptHelperConsumeListItem:
             # If no options are provided, return the prompt (or empty string) and empty values for the other outputs.
             return (prompt_text, "", "")
 
+    @staticmethod
+    def consume_file_item(word_to_replace, file_path, seed, prompt_text=""):
+        """File-backed mode: pick one non-empty line of the file, reading only the lines it draws."""
+        try:
+            lines = get_line_index(file_path)
+        except OSError as e:
+            print(f"Error reading file: {e}")
+            return (prompt_text, "", "")
+
+        rng = random.Random(seed)
+        with lines:
+            for index in iter_shuffled_indices(len(lines), rng):
+                word_selected = lines[index].strip()
+                if word_selected:
+                    return (prompt_text.replace(word_to_replace, word_selected), word_selected, "")
+        return (prompt_text, "", "")
+
+    @staticmethod
+    def step_list_item(word_to_replace, list, seed, prompt_text, file_path, list_id, action):
+        """Persistent mode: take the next item of the list's saved shuffled walk."""
+        if file_path:
+            try:
+                items = get_line_index(file_path)
+            except OSError as e:
+                print(f"Error reading file: {e}")
+                return (prompt_text, "", "")
+            fingerprint = f"{items.path}:{items.mtime_ns}:{items.size}"
+            with items:
+                word_selected = step_list(list_id, items, fingerprint, seed, action)
+        else:
+            fingerprint, items = text_items(list)
+            word_selected = step_list(list_id, items, fingerprint, seed, action)
+        if not word_selected:
+            return (prompt_text, "", "")
+        return (prompt_text.replace(word_to_replace, word_selected), word_selected, "")
+
 class EbuPromptHelperSeasonWeatherTimeOfDay:
     """
     EBU PromptHelper Season Weather Time-Of-Day Node
@@ -760,14 +1088,14 @@ class EbuPromptHelperSeasonWeatherTimeOfDay:
     CATEGORY = "Prompts"
 
     def generate_info(self, year_from, year_to, time_from, time_to, seed, year_skew, time_of_day_skew):
-        random.seed(seed)
-        when = self.generate_random_datetime(year_from, year_to, time_from, time_to, year_skew, time_of_day_skew)
-        weather = generate_weather_description(when)  # Use external weather function
+        rng = random.Random(seed)
+        when = self.generate_random_datetime(year_from, year_to, time_from, time_to, year_skew, time_of_day_skew, rng)
+        weather = generate_weather_description(when, rng)  # Use external weather function
         # Remove the " of [year]" part from the abstract datetime.
         when_no_year = when.rsplit(" of ", 1)[0]
         return (when, when_no_year, weather)
 
-    def generate_random_datetime(self, year_from, year_to, time_from, time_to, year_skew, time_of_day_skew):
+    def generate_random_datetime(self, year_from, year_to, time_from, time_to, year_skew, time_of_day_skew, rng=random):
         # Helper: Convert a time string (e.g., "6:00am") to a datetime object.
         def time_str_to_dt(time_str):
             return datetime.strptime(time_str, '%I:%M%p')
@@ -775,16 +1103,16 @@ class EbuPromptHelperSeasonWeatherTimeOfDay:
         # Helper: Generate a skewed random integer between min_val and max_val (inclusive).
         def generate_skewed_random(min_val, max_val, skew):
             if skew == "no skew":
-                return random.randint(min_val, max_val)
+                return rng.randint(min_val, max_val)
             elif skew == "earlier of two":
-                return min(random.randint(min_val, max_val), random.randint(min_val, max_val))
+                return min(rng.randint(min_val, max_val), rng.randint(min_val, max_val))
             elif skew == "later of two":
-                return max(random.randint(min_val, max_val), random.randint(min_val, max_val))
+                return max(rng.randint(min_val, max_val), rng.randint(min_val, max_val))
             elif skew == "middle of three":
-                vals = [random.randint(min_val, max_val) for _ in range(3)]
+                vals = [rng.randint(min_val, max_val) for _ in range(3)]
                 return sorted(vals)[1]
             else:
-                return random.randint(min_val, max_val)
+                return rng.randint(min_val, max_val)
 
         # Helper: Generate a random date between start_year and end_year using the specified skew.
         def random_date(start_year, end_year, skew):
@@ -932,6 +1260,131 @@ class EbuPromptHelperTruncate:
         else:
             return (prompt,)
 
+def generate_character_batch(describer, seed, count, unique, traits):
+    """
+    Generate `count` characters with a character describer's trait tables. Every trait of every
+    character is drawn from one random stream seeded with seed, so the batch builds a single
+    random.Random and no per-trait streams. With unique, characters whose full set of outputs was
+    already emitted are skipped (drawing up to 50 characters per requested one). Returns one list
+    per output.
+    """
+    face_traits, other_samplers = describer.trait_plan(**traits)
+    rng = random.Random(seed)
+    rows = []
+    seen = set()
+    draws = 0
+    max_draws = count * 50 if unique else count
+    while len(rows) < count and draws < max_draws:
+        face_description = "\n".join([f"{label}: {sampler.pick(rng)}" for label, sampler in face_traits])
+        row = (face_description,) + tuple([sampler.pick(rng) for sampler in other_samplers])
+        draws += 1
+        if unique:
+            if row in seen:
+                continue
+            seen.add(row)
+        rows.append(row)
+    if len(rows) < count:
+        print(f"Warning: only {len(rows)} unique characters found for the enabled traits.")
+    return tuple(list(column) for column in zip(*rows)) if rows else tuple([] for _ in describer.RETURN_TYPES)
+
+class EbuPromptHelperPromptBatch:
+    """
+    EBU PromptHelper Prompt Batch Node
+
+    Renders a template (see the Template node) `count` times in one execution. Templates can also use
+    the outputs of the palette, character describer and season weather nodes as variables, such as
+    __color1__, __hair_color__ or __weather__; they are generated per prompt, only when used.
+    Prompt i is rendered with seed + i.
+
+    Inputs:
+      - template (STRING): The template text.
+      - count (INT): Number of prompts to render.
+      - seed (INT): Base seed.
+      - palette_size, prefer_color_family, avoid_color_family: Settings for the palette variables.
+      - character (STRING): Which character describer ("female" or "male") supplies the character variables.
+      - wildcard_dir (STRING, optional): Directory of wildcard .txt files.
+      - output_file (STRING, optional): If set, also write the prompts to this JSONL file,
+        one {"index", "seed", "prompt"} object per line.
+
+    Returns:
+      - prompts (STRING list): The rendered prompts, or an empty list if the template cannot be parsed.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        palette_inputs = EbuPromptHelperRandomColorPalette.INPUT_TYPES()["required"]
+        return {
+            "required": {
+                "template": ("STRING", {"multiline": True, "default": ""}),
+                "count": ("INT", {"default": 100, "min": 1, "max": 1000000}),
+                "seed": ("INT", {"default": 0, "min": 0, "max": 0xffffffffffffffff}),
+                "palette_size": palette_inputs["palette_size"],
+                "prefer_color_family": palette_inputs["prefer_color_family"],
+                "avoid_color_family": palette_inputs["avoid_color_family"],
+                "character": (["female", "male"], {"default": "female"}),
+            },
+            "optional": {
+                "wildcard_dir": ("STRING", {"default": ""}),
+                "output_file": ("STRING", {"default": ""}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("prompts",)
+    OUTPUT_IS_LIST = (True,)
+    FUNCTION = "render_batch"
+    CATEGORY = "Prompts"
+
+    def render_batch(self, template, count, seed, palette_size, prefer_color_family, avoid_color_family,
+                     character, wildcard_dir="", output_file=""):
+        # Imported here because prompt_batch builds on the node classes in this module.
+        from .prompt_batch import iter_prompt_records, write_jsonl
+
+        settings = {
+            "palette_size": palette_size,
+            "prefer_color_family": prefer_color_family,
+            "avoid_color_family": avoid_color_family,
+            "character": character,
+            "wildcard_dir": wildcard_dir.strip(),
+        }
+        prompts = []
+
+        def collect(records):
+            for record in records:
+                prompts.append(record["prompt"])
+                yield record
+
+        try:
+            # Always in-process: worker processes are not safe to start from inside the ComfyUI server.
+            records = collect(iter_prompt_records(template, count, seed, settings))
+            if output_file.strip():
+                write_jsonl(output_file.strip(), records)
+            else:
+                for _ in records:
+                    pass
+        except (ValueError, OSError) as e:
+            print(f"Error rendering prompt batch: {e}")
+            return ([],)
+        return (prompts,)
+
+# Samplers for the female trait tables, built once at import.
+EYES_SAMPLER        = WeightedSampler(EYES_OPTIONS)
+NOSE_SAMPLER        = WeightedSampler(NOSE_OPTIONS)
+MOUTH_SAMPLER       = WeightedSampler(MOUTH_OPTIONS)
+LIPS_SAMPLER        = WeightedSampler(LIPS_OPTIONS)
+FACE_SHAPE_SAMPLER  = WeightedSampler(FACE_SHAPE_OPTIONS)
+BROW_SAMPLER        = WeightedSampler(BROW_OPTIONS)
+EARS_SAMPLER        = WeightedSampler(EARS_OPTIONS)
+CHEEKBONES_SAMPLER  = WeightedSampler(CHEEKBONES_OPTIONS)
+CHEEKS_SAMPLER      = WeightedSampler(CHEEKS_OPTIONS)
+CHIN_SAMPLER        = WeightedSampler(CHIN_OPTIONS)
+SKIN_SAMPLER        = WeightedSampler(SKIN_OPTIONS)
+MAKEUP_SAMPLER      = WeightedSampler(MAKEUP_OPTIONS)
+NECK_SAMPLER        = WeightedSampler(NECK_OPTIONS)
+ACCESSORIES_SAMPLER = WeightedSampler(ACCESSORIES_OPTIONS)
+HAIR_STYLE_SAMPLER  = WeightedSampler(STYLE_OPTIONS)
+HAIR_COLOR_SAMPLER  = WeightedSampler(COLOR_OPTIONS)
+EXPRESSION_SAMPLER  = WeightedSampler(EXPRESSION_OPTIONS)
+
 class EbuPromptHelperCharacterDescriberFemale:
     @classmethod
     def INPUT_TYPES(cls):
@@ -970,41 +1423,86 @@ class EbuPromptHelperCharacterDescriberFemale:
 
         lines = []
         if eyes_enabled:
-            lines.append(f"Eyes: {pick_weighted(EYES_OPTIONS, seed + 1)}")
+            lines.append(f"Eyes: {pick_weighted(EYES_SAMPLER, seed + 1)}")
         if nose_enabled:
-            lines.append(f"Nose: {pick_weighted(NOSE_OPTIONS, seed + 2)}")
+            lines.append(f"Nose: {pick_weighted(NOSE_SAMPLER, seed + 2)}")
         if mouth_enabled:
-            lines.append(f"Mouth: {pick_weighted(MOUTH_OPTIONS, seed + 3)}")
+            lines.append(f"Mouth: {pick_weighted(MOUTH_SAMPLER, seed + 3)}")
         if lips_enabled:
-            lines.append(f"Lips: {pick_weighted(LIPS_OPTIONS, seed + 4)}")
+            lines.append(f"Lips: {pick_weighted(LIPS_SAMPLER, seed + 4)}")
         if face_shape_enabled:
-            lines.append(f"Face Shape: {pick_weighted(FACE_SHAPE_OPTIONS, seed + 5)}")
+            lines.append(f"Face Shape: {pick_weighted(FACE_SHAPE_SAMPLER, seed + 5)}")
         if brow_enabled:
-            lines.append(f"Eyebrows & Forehead: {pick_weighted(BROW_OPTIONS, seed + 6)}")
+            lines.append(f"Eyebrows & Forehead: {pick_weighted(BROW_SAMPLER, seed + 6)}")
         if ears_enabled:
-            lines.append(f"Ears: {pick_weighted(EARS_OPTIONS, seed + 7)}")
+            lines.append(f"Ears: {pick_weighted(EARS_SAMPLER, seed + 7)}")
         if cheekbones_enabled:
-            lines.append(f"Cheekbones: {pick_weighted(CHEEKBONES_OPTIONS, seed + 8)}")
+            lines.append(f"Cheekbones: {pick_weighted(CHEEKBONES_SAMPLER, seed + 8)}")
         if cheeks_enabled:
-            lines.append(f"Cheeks: {pick_weighted(CHEEKS_OPTIONS, seed + 9)}")
+            lines.append(f"Cheeks: {pick_weighted(CHEEKS_SAMPLER, seed + 9)}")
         if chin_enabled:
-            lines.append(f"Chin/Jaw: {pick_weighted(CHIN_OPTIONS, seed + 10)}")
+            lines.append(f"Chin/Jaw: {pick_weighted(CHIN_SAMPLER, seed + 10)}")
         if skin_enabled:
-            lines.append(f"Skin: {pick_weighted(SKIN_OPTIONS, seed + 11)}")
+            lines.append(f"Skin: {pick_weighted(SKIN_SAMPLER, seed + 11)}")
         if makeup_enabled:
-            lines.append(f"Makeup: {pick_weighted(MAKEUP_OPTIONS, seed + 12)}")
+            lines.append(f"Makeup: {pick_weighted(MAKEUP_SAMPLER, seed + 12)}")
         if neck_enabled:
-            lines.append(f"Neck: {pick_weighted(NECK_OPTIONS, seed + 13)}")
+            lines.append(f"Neck: {pick_weighted(NECK_SAMPLER, seed + 13)}")
         if accessories_enabled:
-            lines.append(f"Accessories: {pick_weighted(ACCESSORIES_OPTIONS, seed + 14)}")
+            lines.append(f"Accessories: {pick_weighted(ACCESSORIES_SAMPLER, seed + 14)}")
 
         face_description     = "\n".join(lines)
-        hair_style           = pick_weighted(STYLE_OPTIONS, seed + 15)
-        hair_color           = pick_weighted(COLOR_OPTIONS, seed + 16)
-        facial_expression    = pick_weighted(EXPRESSION_OPTIONS, seed + 17)
+        hair_style           = pick_weighted(HAIR_STYLE_SAMPLER, seed + 15)
+        hair_color           = pick_weighted(HAIR_COLOR_SAMPLER, seed + 16)
+        facial_expression    = pick_weighted(EXPRESSION_SAMPLER, seed + 17)
 
         return face_description, hair_style, hair_color, facial_expression
 
+class EbuPromptHelperCharacterDescriberFemaleBatch(EbuPromptHelperCharacterDescriberFemale):
+    """
+    EBU Character Describer Female Batch Node
+
+    Generates `count` female characters in a single execution, drawing every trait from one random
+    stream seeded with `seed`. With `unique` enabled, repeated trait combinations are skipped.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        inputs = super().INPUT_TYPES()
+        inputs["required"]["count"] = ("INT", {"default": 64, "min": 1, "max": 4096})
+        inputs["required"]["unique"] = ("BOOLEAN", {"default": False})
+        return inputs
+
+    OUTPUT_IS_LIST = (True, True, True, True)
+    FUNCTION = "generate_batch"
+
+    @staticmethod
+    def trait_plan(eyes_enabled, nose_enabled, mouth_enabled, lips_enabled,
+                   face_shape_enabled, brow_enabled, ears_enabled,
+                   cheekbones_enabled, cheeks_enabled, chin_enabled,
+                   skin_enabled, makeup_enabled, neck_enabled, accessories_enabled):
+        """The enabled face description lines as (label, sampler) pairs, and the samplers of the other outputs."""
+        face_traits = [
+            (eyes_enabled,        "Eyes",                EYES_SAMPLER),
+            (nose_enabled,        "Nose",                NOSE_SAMPLER),
+            (mouth_enabled,       "Mouth",               MOUTH_SAMPLER),
+            (lips_enabled,        "Lips",                LIPS_SAMPLER),
+            (face_shape_enabled,  "Face Shape",          FACE_SHAPE_SAMPLER),
+            (brow_enabled,        "Eyebrows & Forehead", BROW_SAMPLER),
+            (ears_enabled,        "Ears",                EARS_SAMPLER),
+            (cheekbones_enabled,  "Cheekbones",          CHEEKBONES_SAMPLER),
+            (cheeks_enabled,      "Cheeks",              CHEEKS_SAMPLER),
+            (chin_enabled,        "Chin/Jaw",            CHIN_SAMPLER),
+            (skin_enabled,        "Skin",                SKIN_SAMPLER),
+            (makeup_enabled,      "Makeup",              MAKEUP_SAMPLER),
+            (neck_enabled,        "Neck",                NECK_SAMPLER),
+            (accessories_enabled, "Accessories",         ACCESSORIES_SAMPLER),
+        ]
+        return ([(label, sampler) for enabled, label, sampler in face_traits if enabled],
+                [HAIR_STYLE_SAMPLER, HAIR_COLOR_SAMPLER, EXPRESSION_SAMPLER])
+
+    def generate_batch(self, seed, count, unique, **traits):
+        return generate_character_batch(self, seed, count, unique, traits)
+
 # Alias all male option lists to avoid collisions
 from .eyes_male                   import WEIGHTED_OPTIONS as MALE_EYES_OPTIONS
 from .nose_male                   import WEIGHTED_OPTIONS as MALE_NOSE_OPTIONS
@@ -1022,6 +1520,23 @@ from .expression_male             import WEIGHTED_OPTIONS as MALE_EXPRESSION_OPT
 from .hair_male                   import STYLE_OPTIONS  as MALE_HAIR_STYLE_OPTIONS, \
                                         COLOR_OPTIONS  as MALE_HAIR_COLOR_OPTIONS
 
+# Samplers for the male trait tables, built once at import.
+MALE_EYES_SAMPLER              = WeightedSampler(MALE_EYES_OPTIONS)
+MALE_NOSE_SAMPLER              = WeightedSampler(MALE_NOSE_OPTIONS)
+MALE_MOUTH_SAMPLER             = WeightedSampler(MALE_MOUTH_OPTIONS)
+MALE_FACE_SHAPE_SAMPLER        = WeightedSampler(MALE_FACE_SHAPE_OPTIONS)
+MALE_BROW_SAMPLER              = WeightedSampler(MALE_BROW_OPTIONS)
+MALE_EARS_SAMPLER              = WeightedSampler(MALE_EARS_OPTIONS)
+MALE_CHEEKS_CHEEKBONES_SAMPLER = WeightedSampler(MALE_CHEEKS_CHEEKBONES_OPTIONS)
+MALE_CHIN_SAMPLER              = WeightedSampler(MALE_CHIN_OPTIONS)
+MALE_SKIN_SAMPLER              = WeightedSampler(MALE_SKIN_OPTIONS)
+MALE_NECK_SAMPLER              = WeightedSampler(MALE_NECK_OPTIONS)
+MALE_ACCESSORIES_SAMPLER       = WeightedSampler(MALE_ACCESSORIES_OPTIONS)
+MALE_HAIR_STYLE_SAMPLER        = WeightedSampler(MALE_HAIR_STYLE_OPTIONS)
+MALE_HAIR_COLOR_SAMPLER        = WeightedSampler(MALE_HAIR_COLOR_OPTIONS)
+MALE_FACIAL_HAIR_SAMPLER       = WeightedSampler(MALE_FACIAL_HAIR_OPTIONS)
+MALE_EXPRESSION_SAMPLER        = WeightedSampler(MALE_EXPRESSION_OPTIONS)
+
 class EbuPromptHelperCharacterDescriberMale:
     @classmethod
     def INPUT_TYPES(cls):
@@ -1058,41 +1573,87 @@ class EbuPromptHelperCharacterDescriberMale:
 
         lines = []
         if eyes_enabled:
-            lines.append(f"Eyes: {pick_weighted(MALE_EYES_OPTIONS, seed+1)}")
+            lines.append(f"Eyes: {pick_weighted(MALE_EYES_SAMPLER, seed+1)}")
         if nose_enabled:
-            lines.append(f"Nose: {pick_weighted(MALE_NOSE_OPTIONS, seed+2)}")
+            lines.append(f"Nose: {pick_weighted(MALE_NOSE_SAMPLER, seed+2)}")
         if mouth_enabled:
-            lines.append(f"Mouth: {pick_weighted(MALE_MOUTH_OPTIONS, seed+3)}")
+            lines.append(f"Mouth: {pick_weighted(MALE_MOUTH_SAMPLER, seed+3)}")
         if face_shape_enabled:
-            lines.append(f"Face Shape: {pick_weighted(MALE_FACE_SHAPE_OPTIONS, seed+4)}")
+            lines.append(f"Face Shape: {pick_weighted(MALE_FACE_SHAPE_SAMPLER, seed+4)}")
         if brow_enabled:
-            lines.append(f"Eyebrows & Forehead: {pick_weighted(MALE_BROW_OPTIONS, seed+5)}")
+            lines.append(f"Eyebrows & Forehead: {pick_weighted(MALE_BROW_SAMPLER, seed+5)}")
         if ears_enabled:
-            lines.append(f"Ears: {pick_weighted(MALE_EARS_OPTIONS, seed+6)}")
+            lines.append(f"Ears: {pick_weighted(MALE_EARS_SAMPLER, seed+6)}")
 
         # Combined cheeks & cheekbones
         if cheeks_and_cheekbones_enabled:
-            lines.append(f"Cheeks & Cheekbones: {pick_weighted(MALE_CHEEKS_CHEEKBONES_OPTIONS, seed+7)}")
+            lines.append(f"Cheeks & Cheekbones: {pick_weighted(MALE_CHEEKS_CHEEKBONES_SAMPLER, seed+7)}")
         elif cheekbones_enabled:
-            lines.append(f"Cheekbones: {pick_weighted(MALE_CHEEKS_CHEEKBONES_OPTIONS, seed+7)}")
+            lines.append(f"Cheekbones: {pick_weighted(MALE_CHEEKS_CHEEKBONES_SAMPLER, seed+7)}")
 
         if chin_enabled:
-            lines.append(f"Chin/Jaw: {pick_weighted(MALE_CHIN_OPTIONS, seed+8)}")
+            lines.append(f"Chin/Jaw: {pick_weighted(MALE_CHIN_SAMPLER, seed+8)}")
         if skin_enabled:
-            lines.append(f"Skin: {pick_weighted(MALE_SKIN_OPTIONS, seed+9)}")
+            lines.append(f"Skin: {pick_weighted(MALE_SKIN_SAMPLER, seed+9)}")
         if neck_enabled:
-            lines.append(f"Neck: {pick_weighted(MALE_NECK_OPTIONS, seed+10)}")
+            lines.append(f"Neck: {pick_weighted(MALE_NECK_SAMPLER, seed+10)}")
         if accessories_enabled:
-            lines.append(f"Accessories: {pick_weighted(MALE_ACCESSORIES_OPTIONS, seed+11)}")
+            lines.append(f"Accessories: {pick_weighted(MALE_ACCESSORIES_SAMPLER, seed+11)}")
 
         face_description  = "\n".join(lines)
-        hair_style        = pick_weighted(MALE_HAIR_STYLE_OPTIONS, seed+12)
-        hair_color        = pick_weighted(MALE_HAIR_COLOR_OPTIONS, seed+13)
-        facial_hair       = pick_weighted(MALE_FACIAL_HAIR_OPTIONS, seed+14)
-        facial_expression = pick_weighted(MALE_EXPRESSION_OPTIONS, seed+15)
+        hair_style        = pick_weighted(MALE_HAIR_STYLE_SAMPLER, seed+12)
+        hair_color        = pick_weighted(MALE_HAIR_COLOR_SAMPLER, seed+13)
+        facial_hair       = pick_weighted(MALE_FACIAL_HAIR_SAMPLER, seed+14)
+        facial_expression = pick_weighted(MALE_EXPRESSION_SAMPLER, seed+15)
 
         return face_description, hair_style, hair_color, facial_hair, facial_expression
 
+class EbuPromptHelperCharacterDescriberMaleBatch(EbuPromptHelperCharacterDescriberMale):
+    """
+    EBU Character Describer Male Batch Node
+
+    Generates `count` male characters in a single execution, drawing every trait from one random
+    stream seeded with `seed`. With `unique` enabled, repeated trait combinations are skipped.
+    """
+    @classmethod
+    def INPUT_TYPES(cls):
+        inputs = super().INPUT_TYPES()
+        inputs["required"]["count"] = ("INT", {"default": 64, "min": 1, "max": 4096})
+        inputs["required"]["unique"] = ("BOOLEAN", {"default": False})
+        return inputs
+
+    OUTPUT_IS_LIST = (True, True, True, True, True)
+    FUNCTION = "generate_batch"
+
+    @staticmethod
+    def trait_plan(eyes_enabled, nose_enabled, mouth_enabled,
+                   face_shape_enabled, brow_enabled, ears_enabled,
+                   cheeks_and_cheekbones_enabled, cheekbones_enabled,
+                   chin_enabled, skin_enabled,
+                   neck_enabled, accessories_enabled):
+        """The enabled face description lines as (label, sampler) pairs, and the samplers of the other outputs."""
+        # Combined cheeks & cheekbones takes the place of the cheekbones line.
+        face_traits = [
+            (eyes_enabled,                  "Eyes",                MALE_EYES_SAMPLER),
+            (nose_enabled,                  "Nose",                MALE_NOSE_SAMPLER),
+            (mouth_enabled,                 "Mouth",               MALE_MOUTH_SAMPLER),
+            (face_shape_enabled,            "Face Shape",          MALE_FACE_SHAPE_SAMPLER),
+            (brow_enabled,                  "Eyebrows & Forehead", MALE_BROW_SAMPLER),
+            (ears_enabled,                  "Ears",                MALE_EARS_SAMPLER),
+            (cheeks_and_cheekbones_enabled, "Cheeks & Cheekbones", MALE_CHEEKS_CHEEKBONES_SAMPLER),
+            (cheekbones_enabled and not cheeks_and_cheekbones_enabled,
+                                            "Cheekbones",          MALE_CHEEKS_CHEEKBONES_SAMPLER),
+            (chin_enabled,                  "Chin/Jaw",            MALE_CHIN_SAMPLER),
+            (skin_enabled,                  "Skin",                MALE_SKIN_SAMPLER),
+            (neck_enabled,                  "Neck",                MALE_NECK_SAMPLER),
+            (accessories_enabled,           "Accessories",         MALE_ACCESSORIES_SAMPLER),
+        ]
+        return ([(label, sampler) for enabled, label, sampler in face_traits if enabled],
+                [MALE_HAIR_STYLE_SAMPLER, MALE_HAIR_COLOR_SAMPLER, MALE_FACIAL_HAIR_SAMPLER, MALE_EXPRESSION_SAMPLER])
+
+    def generate_batch(self, seed, count, unique, **traits):
+        return generate_character_batch(self, seed, count, unique, traits)
+
 # Node registration mappings.
 NODE_CLASS_MAPPINGS = {
     "EbuPromptHelperCombineTwoStrings":           EbuPromptHelperCombineTwoStrings,
@@ -1100,13 +1661,21 @@ NODE_CLASS_MAPPINGS = {
     "EbuPromptHelperCurrentDateTime":             EbuPromptHelperCurrentDateTime,
     "EbuPromptHelperListSampler":                 EbuPromptHelperListSampler,
     "EbuPromptHelperLoadFileAsString":            EbuPromptHelperLoadFileAsString,
+    "EbuPromptHelperLoadDirectory":               EbuPromptHelperLoadDirectory,
     "EbuPromptHelperRandomColorPalette":          EbuPromptHelperRandomColorPalette,
+    "EbuPromptHelperRandomColorPaletteBatch":     EbuPromptHelperRandomColorPaletteBatch,
+    "EbuPromptHelperRandomColorPaletteStream":    EbuPromptHelperRandomColorPaletteStream,
+    "EbuPromptHelperPaletteStats":                EbuPromptHelperPaletteStats,
     "EbuPromptHelperRandomize":                   EbuPromptHelperRandomize,
+    "EbuPromptHelperTemplate":                    EbuPromptHelperTemplate,
+    "EbuPromptHelperPromptBatch":                 EbuPromptHelperPromptBatch,
     "EbuPromptHelperReplace":                     EbuPromptHelperReplace,
     "EbuPromptHelperSeasonWeatherTimeOfDay":      EbuPromptHelperSeasonWeatherTimeOfDay,
     "EbuPromptHelperTruncate":                    EbuPromptHelperTruncate,
     "EbuPromptHelperCharacterDescriberFemale":    EbuPromptHelperCharacterDescriberFemale,
     "EbuPromptHelperCharacterDescriberMale":      EbuPromptHelperCharacterDescriberMale,
+    "EbuPromptHelperCharacterDescriberFemaleBatch": EbuPromptHelperCharacterDescriberFemaleBatch,
+    "EbuPromptHelperCharacterDescriberMaleBatch":   EbuPromptHelperCharacterDescriberMaleBatch,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -1115,12 +1684,20 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "EbuPromptHelperCurrentDateTime":             "EBU PromptHelper Current DateTime",
     "EbuPromptHelperListSampler":                 "EBU PromptHelper List Sampler",
     "EbuPromptHelperLoadFileAsString":            "EBU PromptHelper Load File as String",
+    "EbuPromptHelperLoadDirectory":               "EBU PromptHelper Load Directory",
     "EbuPromptHelperRandomColorPalette":          "EBU PromptHelper Color Palette",
+    "EbuPromptHelperRandomColorPaletteBatch":     "EBU PromptHelper Color Palette Batch",
+    "EbuPromptHelperRandomColorPaletteStream":    "EBU PromptHelper Color Palette Stream",
+    "EbuPromptHelperPaletteStats":                "EBU PromptHelper Palette Stats",
     "EbuPromptHelperRandomize":                   "EBU PromptHelper Randomize",
+    "EbuPromptHelperTemplate":                    "EBU PromptHelper Template",
+    "EbuPromptHelperPromptBatch":                 "EBU PromptHelper Prompt Batch",
     "EbuPromptHelperReplace":                     "EBU PromptHelper Replace",
     "EbuPromptHelperSeasonWeatherTimeOfDay":      "EBU PromptHelper Season Weather Time-Of-Day",
     "EbuPromptHelperTruncate":                    "EBU PromptHelper Truncate",
     "EbuPromptHelperCharacterDescriberFemale":    "EBU PromptHelper Character Describer Female",
     "EbuPromptHelperCharacterDescriberMale":      "EBU PromptHelper Character Describer Male",
+    "EbuPromptHelperCharacterDescriberFemaleBatch": "EBU PromptHelper Character Describer Female Batch",
+    "EbuPromptHelperCharacterDescriberMaleBatch":   "EBU PromptHelper Character Describer Male Batch",
 }
 
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Palette generation benchmarks.
+
+Run as a module from the directory that contains this package (the package directory
+must have an importable name, e.g. ComfyUI_EBU_PromptHelper):
+    python -m ComfyUI_EBU_PromptHelper.palette_benchmark [iterations]
+
+Compare the average attempts per palette under each nearest-color metric (each metric runs in
+its own process, since the palette tables are built for one metric at import):
+    python -m ComfyUI_EBU_PromptHelper.palette_benchmark --metrics [iterations]
+
+Run the full suite (every palette type at 3/4/5 colors, with no family setting and with each
+family preferred and avoided, over fixed seeds), save it, and compare a later run against it:
+    python -m ComfyUI_EBU_PromptHelper.palette_benchmark --suite --save before.json
+    python -m ComfyUI_EBU_PromptHelper.palette_benchmark --suite --compare before.json
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from . import color_math
+from .color_data import COLORS, BASE_COLOR_CANDIDATES
+from .palette_table import PALETTE_CORES
+from . import make_palette_analogous
+from . import make_palette_complementary
+from . import make_palette_double_complementary
+from . import make_palette_modified_compound
+from . import make_palette_split_complementary
+from . import make_palette_triadic
+from .nodes import EbuPromptHelperRandomColorPalette
+
+# (label, module, generator function name)
+GENERATORS = [
+    ("analogous 4", make_palette_analogous, "generate_analogous_palette_4"),
+    ("analogous 5", make_palette_analogous, "generate_analogous_palette_5"),
+    ("complementary 4", make_palette_complementary, "generate_complementary_palette"),
+    ("complementary 5", make_palette_complementary, "generate_complementary_palette_5"),
+    ("compound 4", make_palette_modified_compound, "generate_modified_compound_palette_four_from_five"),
+    ("compound 5", make_palette_modified_compound, "generate_modified_compound_palette_five"),
+    ("split complementary 4", make_palette_split_complementary, "generate_split_complementary_palette_4"),
+    ("split complementary 5", make_palette_split_complementary, "generate_split_complementary_palette_5"),
+    ("tetradic 4", make_palette_double_complementary, "generate_double_complementary_palette_4"),
+    ("tetradic 5", make_palette_double_complementary, "generate_double_complementary_palette_5"),
+    ("triadic 4", make_palette_triadic, "generate_four_color_palette"),
+    ("triadic 5", make_palette_triadic, "generate_triadic_palette_5"),
+]
+
+def time_generator(func, iterations, seed=0):
+    """Run func `iterations` times from a fixed seed; return (seconds per palette, palettes produced)."""
+    random.seed(seed)
+    palettes = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        palettes.append(func())
+    elapsed = time.perf_counter() - start
+    return elapsed / iterations, palettes
+
+class _UncachedTable(dict):
+    """Stands in for a PaletteTable on the baseline path: every lookup rebuilds the entry."""
+    def __init__(self, builder):
+        super().__init__()
+        self.builder = builder
+
+    def __getitem__(self, name):
+        return self.builder(COLORS[name])
+
+def _linear_closest_color_names(hex_codes, metric=None):
+    return tuple(color_math.find_closest_color_name_linear(h, COLORS) for h in hex_codes)
+
+def _linear_closest_color_name(target_hex, color_dict=COLORS, metric=None):
+    return color_math.find_closest_color_name_linear(target_hex, color_dict)
+
+@contextlib.contextmanager
+def baseline_palette_path():
+    """
+    Run the hue generators the way they worked before the shared index: no precomputed tables,
+    and every color name resolved by the original linear scan on each palette.
+    """
+    modules = {module for _, module, _ in GENERATORS}
+    saved = []
+    for module in modules:
+        for attr, value in list(vars(module).items()):
+            if isinstance(value, color_math.PaletteTable):
+                replacement = _UncachedTable(value.builder)
+            elif attr == "find_closest_color_name":
+                replacement = _linear_closest_color_name
+            elif attr == "closest_color_names":
+                replacement = _linear_closest_color_names
+            else:
+                continue
+            saved.append((module, attr, value))
+            setattr(module, attr, replacement)
+    try:
+        yield
+    finally:
+        for module, attr, value in saved:
+            setattr(module, attr, value)
+
+def bench_end_to_end(iterations=200):
+    """
+    Per-palette latency of every hue-based generator on the baseline path (see
+    baseline_palette_path) and on the current one, from the same seed, and whether both
+    produce the same palettes. The baseline uses the "rgb" metric, so compare under it.
+    """
+    results = []
+    for label, module, func_name in GENERATORS:
+        with baseline_palette_path():
+            old_seconds, old_palettes = time_generator(getattr(module, func_name), iterations)
+        new_seconds, new_palettes = time_generator(getattr(module, func_name), iterations)
+        results.append({
+            "generator": label,
+            "old_us": old_seconds * 1e6,
+            "new_us": new_seconds * 1e6,
+            "speedup": old_seconds / new_seconds if new_seconds else float('inf'),
+            "identical": old_palettes == new_palettes,
+        })
+    return results
+
+def print_end_to_end_report(results):
+    print(f"{'generator':<24}{'old us':>10}{'new us':>10}{'speedup':>9}  identical")
+    for row in results:
+        print(f"{row['generator']:<24}{row['old_us']:>10.1f}{row['new_us']:>10.1f}"
+              f"{row['speedup']:>8.0f}x  {row['identical']}")
+
+def bench_nearest_lookup(iterations=20):
+    """
+    Compare the shared nearest-color index against the original linear scan over the hex
+    codes the hue generators actually look up, and check that both return the same names.
+    """
+    targets = [color_math.shift_hue(COLORS[name], offset)
+               for name in dict.fromkeys(BASE_COLOR_CANDIDATES)
+               for offset in (0, 15, -15, 30, 120, 150, 180, 210, 240)]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        linear = [color_math.find_closest_color_name_linear(h, COLORS) for h in targets]
+    linear_time = (time.perf_counter() - start) / (iterations * len(targets))
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        indexed = [color_math.find_closest_color_name(h, COLORS, metric="rgb") for h in targets]
+    indexed_time = (time.perf_counter() - start) / (iterations * len(targets))
+
+    return {
+        "lookups": len(targets),
+        "linear_us": linear_time * 1e6,
+        "indexed_us": indexed_time * 1e6,
+        "speedup": linear_time / indexed_time if indexed_time else float('inf'),
+        "identical": linear == indexed,
+    }
+
+def print_nearest_lookup_report(result):
+    print(f"nearest-color lookup over {result['lookups']} hues: "
+          f"linear {result['linear_us']:.2f} us, indexed {result['indexed_us']:.2f} us, "
+          f"{result['speedup']:.0f}x, identical: {result['identical']}")
+
+# ----------------------------
+# Attempts per Palette
+# ----------------------------
+class _CountingCandidates(list):
+    """Base color candidates that count the draws made from them; generators draw once per attempt."""
+    draws = 0
+
+    def __getitem__(self, index):
+        self.draws += 1
+        return list.__getitem__(self, index)
+
+def bench_attempts(iterations=500, seed=0):
+    """
+    Average base color draws (attempts) per palette for every hue generator under the current
+    nearest-color metric, plus the share of base colors whose precomputed core has a repeated name.
+    """
+    results = []
+    for label, module, func_name in GENERATORS:
+        palette_type, size = label.rsplit(" ", 1)
+        cores = PALETTE_CORES[(palette_type, int(size))]
+        names = list(dict.fromkeys(BASE_COLOR_CANDIDATES))
+        duplicates = sum(1 for name in names if len(set(cores[name])) != len(cores[name]))
+
+        candidates = _CountingCandidates(BASE_COLOR_CANDIDATES)
+        func = getattr(module, func_name)
+        rng = random.Random(seed)
+        for _ in range(iterations):
+            func(candidates, rng=rng)
+        results.append({
+            "generator": label,
+            "attempts_per_palette": candidates.draws / iterations,
+            "duplicate_core_pct": 100.0 * duplicates / len(names),
+        })
+    return results
+
+def compare_metrics(iterations=500):
+    """Run bench_attempts under every metric, each in a fresh process. Returns {metric: results}."""
+    package_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for metric in color_math.COLOR_METRICS:
+        env = dict(os.environ, **{color_math.COLOR_METRIC_ENV: metric})
+        completed = subprocess.run(
+            [sys.executable, "-m", f"{__package__}.palette_benchmark", "--attempts", str(iterations)],
+            env=env, cwd=package_parent, capture_output=True, text=True, check=True)
+        results[metric] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return results
+
+def print_metric_report(results):
+    metrics = list(results)
+    print(f"{'attempts/palette':<24}" + "".join(f"{m:>10}" for m in metrics)
+          + "   " + "".join(f"{m + ' dup%':>13}" for m in metrics))
+    for i, row in enumerate(results[metrics[0]]):
+        print(f"{row['generator']:<24}"
+              + "".join(f"{results[m][i]['attempts_per_palette']:>10.2f}" for m in metrics)
+              + "   " + "".join(f"{results[m][i]['duplicate_core_pct']:>12.1f}%" for m in metrics))
+
+# ----------------------------
+# Full Suite
+# ----------------------------
+PALETTE_TYPES = ["analogous", "art house", "chaotic", "complementary",
+                 "compound", "split complementary", "tetradic", "triadic"]
+PALETTE_SIZES = ["3 colors", "4 colors", "5 colors"]
+SUITE_SEEDS = 200
+
+def suite_cases(palette_types=None, families=None):
+    """
+    (palette_type, palette_size, prefer_color_family, avoid_color_family) for every palette type and
+    size, with no family setting and with each family preferred and avoided.
+    """
+    family_inputs = EbuPromptHelperRandomColorPalette.INPUT_TYPES()["required"]["prefer_color_family"][0]
+    families = families or [family for family in family_inputs if family != "None"]
+    family_settings = [("None", "None")]
+    family_settings += [(family, "None") for family in families]
+    family_settings += [("None", family) for family in families]
+    return [(palette_type, palette_size, prefer, avoid)
+            for palette_type in palette_types or PALETTE_TYPES
+            for palette_size in PALETTE_SIZES
+            for prefer, avoid in family_settings]
+
+def case_label(case):
+    palette_type, palette_size, prefer, avoid = case
+    label = f"{palette_type} {palette_size[0]}"
+    if prefer != "None":
+        label += f" +{prefer}"
+    if avoid != "None":
+        label += f" -{avoid}"
+    return label
+
+def _case_settings(case):
+    palette_type, palette_size, prefer, avoid = case
+    node = EbuPromptHelperRandomColorPalette
+    include = [palette_type == enabled for enabled in PALETTE_TYPES]
+    with contextlib.redirect_stdout(io.StringIO()):  # Unsatisfiable settings print warnings.
+        return node.palette_settings(*include, palette_size, prefer, avoid)
+
+def _percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100.0))]
+
+def bench_case(case, seeds=SUITE_SEEDS):
+    """
+    Time one palette per seed 0..seeds-1 through the Random Color Palette node's palette code,
+    then repeat the run under tracemalloc to measure memory. Returns one result row.
+    """
+    settings = _case_settings(case)
+    pick_palette = EbuPromptHelperRandomColorPalette.pick_palette
+    # Settings no palette can meet print a warning per palette; keep them out of the report.
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = []
+        digest = hashlib.sha1()
+        for seed in range(seeds):
+            rng = random.Random(seed)
+            start = time.perf_counter_ns()
+            palette, palette_type = pick_palette(*settings, rng=rng)
+            timings.append(time.perf_counter_ns() - start)
+            digest.update(f"{palette_type}:{','.join(palette)};".encode('utf-8'))
+
+        # Allocations are measured in a separate pass; tracemalloc slows every allocation down.
+        tracemalloc.start()
+        peaks = 0
+        blocks_before = sys.getallocatedblocks()
+        for seed in range(seeds):
+            rng = random.Random(seed)
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            pick_palette(*settings, rng=rng)
+            peaks += tracemalloc.get_traced_memory()[1] - base
+        retained_blocks = sys.getallocatedblocks() - blocks_before
+        tracemalloc.stop()
+
+    timings.sort()
+    total_seconds = sum(timings) / 1e9
+    return {
+        "case": case_label(case),
+        "palettes_per_sec": seeds / total_seconds if total_seconds else float('inf'),
+        "p50_us": _percentile(timings, 50) / 1e3,
+        "p99_us": _percentile(timings, 99) / 1e3,
+        "peak_kib": peaks / seeds / 1024.0,
+        "retained_blocks": retained_blocks,
+        "output_sha1": digest.hexdigest()[:12],
+    }
+
+def run_suite(seeds=SUITE_SEEDS, palette_types=None, families=None):
+    """Benchmark every suite case. Returns {"meta": ..., "results": [row, ...]}."""
+    cases = suite_cases(palette_types, families)
+    # Warm up the precomputed tables and caches so the first case isn't penalised.
+    with contextlib.redirect_stdout(io.StringIO()):
+        for case in cases:
+            EbuPromptHelperRandomColorPalette.pick_palette(*_case_settings(case), rng=random.Random(0))
+    return {
+        "meta": {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "color_metric": color_math.COLOR_METRIC,
+            "seeds": seeds,
+        },
+        "results": [bench_case(case, seeds) for case in cases],
+    }
+
+def save_results(path, suite):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(suite, f, indent=2)
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Compare two suite runs case by case. Returns rows for the cases present in both, with the
+    p50/p99 change as a ratio (current / baseline), whether p50 regressed by more than threshold,
+    and whether the seeded output changed.
+    """
+    baseline_rows = {row["case"]: row for row in baseline["results"]}
+    rows = []
+    for row in current["results"]:
+        old = baseline_rows.get(row["case"])
+        if old is None:
+            continue
+        p50_ratio = row["p50_us"] / old["p50_us"] if old["p50_us"] else 1.0
+        p99_ratio = row["p99_us"] / old["p99_us"] if old["p99_us"] else 1.0
+        rows.append({
+            "case": row["case"],
+            "p50_ratio": p50_ratio,
+            "p99_ratio": p99_ratio,
+            "regressed": p50_ratio > 1.0 + threshold,
+            "output_changed": row["output_sha1"] != old["output_sha1"],
+        })
+    return rows
+
+def print_suite_report(suite):
+    meta = suite["meta"]
+    print(f"python {meta['python']}, metric {meta['color_metric']}, {meta['seeds']} seeds per case")
+    print(f"{'case':<40}{'palettes/s':>12}{'p50 us':>10}{'p99 us':>10}{'peak KiB':>10}{'retained':>10}")
+    for row in suite["results"]:
+        print(f"{row['case']:<40}{row['palettes_per_sec']:>12.0f}{row['p50_us']:>10.1f}{row['p99_us']:>10.1f}"
+              f"{row['peak_kib']:>10.1f}{row['retained_blocks']:>10}")
+
+def print_comparison_report(rows, threshold=0.10):
+    print(f"{'case':<40}{'p50':>8}{'p99':>8}")
+    for row in rows:
+        flags = []
+        if row["regressed"]:
+            flags.append("REGRESSED")
+        if row["output_changed"]:
+            flags.append("OUTPUT CHANGED")
+        print(f"{row['case']:<40}{row['p50_ratio']:>7.2f}x{row['p99_ratio']:>7.2f}x  {' '.join(flags)}")
+    regressed = sum(1 for row in rows if row["regressed"])
+    changed = sum(1 for row in rows if row["output_changed"])
+    print(f"{len(rows)} cases compared: {regressed} slower by more than {threshold:.0%}, {changed} with changed output")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Palette generation benchmarks.")
+    parser.add_argument("iterations", nargs="?", type=int, help="Palettes per generator or seeds per suite case")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--attempts", nargs="?", type=int, const=500, metavar="N",
+                      help="Print attempts per palette under the current metric as JSON")
+    mode.add_argument("--metrics", nargs="?", type=int, const=500, metavar="N",
+                      help="Compare attempts per palette under every nearest-color metric")
+    mode.add_argument("--suite", action="store_true", help="Run the full palette suite")
+    parser.add_argument("--types", nargs="+", choices=PALETTE_TYPES, metavar="TYPE",
+                        help="Suite: only these palette types")
+    parser.add_argument("--families", nargs="+", metavar="FAMILY",
+                        help="Suite: only prefer/avoid these color families")
+    parser.add_argument("--save", metavar="PATH", help="Suite: write the results to a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Suite: compare against a saved JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Suite: p50 slowdown ratio reported as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    if args.attempts is not None:
+        print(json.dumps(bench_attempts(args.attempts)))
+    elif args.metrics is not None:
+        print_metric_report(compare_metrics(args.metrics))
+    elif args.suite:
+        suite = run_suite(args.iterations or SUITE_SEEDS, args.types, args.families)
+        print_suite_report(suite)
+        if args.save:
+            save_results(args.save, suite)
+        if args.compare:
+            print()
+            print_comparison_report(compare_results(load_results(args.compare), suite, args.threshold),
+                                    args.threshold)
+    else:
+        iterations = args.iterations or 200
+        print_end_to_end_report(bench_end_to_end(iterations))
+        print_nearest_lookup_report(bench_nearest_lookup())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Optional palette generation telemetry.
+
+Off by default. Enable with the EBU_PROMPTHELPER_PALETTE_STATS=1 environment variable (or
+enable() at runtime). While enabled, the palette code counts per palette type and size:
+  - attempts: generator calls made by the palette nodes' retry loop (pick_palette), and their wall time
+  - base_draws: base colors drawn by the generators (one per generator attempt)
+  - fallbacks / ultimate_fallbacks: times a generator ran out of attempts and fell back
+  - nearest_lookups / nearest_scans: nearest-color lookups, and those not served from the memo table
+Everything drawn through pick_palette (the Random Color Palette, Color Palette Batch and Color
+Palette Stream nodes, and Prompt Batch palette variables) is counted per palette type and size.
+Generators called outside it (palette_vectorized, scripts, benchmarks) are counted under "direct".
+
+Every call site checks palette_stats.ENABLED before recording, so disabled telemetry costs one
+attribute read.
+
+snapshot() returns the counters as a dict and to_json() as JSON. If EBU_PROMPTHELPER_PALETTE_STATS_LOG
+names a file, a snapshot line is appended to it every LOG_EVERY palettes and at exit.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+STATS_ENV = "EBU_PROMPTHELPER_PALETTE_STATS"
+LOG_ENV = "EBU_PROMPTHELPER_PALETTE_STATS_LOG"
+LOG_EVERY = 100
+
+ENABLED = os.environ.get(STATS_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+LOG_PATH = os.environ.get(LOG_ENV, "").strip()
+
+_COUNTERS = ("attempts", "base_draws", "fallbacks", "ultimate_fallbacks", "nearest_lookups", "nearest_scans")
+DIRECT_SCOPE = "direct"
+
+_lock = threading.Lock()
+_local = threading.local()
+_scopes = {}
+_node = {"palettes": 0, "attempts": 0, "unsatisfied": 0}
+_since = time.time()
+_unlogged = 0
+
+def enable(log_path=None):
+    """Start collecting stats, optionally appending snapshots to log_path."""
+    global ENABLED, LOG_PATH
+    ENABLED = True
+    if log_path is not None:
+        LOG_PATH = log_path
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def reset():
+    """Clear all counters."""
+    global _since, _unlogged
+    with _lock:
+        _scopes.clear()
+        for key in _node:
+            _node[key] = 0
+        _since = time.time()
+        _unlogged = 0
+
+# ----------------------------
+# Recording
+# ----------------------------
+def _scope_counters(scope):
+    counters = _scopes.get(scope)
+    if counters is None:
+        counters = _scopes[scope] = dict.fromkeys(_COUNTERS, 0)
+        counters["seconds"] = 0.0
+        counters["max_seconds"] = 0.0
+    return counters
+
+def count(name, n=1):
+    """Add n to a counter of the palette type currently being generated (callers check ENABLED first)."""
+    if not ENABLED:
+        return
+    scope = getattr(_local, "scope", None) or DIRECT_SCOPE
+    with _lock:
+        _scope_counters(scope)[name] += n
+
+def begin_attempt(palette_type, size):
+    """Mark the start of one generator call for palette_type at size (on this thread)."""
+    _local.scope = f"{palette_type} {size}"
+    _local.start = time.perf_counter()
+
+def end_attempt():
+    """Record the generator call started by begin_attempt."""
+    scope = getattr(_local, "scope", None)
+    if scope is None:
+        return
+    elapsed = time.perf_counter() - _local.start
+    _local.scope = None
+    with _lock:
+        counters = _scope_counters(scope)
+        counters["attempts"] += 1
+        counters["seconds"] += elapsed
+        counters["max_seconds"] = max(counters["max_seconds"], elapsed)
+
+def record_palette(attempts, satisfied):
+    """Record one finished Random Color Palette node palette and the attempts it took."""
+    global _unlogged
+    if not ENABLED:
+        return
+    with _lock:
+        _node["palettes"] += 1
+        _node["attempts"] += attempts
+        _node["unsatisfied"] += 0 if satisfied else 1
+        _unlogged += 1
+        due = LOG_PATH and _unlogged >= LOG_EVERY
+    if due:
+        append_log()
+
+# ----------------------------
+# Reporting
+# ----------------------------
+def snapshot():
+    """All counters as a dict, with per-type averages."""
+    with _lock:
+        types = {}
+        for scope, counters in sorted(_scopes.items()):
+            row = dict(counters)
+            attempts = row["attempts"]
+            row["avg_ms"] = 1000.0 * row["seconds"] / attempts if attempts else 0.0
+            row["max_ms"] = 1000.0 * row.pop("max_seconds")
+            types[scope] = row
+        node = dict(_node)
+    node["attempts_per_palette"] = node["attempts"] / node["palettes"] if node["palettes"] else 0.0
+    return {
+        "enabled": ENABLED,
+        "since": datetime.fromtimestamp(_since).isoformat(timespec="seconds"),
+        "node": node,
+        "palette_types": types,
+    }
+
+def to_json(indent=2):
+    return json.dumps(snapshot(), indent=indent)
+
+def append_log(path=None):
+    """Append one timestamped snapshot line to path (default LOG_PATH)."""
+    global _unlogged
+    path = path or LOG_PATH
+    if not path:
+        return
+    entry = {"time": datetime.now().isoformat(timespec="seconds"), **snapshot()}
+    try:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + "\n")
+        _unlogged = 0
+    except OSError as e:
+        print(f"Warning: could not write palette stats log {path}: {e}")
+
+@atexit.register
+def _flush_log():
+    if ENABLED and LOG_PATH and _unlogged:
+        append_log()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Non-repeating palette streams.
+
+A stream draws palettes one after another from a single seeded random stream, and remembers the
+last `window` palettes it emitted in a deque plus a set of their color-name sets. A palette whose
+colors (in any order) match a remembered one is redrawn, so nothing repeats within the window.
+Each step costs a bounded number of draws and O(1) bookkeeping, however many palettes the
+stream has produced.
+
+Streams live in memory for the session, keyed by their palette settings only. The seed only
+seeds a stream's random stream when it is created or reset, so a seed that changes every run
+(ComfyUI's randomize/increment modes) still continues one stream and one window.
+"""
+import random
+import threading
+from collections import OrderedDict, deque
+
+MAX_REDRAWS = 50
+MAX_STREAMS = 16
+
+class PaletteStream:
+    """A seeded random stream plus the color-name sets of the last `window` palettes drawn from it."""
+    __slots__ = ("rng", "window", "recent", "seen", "emitted")
+
+    def __init__(self, seed, window):
+        self.rng = random.Random(seed)
+        self.window = window
+        self.recent = deque()
+        self.seen = set()
+        self.emitted = 0
+
+    def next(self, draw):
+        """Next palette from draw(rng) -> (palette, palette_type) that isn't in the window."""
+        for _ in range(MAX_REDRAWS):
+            palette, palette_type = draw(self.rng)
+            key = frozenset(palette)
+            if key not in self.seen:
+                break
+        else:
+            print(f"Warning: Attempted {MAX_REDRAWS} times to draw a palette not seen in the last "
+                  f"{self.window}; the settings allow too few palettes for this window. Repeating one.")
+        self._remember(key)
+        self.emitted += 1
+        return palette, palette_type
+
+    def _remember(self, key):
+        if self.window <= 0:
+            return
+        if key in self.seen:
+            # Only possible after the warning above; move it to the newest position.
+            self.recent.remove(key)
+        else:
+            self.seen.add(key)
+        self.recent.append(key)
+        if len(self.recent) > self.window:
+            self.seen.discard(self.recent.popleft())
+
+_lock = threading.Lock()
+_streams = OrderedDict()
+
+def get_stream(stream_key, seed, window, reset=False):
+    """
+    The stream for stream_key (any hashable identifying the palette settings), created from seed
+    on first use or reset; on later calls the seed is ignored. Changing the window keeps the stream;
+    a smaller window forgets the oldest palettes. The least recently used streams are dropped
+    beyond MAX_STREAMS.
+    """
+    key = stream_key
+    with _lock:
+        stream = None if reset else _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = PaletteStream(seed, window)
+        else:
+            stream.window = window
+            while len(stream.recent) > max(window, 0):
+                stream.seen.discard(stream.recent.popleft())
+        _streams.move_to_end(key)
+        while len(_streams) > MAX_STREAMS:
+            _streams.popitem(last=False)
+        return stream
+
+def next_palette(stream_key, seed, window, draw, reset=False):
+    """Draw the next palette of a stream; see PaletteStream.next. Returns (palette, palette_type, index)."""
+    stream = get_stream(stream_key, seed, window, reset)
+    with _lock:
+        palette, palette_type = stream.next(draw)
+        return palette, palette_type, stream.emitted - 1
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement, groupby
+from .color_data import (color_families, BASE_COLOR_CANDIDATES, COLOR_FAMILY_MASKS, WARM_BIT, COOL_BIT,
+                         BROAD_NEUTRALS_BIT, family_bit, in_family)
+from .color_math import CANONICAL_COLOR_NAMES
+from .make_palette_analogous import ANALOGOUS_TABLE
+from .make_palette_complementary import COMPLEMENTARY_TABLE
+from .make_palette_double_complementary import TETRADIC_TABLE
+from .make_palette_modified_compound import COMPOUND_TABLE
+from .make_palette_split_complementary import SPLIT_COMPLEMENTARY_TABLE
+from .make_palette_triadic import TRIADIC_TABLE
+
+PALETTE_TYPES = [
+    "analogous", "art house", "chaotic", "complementary",
+    "compound", "split complementary", "tetradic", "triadic"
+]
+
+# Palette types whose colors are derived from a base color by hue shifts.
+HUE_PALETTE_TYPES = [
+    "analogous", "complementary", "compound", "split complementary", "tetradic", "triadic"
+]
+
+PALETTE_SIZES = [3, 4, 5]
+
+# ----------------------------
+# Deterministic Palette Cores
+# ----------------------------
+def palette_core(palette_type, size, base_name):
+    """
+    The color names a hue palette type always derives from base_name for the given size,
+    looked up in the generator modules' precomputed tables. Random extras (Broad Neutrals,
+    the 4-of-5 compound sample) are not part of the core.
+    """
+    if palette_type == "analogous":
+        analog_names, extra = ANALOGOUS_TABLE[base_name]
+        return analog_names + (extra,) if size == 5 else analog_names
+    if palette_type == "complementary":
+        return COMPLEMENTARY_TABLE[base_name][5] if size == 5 else COMPLEMENTARY_TABLE[base_name][4][:size]
+    if palette_type == "compound":
+        return COMPOUND_TABLE[base_name]
+    if palette_type == "split complementary":
+        return SPLIT_COMPLEMENTARY_TABLE[base_name][0]
+    if palette_type == "tetradic":
+        return TETRADIC_TABLE[base_name][5] if size == 5 else TETRADIC_TABLE[base_name][4][:size]
+    if palette_type == "triadic":
+        return TRIADIC_TABLE[base_name][0]
+    raise ValueError("Not a hue palette type: " + palette_type)
+
+def _build_palette_cores():
+    return {
+        (palette_type, size): {name: palette_core(palette_type, size, name) for name in dict.fromkeys(BASE_COLOR_CANDIDATES)}
+        for palette_type in HUE_PALETTE_TYPES
+        for size in PALETTE_SIZES
+    }
+
+# (palette type, palette size) -> {base color name: tuple of core color names}, built once at import.
+PALETTE_CORES = _build_palette_cores()
+
+# ----------------------------
+# Color Family Preferences
+# ----------------------------
+def palette_satisfies(palette, prefer_color_family="None", avoid_color_family="None"):
+    """
+    Check a list of color names against the prefer/avoid color family settings used by
+    the Random Color Palette node. "Warm Colors"/"Cool Colors" compare warm vs. cool counts;
+    any other family requires (prefer) or forbids (avoid) at least one member. Membership is
+    read from the colors' precomputed family bitmasks in a single pass over the palette.
+    """
+    if prefer_color_family == "None" and avoid_color_family == "None":
+        return True
+
+    families = 0  # Union of the palette's family bits.
+    warm_count = cool_count = 0
+    for color in palette:
+        mask = COLOR_FAMILY_MASKS.get(color, 0)
+        families |= mask
+        if mask & WARM_BIT:
+            warm_count += 1
+        if mask & COOL_BIT:
+            cool_count += 1
+
+    if prefer_color_family == "Warm Colors":
+        if not warm_count >= cool_count + 1:
+            return False
+    elif prefer_color_family == "Cool Colors":
+        if not cool_count >= warm_count + 1:
+            return False
+    elif prefer_color_family != "None" and not families & family_bit(prefer_color_family):
+        return False
+
+    if avoid_color_family == "Warm Colors":
+        return warm_count <= cool_count - 1
+    if avoid_color_family == "Cool Colors":
+        return cool_count <= warm_count - 1
+    if avoid_color_family != "None":
+        return not families & family_bit(avoid_color_family)
+    return True
+
+# ----------------------------
+# Generator Outcomes
+# ----------------------------
+def palette_options(palette_type, size, base_name):
+    """
+    Every way the generator behind palette_type at this size can succeed with base_name, as
+    (names, neutral_slots, canonical) tuples: the color names fixed by the base and the generator's
+    choices, followed by neutral_slots distinct Broad Neutrals that are not already in names
+    (as canonical names if canonical is set). The generator requires all of them to be unique;
+    3-color palettes are the first 3 names of a 4-color outcome.
+    """
+    generator_size = 5 if size == 5 else 4
+    if palette_type == "analogous":
+        analog_names, extra = ANALOGOUS_TABLE[base_name]
+        if generator_size == 5:
+            return [(analog_names + (extra,), 1, False)]
+        return [(analog_names, 1, False)]
+    if palette_type == "complementary":
+        return [(COMPLEMENTARY_TABLE[base_name][generator_size], 0, False)]
+    if palette_type == "tetradic":
+        return [(TETRADIC_TABLE[base_name][generator_size], 0, False)]
+    if palette_type == "compound":
+        # 4 colors are a random sample of the unique 5-name palette, and 3 colors the start of one.
+        names = COMPOUND_TABLE[base_name]
+        if size == 5 or len(set(names)) != len(names):
+            return [(names, 0, False)]
+        return [(subset, 0, False) for subset in combinations(names, size)]
+    if palette_type == "split complementary":
+        core_names, analogous_name, opposite_name = SPLIT_COMPLEMENTARY_TABLE[base_name]
+        neutral_allowed = not any(in_family(n, BROAD_NEUTRALS_BIT) for n in core_names)
+        if generator_size == 4:
+            options = [(core_names + (analogous_name,), 0, False)]
+            if neutral_allowed:
+                options.append((core_names, 1, True))
+            return options
+        if in_family(analogous_name, BROAD_NEUTRALS_BIT):
+            options = [(core_names + (analogous_name,), 1, True)]
+        else:
+            options = [(core_names + (analogous_name, opposite_name), 0, False)]
+        if neutral_allowed:
+            options.append((core_names, 2, True))
+        return options
+    if palette_type == "triadic":
+        triadic_names, plus_name, minus_name, tetradic_name = TRIADIC_TABLE[base_name]
+        if generator_size == 4:
+            options = [(triadic_names + (plus_name,), 0, False), (triadic_names + (tetradic_name,), 0, False)]
+            if not any(in_family(n, BROAD_NEUTRALS_BIT) for n in triadic_names):
+                options.append((triadic_names, 1, True))
+            return options
+        # Each extra slot is either a Broad Neutral or that slot's analogous variant.
+        return [(triadic_names + (plus_name, minus_name), 0, False),
+                (triadic_names + (plus_name,), 1, False),
+                (triadic_names + (minus_name,), 1, False),
+                (triadic_names, 2, False)]
+    raise ValueError("Not a hue palette type: " + palette_type)
+
+def _neutral_extras(count, exclude, canonical):
+    """
+    Choices of `count` distinct Broad Neutrals outside exclude, one representative per combination
+    of family bitmasks (neutrals with equal masks are interchangeable for the family settings).
+    """
+    if count == 0:
+        return [()]
+    by_mask = {}
+    for name in color_families.get("Broad Neutrals", []):
+        if canonical:
+            name = CANONICAL_COLOR_NAMES[name]
+        if name not in exclude:
+            members = by_mask.setdefault(COLOR_FAMILY_MASKS.get(name, 0), [])
+            if name not in members:
+                members.append(name)
+    choices = []
+    for masks in combinations_with_replacement(sorted(by_mask), count):
+        extras = []
+        for mask, repeats in groupby(masks):
+            extras.extend(by_mask[mask][:len(list(repeats))])
+        if len(extras) == count:
+            choices.append(tuple(extras))
+    return choices
+
+def base_can_satisfy(palette_type, size, base_name, prefer_color_family="None", avoid_color_family="None"):
+    """True if some outcome of the generator with base_name meets the prefer/avoid settings at this size."""
+    for names, neutral_slots, canonical in palette_options(palette_type, size, base_name):
+        if len(set(names)) != len(names):
+            continue
+        for extras in _neutral_extras(neutral_slots, names, canonical):
+            if palette_satisfies((names + extras)[:size], prefer_color_family, avoid_color_family):
+                return True
+    return False
+
+@lru_cache(maxsize=None)
+def eligible_base_colors(palette_type, size, prefer_color_family="None", avoid_color_family="None"):
+    """
+    Return the base colors (as a tuple, weighted like BASE_COLOR_CANDIDATES) from which the palette
+    type's generator can produce a palette of this size with unique names that meets the prefer/avoid
+    settings. An empty tuple means the palette type cannot satisfy the request.
+    """
+    usable = {name: base_can_satisfy(palette_type, size, name, prefer_color_family, avoid_color_family)
+              for name in dict.fromkeys(BASE_COLOR_CANDIDATES)}
+    return tuple(name for name in BASE_COLOR_CANDIDATES if usable[name])
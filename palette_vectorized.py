@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Vectorized palette engine for bulk (offline) palette generation.
+
+NumPy is optional. When it is installed, hue shifts and nearest-color lookups run on whole
+arrays of base colors at once, and generate_palettes gathers palettes by fancy indexing (or,
+opted into with numpy_rng=True, draws them as integer arrays too). Otherwise the same API falls
+back to the scalar functions in the make_palette_* modules. By default both backends return the
+scalar generators' palettes for the same seed.
+"""
+import random
+from .color_data import COLORS, BASE_COLOR_CANDIDATES, COLOR_NAMES, COLOR_NAME_INDEX, color_families
+from .color_math import COLOR_METRIC, _pack_hex, hex_to_rgb_tuple, shift_hue, closest_color_names, find_closest_color_name
+from .make_palette_analogous import analogous_palette, generate_analogous_palette_4, generate_analogous_palette_5
+from .make_palette_complementary import (complementary_palette, complementary_palette_5, complementary_fallback_palette,
+                                         generate_complementary_palette, generate_complementary_palette_5)
+from .make_palette_double_complementary import (tetradic_palette, generate_double_complementary_palette_4,
+                                                generate_double_complementary_palette_5)
+from .make_palette_modified_compound import (compound_palette_five, compound_fallback_palette_five,
+                                             generate_modified_compound_palette_five,
+                                             generate_modified_compound_palette_four_from_five)
+from .make_palette_split_complementary import (split_complementary_core, generate_split_complementary_palette_4,
+                                               generate_split_complementary_palette_5)
+from .make_palette_triadic import triadic_palette, generate_four_color_palette, generate_triadic_palette_5
+from .palette_table import HUE_PALETTE_TYPES, PALETTE_SIZES, PALETTE_CORES, palette_core
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+# ----------------------------
+# Array Color Math (mirrors colorsys operation for operation)
+# ----------------------------
+if HAS_NUMPY:
+    # (N, 3) array of the COLORS table in 0-255 RGB, in COLOR_NAMES order.
+    COLOR_RGB = np.array([hex_to_rgb_tuple(COLORS[name]) for name in COLOR_NAMES], dtype=np.int64)
+    _COLOR_NORMS = (COLOR_RGB * COLOR_RGB).sum(axis=1)
+
+    _ONE_THIRD = 1.0 / 3.0
+    _ONE_SIXTH = 1.0 / 6.0
+    _TWO_THIRD = 2.0 / 3.0
+
+    def hex_array_to_rgb(hex_codes):
+        """Convert a sequence of hex codes to an (N, 3) array of 0-255 RGB values."""
+        packed = np.array([_pack_hex(h) for h in hex_codes], dtype=np.int64)
+        return np.stack([packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF], axis=1)
+
+    def rgb_array_to_hls(rgb):
+        """Convert an (N, 3) array of 0-255 RGB values to (h, l, s) arrays, exactly like colorsys.rgb_to_hls."""
+        r, g, b = (rgb / 255.0).T
+        maxc = np.maximum(np.maximum(r, g), b)
+        minc = np.minimum(np.minimum(r, g), b)
+        sumc = maxc + minc
+        rangec = maxc - minc
+        l = sumc / 2.0
+        grey = minc == maxc
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.where(l <= 0.5, rangec / sumc, rangec / (2.0 - maxc - minc))
+            rc = (maxc - r) / rangec
+            gc = (maxc - g) / rangec
+            bc = (maxc - b) / rangec
+        h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+        h = (h / 6.0) % 1.0
+        return np.where(grey, 0.0, h), l, np.where(grey, 0.0, s)
+
+    def _v(m1, m2, hue):
+        hue = hue % 1.0
+        return np.where(hue < _ONE_SIXTH, m1 + (m2 - m1) * hue * 6.0,
+               np.where(hue < 0.5, m2,
+               np.where(hue < _TWO_THIRD, m1 + (m2 - m1) * (_TWO_THIRD - hue) * 6.0, m1)))
+
+    def hls_arrays_to_rgb(h, l, s):
+        """Convert (h, l, s) arrays to an (N, 3) array of 0-255 RGB values, like hls_to_hex does."""
+        m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+        m1 = 2.0 * l - m2
+        grey = s == 0.0
+        channels = [np.where(grey, l, _v(m1, m2, h + _ONE_THIRD)),
+                    np.where(grey, l, _v(m1, m2, h)),
+                    np.where(grey, l, _v(m1, m2, h - _ONE_THIRD))]
+        return (np.stack(channels, axis=1) * 255).astype(np.int64)
+
+    def shift_hue_array(rgb, degree_offset=15):
+        """Vectorized shift_hue: rotate the hue of every row of an (N, 3) RGB array."""
+        h, l, s = rgb_array_to_hls(rgb)
+        return hls_arrays_to_rgb((h + degree_offset / 360.0) % 1.0, l, s)
+
+    def nearest_color_indices(rgb):
+        """Index into COLOR_NAMES of the closest COLORS entry for every row of an (N, 3) RGB array."""
+        # |rgb - c|^2 = |rgb|^2 - 2 rgb.c + |c|^2; the first term is the same for every c in a row.
+        return np.argmin(_COLOR_NORMS - 2 * (rgb @ COLOR_RGB.T), axis=1)
+
+    def _hue_variants(hues, l, s):
+        return [hls_arrays_to_rgb(hue, l, s) for hue in hues]
+
+    def _core_rgb_arrays(palette_type, size, rgb):
+        """The RGB arrays of every core slot, computed the way the make_palette_* modules do."""
+        if palette_type == "analogous":
+            slots = [rgb, shift_hue_array(rgb, 15), shift_hue_array(rgb, -15)]
+            return slots + [shift_hue_array(rgb, 30)] if size == 5 else slots
+        if palette_type == "complementary":
+            analogous = shift_hue_array(rgb, 15)
+            if size == 5:
+                return [rgb, shift_hue_array(rgb, 180), analogous, shift_hue_array(rgb, -15),
+                        shift_hue_array(analogous, 180)]
+            return [rgb, shift_hue_array(rgb, 180), analogous, shift_hue_array(analogous, 180)][:size]
+        if palette_type == "compound":
+            return [rgb, shift_hue_array(rgb, 15), shift_hue_array(rgb, 150),
+                    shift_hue_array(rgb, 210), shift_hue_array(rgb, -15)]
+        h, l, s = rgb_array_to_hls(rgb)
+        if palette_type == "split complementary":
+            comp_h = (h + 0.5) % 1.0
+            offset = 30 / 360.0
+            return _hue_variants([h, (comp_h + offset) % 1.0, (comp_h - offset) % 1.0], l, s)
+        if palette_type == "tetradic":
+            shift_fraction = 1 / 6
+            slots = _hue_variants([h, (h + 0.5) % 1.0, (h + shift_fraction) % 1.0,
+                                   (h + shift_fraction + 0.5) % 1.0], l, s)
+            return slots + [shift_hue_array(rgb, 30)] if size == 5 else slots[:size]
+        if palette_type == "triadic":
+            return [rgb] + _hue_variants([(h + 1/3) % 1.0, (h + 2/3) % 1.0], l, s)
+        raise ValueError("Not a hue palette type: " + palette_type)
+
+# ----------------------------
+# Scalar Fallback
+# ----------------------------
+def _scalar_core_names(palette_type, size, base_hex):
+    """The core color names for one base hex, built with the make_palette_* hex functions."""
+    if palette_type == "analogous":
+        names = closest_color_names(analogous_palette(base_hex, offset_degrees=15))
+        return names + (find_closest_color_name(shift_hue(base_hex, 30), COLORS),) if size == 5 else names
+    if palette_type == "complementary":
+        if size == 5:
+            return closest_color_names(complementary_palette_5(base_hex))
+        return closest_color_names(complementary_palette(base_hex))[:size]
+    if palette_type == "compound":
+        return closest_color_names(compound_palette_five(base_hex))
+    if palette_type == "split complementary":
+        return closest_color_names(split_complementary_core(base_hex))
+    if palette_type == "tetradic":
+        hexes = tetradic_palette(base_hex)
+        if size == 5:
+            return closest_color_names(hexes + [shift_hue(base_hex, 30)])
+        return closest_color_names(hexes)[:size]
+    if palette_type == "triadic":
+        return closest_color_names(triadic_palette(base_hex))
+    raise ValueError("Not a hue palette type: " + palette_type)
+
+# ----------------------------
+# Bulk Palette Cores
+# ----------------------------
+def palette_core_indices(palette_type, size, base_hexes):
+    """
+    Core palettes for a sequence of base hex codes, as indices into COLOR_NAMES.
+    Returns an (N, k) integer array with NumPy, otherwise a list of N tuples.
+    """
+    if use_numpy():
+        rgb = hex_array_to_rgb(base_hexes)
+        return np.stack([nearest_color_indices(slot) for slot in _core_rgb_arrays(palette_type, size, rgb)], axis=1)
+    return [tuple(COLOR_NAME_INDEX[name] for name in _scalar_core_names(palette_type, size, base_hex))
+            for base_hex in base_hexes]
+
+def palette_cores(palette_type, size, base_hexes):
+    """
+    Core palettes (tuples of color names) for a sequence of base hex codes, which need not be
+    in COLORS. Equal to palette_table.palette_core for the base colors it already covers.
+    """
+    return [tuple(COLOR_NAMES[i] for i in row) for row in palette_core_indices(palette_type, size, base_hexes)]
+
+def _vectorized_matches_scalar():
+    names = list(dict.fromkeys(BASE_COLOR_CANDIDATES))
+    hexes = [COLORS[name] for name in names]
+    for palette_type in HUE_PALETTE_TYPES:
+        for size in PALETTE_SIZES:
+            expected = [PALETTE_CORES[(palette_type, size)][name] for name in names]
+            if palette_cores(palette_type, size, hexes) != expected:
+                return False
+    return True
+
+_numpy_checked = None
+
+def use_numpy():
+    """
+    True if the NumPy backend is available and reproduces the scalar tables on this platform.
+    Its nearest-color search is RGB only, so the perceptual metrics always use the scalar path.
+    The check runs once, on first use, so importing this module stays cheap.
+    """
+    global _numpy_checked
+    if _numpy_checked is None:
+        _numpy_checked = HAS_NUMPY and COLOR_METRIC == "rgb"
+        if _numpy_checked and not _vectorized_matches_scalar():
+            print("Warning: vectorized palette engine disagrees with the scalar path; using the scalar fallback.")
+            _numpy_checked = False
+    return _numpy_checked
+
+# ----------------------------
+# Bulk Palette Generation
+# ----------------------------
+GENERATORS = {
+    ("analogous", 4): generate_analogous_palette_4,
+    ("analogous", 5): generate_analogous_palette_5,
+    ("complementary", 4): generate_complementary_palette,
+    ("complementary", 5): generate_complementary_palette_5,
+    ("compound", 4): generate_modified_compound_palette_four_from_five,
+    ("compound", 5): generate_modified_compound_palette_five,
+    ("split complementary", 4): generate_split_complementary_palette_4,
+    ("split complementary", 5): generate_split_complementary_palette_5,
+    ("tetradic", 4): generate_double_complementary_palette_4,
+    ("tetradic", 5): generate_double_complementary_palette_5,
+    ("triadic", 4): generate_four_color_palette,
+    ("triadic", 5): generate_triadic_palette_5,
+}
+
+# Generators whose palette is fully determined by the drawn base color, with the fallback they use
+# after max_attempts bases without unique names.
+_DETERMINISTIC_FALLBACKS = {
+    ("complementary", 4): lambda base_colors, rng: complementary_fallback_palette(4, base_colors, rng=rng),
+    ("complementary", 5): lambda base_colors, rng: complementary_fallback_palette(5, base_colors, rng=rng),
+    ("compound", 5): compound_fallback_palette_five,
+    ("tetradic", 4): None,
+    ("tetradic", 5): None,
+}
+
+def _seeded_palettes(palette_type, size, count, rng, base_colors):
+    """
+    Replay the scalar generator's base draws from rng for the types in _DETERMINISTIC_FALLBACKS.
+    Returns the distinct core palettes and one entry per palette: a row into them, or a fallback
+    palette (list of names).
+    """
+    fallback = _DETERMINISTIC_FALLBACKS[(palette_type, size)]
+    candidates = BASE_COLOR_CANDIDATES if base_colors is None else base_colors
+    unique_names = list(dict.fromkeys(candidates))
+    cores = PALETTE_CORES[(palette_type, size)]
+    core_rows = [cores[name] if name in cores else palette_core(palette_type, size, name) for name in unique_names]
+    row_of = {name: i for i, name in enumerate(unique_names)}
+    valid = {name for name, core in zip(unique_names, core_rows) if len(set(core)) == size}
+    if fallback is None and not valid:
+        raise ValueError(f"None of the base colors gives a {size}-color {palette_type} palette with unique names.")
+    # The tetradic generators fall back to drawing from the usable bases only.
+    valid_candidates = [name for name in candidates if name in valid]
+
+    picks = []
+    max_attempts = 50
+    for _ in range(count):
+        for _ in range(max_attempts):
+            name = rng.choice(candidates)
+            if name in valid:
+                picks.append(row_of[name])
+                break
+        else:
+            if fallback is None:
+                picks.append(row_of[rng.choice(valid_candidates)])
+            else:
+                picks.append(fallback(base_colors, rng=rng))
+    return core_rows, picks
+
+# Palette types the opt-in numpy_rng path draws in bulk: a base color, then (analogous) one Broad Neutral.
+# Split complementary and triadic make several dependent choices per palette and always run scalar.
+ARRAY_PALETTE_TYPES = ["analogous", "complementary", "compound", "tetradic"]
+
+def _array_palettes(palette_type, size, count, seed, candidates):
+    """
+    (count, size) array of COLOR_NAMES indices drawn with numpy.random.Generator(seed), or None if
+    no candidate base can produce a palette with unique names.
+
+    Like the scalar generators, a base color (and analogous Broad Neutral) is redrawn until the
+    palette has unique names; the scalar generators' fallbacks after 50 failed draws are not used.
+    """
+    rng = np.random.default_rng(seed)
+    unique_names = list(dict.fromkeys(candidates))
+    row_of = {name: i for i, name in enumerate(unique_names)}
+    cores = PALETTE_CORES[(palette_type, size)]
+    core_names = [cores[name] if name in cores else palette_core(palette_type, size, name) for name in unique_names]
+    core_rows = np.array([[COLOR_NAME_INDEX[name] for name in core] for core in core_names], dtype=np.int64)
+    unique_core = np.array([len(set(core)) == len(core) for core in core_names], dtype=bool)
+    # One entry per candidate, so repeated candidates keep their weight.
+    base_rows = np.array([row_of[name] for name in candidates], dtype=np.int64)
+
+    if palette_type == "analogous":
+        neutrals = np.array([COLOR_NAME_INDEX[name] for name in color_families.get("Broad Neutrals", [])],
+                            dtype=np.int64)
+        # valid[row, j]: the core of base row plus neutral j has unique names.
+        valid = unique_core[:, None] & (core_rows[:, :, None] != neutrals[None, None, :]).all(axis=1)
+        if not valid[base_rows].any():
+            return None
+        palettes = np.empty((count, size), dtype=np.int64)
+        todo = np.arange(count)
+        while todo.size:
+            bases = base_rows[rng.integers(base_rows.size, size=todo.size)]
+            picks = rng.integers(neutrals.size, size=todo.size)
+            ok = valid[bases, picks]
+            done = todo[ok]
+            palettes[done, :-1] = core_rows[bases[ok]]
+            palettes[done, -1] = neutrals[picks[ok]]
+            todo = todo[~ok]
+        return palettes
+
+    valid_bases = base_rows[unique_core[base_rows]]
+    if not valid_bases.size:
+        return None
+    palettes = core_rows[valid_bases[rng.integers(valid_bases.size, size=count)]]
+    if palette_type == "compound" and size == 4:
+        # A random 4-color sample, in random order, of each 5-color compound palette.
+        order = np.argsort(rng.random((count, 5)), axis=1)[:, :4]
+        palettes = np.take_along_axis(palettes, order, axis=1)
+    return palettes
+
+def generate_palettes(palette_type, size, count, seed=None, base_colors=None, as_indices=False, numpy_rng=False):
+    """
+    Generate `count` palettes of one hue type and size (4 or 5) from a single random stream.
+    The result equals calling the scalar generator `count` times with rng=random.Random(seed).
+    For types whose palette is fixed by the base color only the base draws run per palette; their
+    cores are gathered in bulk. With as_indices=True palettes are rows of COLOR_NAMES indices
+    (a (count, size) array when NumPy is available).
+
+    numpy_rng=True draws the types in ARRAY_PALETTE_TYPES entirely in NumPy from
+    numpy.random.Generator(seed) when the backend is available. That is much faster for large
+    counts, but the palettes only follow the scalar generators' distribution: they are not the
+    scalar path's palettes for that seed.
+
+    Raises ValueError when no allowed base color can produce a tetradic palette with unique names.
+    """
+    if (palette_type, size) not in GENERATORS:
+        raise ValueError(f"Unsupported palette: {palette_type} ({size} colors)")
+
+    if numpy_rng and palette_type in ARRAY_PALETTE_TYPES and use_numpy():
+        candidates = BASE_COLOR_CANDIDATES if base_colors is None else base_colors
+        palettes = _array_palettes(palette_type, size, count, seed, candidates)
+        if palettes is None:
+            raise ValueError(f"None of the base colors gives a {size}-color {palette_type} palette with unique names.")
+        if as_indices:
+            return palettes
+        return [[COLOR_NAMES[i] for i in row] for row in palettes.tolist()]
+
+    rng = random.Random(seed)
+    if (palette_type, size) not in _DETERMINISTIC_FALLBACKS:
+        generator = GENERATORS[(palette_type, size)]
+        palettes = [generator(base_colors, rng=rng) for _ in range(count)]
+        return [[COLOR_NAME_INDEX[name] for name in p] for p in palettes] if as_indices else palettes
+
+    core_rows, picks = _seeded_palettes(palette_type, size, count, rng, base_colors)
+    if not as_indices:
+        return [list(core_rows[p]) if isinstance(p, int) else p for p in picks]
+    index_rows = [[COLOR_NAME_INDEX[name] for name in core] for core in core_rows]
+    rows = []
+    for p in picks:
+        if not isinstance(p, int):
+            # A fallback palette gets its own row.
+            index_rows.append([COLOR_NAME_INDEX[name] for name in p])
+            p = len(index_rows) - 1
+        rows.append(p)
+    if not use_numpy():
+        return [index_rows[r] for r in rows]
+    return np.array(index_rows, dtype=np.int64).reshape(-1, size)[np.array(rows, dtype=np.int64)]
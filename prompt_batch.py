@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Batch prompt rendering.
+
+Renders a template (see template_engine) many times in one call. Besides {choices} and
+__wildcards__, templates can use the outputs of the palette, character describer and season
+weather nodes as variables, e.g. __color1__, __hair_color__ or __weather__. Each prompt generates
+only the groups its template uses, by calling the node code directly.
+
+Prompt i is rendered with seed seed + i, so any prompt can be reproduced on its own.
+
+    from package.prompt_batch import render_prompts, write_jsonl, iter_prompt_records
+    prompts = render_prompts("a {red|blue} __hair_style__ woman, __weather__", 10000, seed=1)
+"""
+import json
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from .template_engine import compile_template, render_template, WildcardResolver
+from .nodes import (EbuPromptHelperRandomColorPalette, EbuPromptHelperSeasonWeatherTimeOfDay,
+                    EbuPromptHelperCharacterDescriberFemale, EbuPromptHelperCharacterDescriberMale)
+
+DESCRIBERS = {
+    "female": EbuPromptHelperCharacterDescriberFemale,
+    "male": EbuPromptHelperCharacterDescriberMale,
+}
+
+DEFAULT_SETTINGS = {
+    "palette_size": "4 colors",
+    "prefer_color_family": "None",
+    "avoid_color_family": "None",
+    "character": "female",
+    "year_from": 1980,
+    "year_to": 2025,
+    "time_from": "6:00am",
+    "time_to": "7:00pm",
+    "year_skew": "no skew",
+    "time_of_day_skew": "no skew",
+    "wildcard_dir": "",
+}
+
+def sub_seed(seed, group):
+    """Seed for one context group of a prompt, so the groups never share a random stream."""
+    return random.Random(f"{group}:{seed}").getrandbits(64)
+
+# ----------------------------
+# Context Groups
+# ----------------------------
+@lru_cache(maxsize=16)
+def _palette_settings(palette_size, prefer_color_family, avoid_color_family):
+    return EbuPromptHelperRandomColorPalette.palette_settings(
+        True, True, True, True, True, True, True, True,
+        palette_size, prefer_color_family, avoid_color_family)
+
+def palette_values(seed, settings):
+    node = EbuPromptHelperRandomColorPalette
+    palette_settings = _palette_settings(
+        settings["palette_size"], settings["prefer_color_family"], settings["avoid_color_family"])
+    outputs = node.palette_outputs(*node.pick_palette(*palette_settings, rng=random.Random(seed)))
+    return dict(zip(node.RETURN_NAMES, outputs))
+
+@lru_cache(maxsize=2)
+def _default_traits(character):
+    """The describer's trait toggles at their node defaults."""
+    required = DESCRIBERS[character].INPUT_TYPES()["required"]
+    return {name: spec[1]["default"] for name, spec in required.items() if name != "seed"}
+
+def character_values(seed, settings):
+    describer = DESCRIBERS[settings["character"]]
+    outputs = describer.generate(seed, **_default_traits(settings["character"]))
+    return dict(zip(describer.RETURN_NAMES, outputs))
+
+def weather_values(seed, settings):
+    node = EbuPromptHelperSeasonWeatherTimeOfDay
+    outputs = node().generate_info(
+        settings["year_from"], settings["year_to"], settings["time_from"], settings["time_to"],
+        seed, settings["year_skew"], settings["time_of_day_skew"])
+    return dict(zip(node.RETURN_NAMES, outputs))
+
+CONTEXT_GROUPS = {
+    "palette": palette_values,
+    "character": character_values,
+    "weather": weather_values,
+}
+
+# Variable name -> group. The female and male describers share all names but facial_hair.
+VARIABLE_GROUPS = {name: "palette" for name in EbuPromptHelperRandomColorPalette.RETURN_NAMES}
+VARIABLE_GROUPS.update({name: "character" for describer in DESCRIBERS.values() for name in describer.RETURN_NAMES})
+VARIABLE_GROUPS.update({name: "weather" for name in EbuPromptHelperSeasonWeatherTimeOfDay.RETURN_NAMES})
+
+class PromptContext:
+    """Template variables for one prompt, each group generated the first time one of its names is used."""
+    __slots__ = ("seed", "settings", "values", "done")
+
+    def __init__(self, seed, settings):
+        self.seed = seed
+        self.settings = settings
+        self.values = {}
+        self.done = set()
+
+    def get(self, name):
+        group = VARIABLE_GROUPS.get(name)
+        if group is None:
+            return None
+        if group not in self.done:
+            self.done.add(group)
+            self.values.update(CONTEXT_GROUPS[group](sub_seed(self.seed, group), self.settings))
+        return self.values.get(name)
+
+# ----------------------------
+# Rendering
+# ----------------------------
+def _resolve_settings(settings):
+    resolved = dict(DEFAULT_SETTINGS)
+    if settings:
+        unknown = set(settings) - set(DEFAULT_SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown prompt batch settings: {', '.join(sorted(unknown))}")
+        resolved.update(settings)
+    if resolved["character"] not in DESCRIBERS:
+        raise ValueError(f"Unknown character: {resolved['character']}")
+    return resolved
+
+def _render_range(template, seed, start, stop, settings):
+    """Render prompts start..stop-1 as records; module level so process pool workers can run it."""
+    resolver = WildcardResolver(settings["wildcard_dir"])
+    records = []
+    for index in range(start, stop):
+        prompt_seed = seed + index
+        prompt = render_template(template, random.Random(prompt_seed),
+                                 variables=PromptContext(prompt_seed, settings), resolver=resolver)
+        records.append({"index": index, "seed": prompt_seed, "prompt": prompt})
+    return records
+
+def iter_prompt_records(template, count, seed=0, settings=None, workers=0):
+    """
+    Yield {"index", "seed", "prompt"} records for `count` renders of template, in order.
+    settings overrides DEFAULT_SETTINGS. With workers > 1 the prompts are rendered in chunks on a
+    process pool; the output is identical either way. Raises ValueError for a malformed template
+    or unknown settings.
+
+    Worker processes are for standalone scripts only (the Prompt Batch node never uses them). They
+    are started with "spawn", never by forking the caller, and import this module by its package
+    name, so the package directory must be importable under that name, and the calling script needs
+    an `if __name__ == "__main__":` guard.
+    """
+    settings = _resolve_settings(settings)
+    compile_template(template)  # Fail fast on syntax errors.
+    if workers <= 1 or count < 2:
+        chunk = 1024
+        for start in range(0, count, chunk):
+            yield from _render_range(template, seed, start, min(start + chunk, count), settings)
+        return
+
+    chunk = max(1, min(1024, count // (workers * 4)))
+    starts = range(0, count, chunk)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        chunks = pool.map(_render_range, [template] * len(starts), [seed] * len(starts),
+                          starts, [min(start + chunk, count) for start in starts], [settings] * len(starts))
+        for records in chunks:
+            yield from records
+
+def render_prompts(template, count, seed=0, settings=None, workers=0):
+    """List of `count` rendered prompts; see iter_prompt_records."""
+    return [record["prompt"] for record in iter_prompt_records(template, count, seed, settings, workers)]
+
+def write_jsonl(path, records):
+    """Stream records to a JSONL file, one JSON object per line. Returns the number written."""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+            written += 1
+    return written
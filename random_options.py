@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+import re
+from functools import lru_cache
+from .weighted_sampler import WeightedSampler
+
+# Weighted option syntax: N>>option, where N is a whole or decimal number (e.g. 3>>red, 0.5>>blue)
+WEIGHT_PATTERN = re.compile(r'^\s*(\d+(?:\.\d*)?|\.\d+)\s*>>(.*)$')
+
+def split_options(replacement_options, delimit_options_with="newlines"):
+    """Split an options string on the chosen delimiter, dropping empty entries."""
+    if delimit_options_with == "commas":
+        parts = replacement_options.split(',')
+    elif delimit_options_with == "semi-colons":
+        parts = replacement_options.split(';')
+    else:
+        parts = replacement_options.splitlines()
+    return [opt.strip() for opt in parts if opt.strip()]
+
+def parse_weight(text):
+    """Parse a weight prefix as an int when it is a whole number, else as a float."""
+    return int(text) if text.isdigit() else float(text)
+
+@lru_cache(maxsize=64)
+def parse_options(replacement_options, delimit_options_with="newlines"):
+    """
+    Parse the Randomize node's options text into a WeightedSampler. Unweighted options have
+    weight 1 and zero-weight options are dropped; returns None if nothing can be picked.
+    Memory scales with the number of options, not with the weights. Cached by
+    (replacement_options, delimit_options_with) so unchanged option lists are only parsed once.
+    """
+    weighted = []
+    for item in split_options(replacement_options, delimit_options_with):
+        m = WEIGHT_PATTERN.match(item)
+        if m:
+            weight = parse_weight(m.group(1))
+            if weight > 0:
+                weighted.append((m.group(2).strip(), weight))
+        else:
+            weighted.append((item, 1))
+    return WeightedSampler(weighted) if weighted else None
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Prompt templates with inline random choices and wildcard lists.
+
+  {red|blue|3>>green}   one option, picked by weight (N>> weights an option N times, as in Randomize)
+  {a {big|small} cat|a dog}   choices nest
+  __colors__            a random line of colors.txt in the wildcard directory; lines may be
+                        weighted with N>> and may contain templates themselves
+  \\{ \\} \\| \\_ \\\\        literal characters
+
+A template is parsed once into a tree of literal strings, choices and wildcard references
+(compiled templates are cached by their text) and rendered in a single pass with one output join.
+"""
+import os
+import random
+import re
+import threading
+from functools import lru_cache
+from .weighted_sampler import WeightedSampler
+from .random_options import WEIGHT_PATTERN, parse_weight
+from .file_cache import FILE_CACHE, file_signature
+
+WEIGHT_PREFIX = re.compile(r'\s*(\d+(?:\.\d*)?|\.\d+)\s*>>')
+WILDCARD_NAME = re.compile(r'__([A-Za-z0-9][\w\-./]*?)__')
+ESCAPABLE = "{}|_\\"
+WILDCARD_SUFFIX = ".txt"
+# Wildcards nested deeper than this (e.g. a list that refers to itself) are left as written.
+MAX_WILDCARD_DEPTH = 16
+
+class Choice:
+    """Pick one of several weighted option templates."""
+    __slots__ = ("sampler",)
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+
+class Wildcard:
+    """Reference to a wildcard list by name."""
+    __slots__ = ("name", "text")
+
+    def __init__(self, name, text):
+        self.name = name
+        self.text = text
+
+# ----------------------------
+# Parsing
+# ----------------------------
+def _parse_sequence(text, pos, in_choice):
+    """Parse literals, choices and wildcards up to the end of text (or of the current option)."""
+    parts = []
+    literal = []
+    n = len(text)
+    while pos < n:
+        ch = text[pos]
+        if ch == '\\' and pos + 1 < n and text[pos + 1] in ESCAPABLE:
+            literal.append(text[pos + 1])
+            pos += 2
+        elif ch == '{':
+            if literal:
+                parts.append(''.join(literal))
+                literal = []
+            choice, pos = _parse_choice(text, pos + 1)
+            parts.append(choice)
+        elif in_choice and (ch == '|' or ch == '}'):
+            break
+        else:
+            m = WILDCARD_NAME.match(text, pos) if ch == '_' else None
+            if m is None:
+                literal.append(ch)
+                pos += 1
+                continue
+            if literal:
+                parts.append(''.join(literal))
+                literal = []
+            parts.append(Wildcard(m.group(1), m.group(0)))
+            pos = m.end()
+    if literal:
+        parts.append(''.join(literal))
+    return parts, pos
+
+def _strip_option(parts):
+    """Trim whitespace around an option, as Randomize does for its options."""
+    if parts and isinstance(parts[0], str):
+        parts[0] = parts[0].lstrip()
+    if parts and isinstance(parts[-1], str):
+        parts[-1] = parts[-1].rstrip()
+    return tuple(part for part in parts if part != '')
+
+def _parse_choice(text, pos):
+    """Parse the options of a {...} choice starting just after the '{'."""
+    weighted = []
+    start = pos - 1
+    while True:
+        weight = 1
+        m = WEIGHT_PREFIX.match(text, pos)
+        if m:
+            weight = parse_weight(m.group(1))
+            pos = m.end()
+        parts, pos = _parse_sequence(text, pos, True)
+        if weight > 0:
+            weighted.append((_strip_option(parts), weight))
+        if pos >= len(text):
+            raise ValueError(f"Unclosed '{{' at position {start} in template.")
+        pos += 1
+        if text[pos - 1] == '}':
+            break
+    return (Choice(WeightedSampler(weighted)) if weighted else ''), pos
+
+def parse_template(text):
+    """
+    Parse template text into a tuple of parts: literal strings, Choice and Wildcard objects.
+    Raises ValueError for an unclosed '{'.
+    """
+    parts, _ = _parse_sequence(text, 0, False)
+    return tuple(part for part in parts if part != '')
+
+@lru_cache(maxsize=256)
+def compile_template(text):
+    """parse_template, with compiled templates kept in an LRU cache keyed by text."""
+    return parse_template(text)
+
+# ----------------------------
+# Wildcard Lists
+# ----------------------------
+_WILDCARDS = {}  # path -> ((mtime_ns, size), sampler or None)
+_WILDCARDS_LOCK = threading.Lock()
+
+def _compile_wildcard_file(path):
+    """Compile each non-empty, non-comment line of a wildcard file into a weighted option template."""
+    weighted = []
+    for line in FILE_CACHE.read_text(path).splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        weight = 1
+        m = WEIGHT_PATTERN.match(line)
+        if m:
+            weight = parse_weight(m.group(1))
+            line = m.group(2).strip()
+        if weight <= 0:
+            continue
+        try:
+            weighted.append((parse_template(line), weight))
+        except ValueError as e:
+            print(f"Warning: {path}: {e} Using the line as written.")
+            weighted.append(((line,), weight))
+    return WeightedSampler(weighted) if weighted else None
+
+def wildcard_path(directory, name):
+    """Path of the wildcard list `name` in directory, or None if it would fall outside it."""
+    root = os.path.abspath(directory)
+    path = os.path.abspath(os.path.join(root, name + WILDCARD_SUFFIX))
+    return path if path.startswith(root + os.sep) else None
+
+def load_wildcard(directory, name):
+    """
+    Return the WeightedSampler for a wildcard list, or None if it is missing or empty.
+    Compiled lists are reused while the file's mtime and size are unchanged.
+    """
+    path = wildcard_path(directory, name)
+    if path is None:
+        return None
+    try:
+        signature = file_signature(path)
+    except OSError:
+        return None
+    with _WILDCARDS_LOCK:
+        cached = _WILDCARDS.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    sampler = _compile_wildcard_file(path)
+    with _WILDCARDS_LOCK:
+        _WILDCARDS[path] = (signature, sampler)
+    return sampler
+
+# ----------------------------
+# Rendering
+# ----------------------------
+class WildcardResolver:
+    """
+    Looks up wildcard lists in a directory for render_template. Each list is looked up (and checked
+    for changes) once per resolver, so one resolver can be shared by many renders.
+    """
+    def __init__(self, directory=""):
+        self.directory = directory
+        self._lists = {}
+
+    def __call__(self, name):
+        if name not in self._lists:
+            self._lists[name] = load_wildcard(self.directory, name) if self.directory else None
+        return self._lists[name]
+
+def _render_parts(parts, rng, out, lookup, depth):
+    for part in parts:
+        if type(part) is str:
+            out.append(part)
+        elif type(part) is Choice:
+            _render_parts(part.sampler.pick_repeated(rng), rng, out, lookup, depth)
+        else:
+            value = lookup(part.name) if depth < MAX_WILDCARD_DEPTH else None
+            if value is None:
+                out.append(part.text)
+            elif type(value) is str:
+                out.append(value)
+            else:
+                _render_parts(value.pick_repeated(rng), rng, out, lookup, depth + 1)
+
+def render_template(text, rng=random, wildcard_dir="", variables=None, resolver=None):
+    """
+    Render template text with rng, resolving __name__ wildcards from wildcard_dir (or through a
+    shared WildcardResolver). If variables is given, variables.get(name) is tried first and a
+    string result is inserted as is. Wildcards that cannot be resolved (no directory, missing or
+    empty list) are left as written. Raises ValueError for malformed templates.
+    """
+    parts = compile_template(text)
+    if resolver is None:
+        resolver = WildcardResolver(wildcard_dir)
+    lookup = resolver
+    if variables is not None:
+        def lookup(name):
+            value = variables.get(name)
+            return resolver(name) if value is None else value
+
+    out = []
+    _render_parts(parts, rng, out, lookup, 0)
+    return ''.join(out)
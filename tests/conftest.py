@@ -0,0 +1,15 @@
+import importlib.util
+import os
+import sys
+
+# The repository directory is the package (ComfyUI loads it by directory name, which may contain
+# hyphens), so load it under a fixed importable name for the tests.
+PACKAGE_NAME = "ebu_prompthelper"
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if PACKAGE_NAME not in sys.modules:
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE_NAME, os.path.join(PACKAGE_DIR, "__init__.py"), submodule_search_locations=[PACKAGE_DIR])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = package
+    spec.loader.exec_module(package)
@@ -0,0 +1,33 @@
+import pytest
+
+from ebu_prompthelper.nodes import (EbuPromptHelperCharacterDescriberFemale, EbuPromptHelperCharacterDescriberFemaleBatch,
+                                    EbuPromptHelperCharacterDescriberMale, EbuPromptHelperCharacterDescriberMaleBatch)
+
+def _default_traits(describer):
+    required = describer.INPUT_TYPES()["required"]
+    return {name: spec[1]["default"] for name, spec in required.items() if name != "seed"}
+
+def _labels(face_description):
+    return [line.split(": ", 1)[0] for line in face_description.split("\n")]
+
+@pytest.mark.parametrize("single, batch", [
+    (EbuPromptHelperCharacterDescriberFemale, EbuPromptHelperCharacterDescriberFemaleBatch),
+    (EbuPromptHelperCharacterDescriberMale, EbuPromptHelperCharacterDescriberMaleBatch),
+])
+@pytest.mark.parametrize("all_enabled", [False, True])
+def test_batch_matches_single_node_layout(single, batch, all_enabled):
+    traits = _default_traits(single)
+    if all_enabled:
+        traits = dict.fromkeys(traits, True)
+    outputs = batch().generate_batch(5, 100, False, **traits)
+    assert outputs == batch().generate_batch(5, 100, False, **traits)
+    assert len(outputs) == len(single.RETURN_NAMES)
+    assert all(len(column) == 100 for column in outputs)
+    expected_labels = _labels(single.generate(5, **traits)[0])
+    assert all(_labels(face) == expected_labels for face in outputs[0])
+
+def test_unique_batch_has_no_repeats():
+    traits = _default_traits(EbuPromptHelperCharacterDescriberMale)
+    outputs = EbuPromptHelperCharacterDescriberMaleBatch().generate_batch(1, 300, True, **traits)
+    rows = list(zip(*outputs))
+    assert len(rows) == 300 and len(set(rows)) == 300
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.color_data import COLOR_FAMILY_MASKS, COLORS, color_families, family_bit, in_family
+from ebu_prompthelper.palette_table import palette_satisfies
+
+FAMILIES = sorted(color_families)
+
+def test_masks_match_family_membership():
+    for family, members in color_families.items():
+        bit = family_bit(family)
+        assert {name for name in COLORS if in_family(name, bit)} == set(members) & set(COLORS)
+    assert family_bit("None") == 0
+    assert not in_family("NOT A COLOR", family_bit("Reds"))
+    assert set(COLOR_FAMILY_MASKS) >= set(COLORS)
+
+def _satisfies_by_lists(palette, prefer, avoid):
+    """palette_satisfies written against the color_families lists, as the nodes used to check it."""
+    def count(family):
+        return sum(1 for color in palette if color in color_families[family])
+
+    if prefer in ("Warm Colors", "Cool Colors"):
+        other = "Cool Colors" if prefer == "Warm Colors" else "Warm Colors"
+        if count(prefer) < count(other) + 1:
+            return False
+    elif prefer != "None" and not count(prefer):
+        return False
+    if avoid in ("Warm Colors", "Cool Colors"):
+        other = "Cool Colors" if avoid == "Warm Colors" else "Warm Colors"
+        return count(avoid) <= count(other) - 1
+    return avoid == "None" or not count(avoid)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_palette_satisfies_matches_the_family_lists(seed):
+    rng = random.Random(seed)
+    names = list(COLORS)
+    for _ in range(400):
+        palette = rng.sample(names, rng.randint(3, 5))
+        prefer = rng.choice(["None"] + FAMILIES)
+        avoid = rng.choice(["None"] + FAMILIES)
+        assert palette_satisfies(palette, prefer, avoid) == _satisfies_by_lists(palette, prefer, avoid)
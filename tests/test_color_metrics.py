@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.color_data import COLORS
+from ebu_prompthelper.color_math import (ColorIndex, delta_e76, delta_e2000, find_closest_color_name,
+                                         find_closest_color_name_linear, hex_to_lab, rgb_to_lab)
+
+# Reference pairs from Sharma, Wu and Dalal, "The CIEDE2000 Color-Difference Formula" (2005).
+@pytest.mark.parametrize("lab1, lab2, expected", [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+])
+def test_delta_e2000_reference_pairs(lab1, lab2, expected):
+    assert delta_e2000(lab1, lab2) == pytest.approx(expected, abs=1e-4)
+    assert delta_e2000(lab2, lab1) == pytest.approx(expected, abs=1e-4)
+
+def test_lab_conversion_and_delta_e76():
+    assert rgb_to_lab((255, 255, 255)) == pytest.approx((100.0, 0.0, 0.0), abs=1e-3)
+    assert rgb_to_lab((255, 0, 0)) == pytest.approx((53.2408, 80.0925, 67.2032), abs=1e-3)
+    assert delta_e76((50.0, 0.0, 0.0), (53.0, 4.0, 0.0)) == pytest.approx(5.0)
+
+def _brute_force(target_hex, distance):
+    target = hex_to_lab(target_hex)
+    return min(COLORS, key=lambda name: distance(target, hex_to_lab(COLORS[name])))
+
+@pytest.mark.parametrize("metric, distance", [("de76", delta_e76), ("de2000", delta_e2000)])
+def test_perceptual_index_finds_the_nearest_color(metric, distance):
+    rng = random.Random(22)
+    index = ColorIndex(COLORS, metric)
+    for _ in range(40):
+        target = "#{:06x}".format(rng.randrange(1 << 24))
+        assert index.closest(target) == _brute_force(target, distance)
+        assert find_closest_color_name(target, metric=metric) == index.closest(target)
+
+def test_rgb_index_matches_the_linear_scan():
+    rng = random.Random(22)
+    for _ in range(200):
+        target = "#{:06x}".format(rng.randrange(1 << 24))
+        assert find_closest_color_name(target, metric="rgb") == find_closest_color_name_linear(target, COLORS)
+
+def test_unknown_metric_raises():
+    with pytest.raises(ValueError):
+        ColorIndex(COLORS, "cmyk")
@@ -0,0 +1,55 @@
+import os
+
+from ebu_prompthelper.file_cache import FileCache
+from ebu_prompthelper.nodes import EbuPromptHelperLoadFileAsString
+
+def _write(path, text, mtime_ns=None):
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+def test_changed_size_or_mtime_is_reread(tmp_path):
+    cache = FileCache(1024)
+    path = _write(tmp_path / "a.txt", "one", mtime_ns=1_000_000_000)
+    assert cache.read_text(path) == "one"
+
+    # Same size, new mtime.
+    _write(tmp_path / "a.txt", "two", mtime_ns=2_000_000_000)
+    assert cache.read_text(path) == "two"
+    # Same mtime, new size.
+    _write(tmp_path / "a.txt", "three", mtime_ns=2_000_000_000)
+    assert cache.read_text(path) == "three"
+
+def test_unchanged_file_is_served_from_the_cache(tmp_path):
+    cache = FileCache(1024)
+    path = _write(tmp_path / "a.txt", "one", mtime_ns=1_000_000_000)
+    assert cache.read_text(path) == "one"
+    # Rewrite with the same size and mtime: the cached text is returned.
+    _write(tmp_path / "a.txt", "two", mtime_ns=1_000_000_000)
+    assert cache.read_text(path) == "one"
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = FileCache(10)
+    a = _write(tmp_path / "a.txt", "aaaa")
+    b = _write(tmp_path / "b.txt", "bbbb")
+    c = _write(tmp_path / "c.txt", "cccc")
+    cache.read_text(a)
+    cache.read_text(b)
+    cache.read_text(a)  # b is now the least recently used
+    cache.read_text(c)
+    assert list(cache._entries) == [os.path.abspath(a), os.path.abspath(c)]
+    assert cache._total == 8
+
+def test_files_larger_than_the_cache_are_not_kept(tmp_path):
+    cache = FileCache(3)
+    path = _write(tmp_path / "big.txt", "too big")
+    assert cache.read_text(path) == "too big"
+    assert not cache._entries and cache._total == 0
+
+def test_load_file_is_changed_follows_the_file(tmp_path):
+    _write(tmp_path / "a.txt", "one", mtime_ns=1_000_000_000)
+    first = EbuPromptHelperLoadFileAsString.IS_CHANGED(str(tmp_path), "a.txt")
+    assert first == EbuPromptHelperLoadFileAsString.IS_CHANGED(str(tmp_path), "a.txt")
+    _write(tmp_path / "a.txt", "one!", mtime_ns=1_000_000_000)
+    assert EbuPromptHelperLoadFileAsString.IS_CHANGED(str(tmp_path), "a.txt") != first
@@ -0,0 +1,57 @@
+import os
+
+from ebu_prompthelper import line_index
+from ebu_prompthelper.line_index import read_byte_range
+from ebu_prompthelper.nodes import EbuPromptHelperLoadFileAsString
+
+def _write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+def test_byte_range_trims_partial_utf8_characters(tmp_path):
+    # Byte offsets: a=0, é=1-2, b=3, €=4-6, c=7
+    path = _write(tmp_path, "utf8.txt", "aéb€c".encode("utf-8"))
+    assert read_byte_range(path) == "aéb€c"
+    # Starting inside "é" skips forward past it; ending inside "€" backs off before it.
+    assert read_byte_range(path, 2, 4) == "b"
+    assert read_byte_range(path, 1, 2) == "é"
+    assert read_byte_range(path, 4, 2) == ""
+    assert read_byte_range(path, 3) == "b€c"
+    assert read_byte_range(path, 5) == "c"
+    assert read_byte_range(path, 100, 5) == ""
+
+def test_byte_range_translates_newlines(tmp_path):
+    path = _write(tmp_path, "crlf.txt", b"one\r\ntwo\rthree\n")
+    assert read_byte_range(path) == "one\ntwo\nthree\n"
+
+def test_load_file_slice_modes(tmp_path):
+    _write(tmp_path, "list.txt", "zero\r\none\ntwo\nthree\n".encode("utf-8"))
+    node = EbuPromptHelperLoadFileAsString()
+    directory = str(tmp_path)
+    assert node.load_file(directory, "list.txt") == ("zero\none\ntwo\nthree\n",)
+    assert node.load_file(directory, "list.txt", "lines", 1, 2) == ("one\ntwo",)
+    assert node.load_file(directory, "list.txt", "lines", 2, 0) == ("two\nthree",)
+    assert node.load_file(directory, "list.txt", "lines", 10, 1) == ("",)
+    assert node.load_file(directory, "list.txt", "bytes", 6, 3) == ("one",)
+    assert node.load_file(directory, "missing.txt", "lines") == ("",)
+
+def test_line_index_is_rebuilt_when_the_file_changes(tmp_path):
+    path = _write(tmp_path, "list.txt", b"a\nb\n")
+    with line_index.get_line_index(path) as lines:
+        assert list(lines) == ["a", "b"]
+    assert os.path.exists(path + line_index.INDEX_SUFFIX)
+
+    with open(path, "wb") as f:
+        f.write(b"first line\nsecond\nthird\n")
+    # Same mtime is possible on coarse clocks; the size alone must trigger the rebuild.
+    with line_index.get_line_index(path) as lines:
+        assert len(lines) == 3
+        assert lines[2] == "third"
+
+    # A stale saved index is not trusted either.
+    line_index._INDEXES.clear()
+    with open(path, "wb") as f:
+        f.write(b"x\n")
+    with line_index.get_line_index(path) as lines:
+        assert list(lines) == ["x"]
@@ -0,0 +1,62 @@
+import os
+import threading
+
+from ebu_prompthelper import line_index
+
+def _open_descriptors():
+    return len(os.listdir(f"/proc/{os.getpid()}/fd"))
+
+def test_index_cache_is_bounded_and_holds_no_open_files(tmp_path):
+    line_index._INDEXES.clear()
+    paths = []
+    for i in range(line_index.MAX_INDEXES + 20):
+        path = tmp_path / f"list{i}.txt"
+        path.write_text(f"first {i}\nsecond {i}\n", encoding="utf-8")
+        paths.append(str(path))
+
+    before = _open_descriptors()
+    seconds = []
+    for path in paths:
+        with line_index.get_line_index(path) as lines:
+            seconds.append(lines[1])
+    assert seconds == [f"second {i}" for i in range(len(paths))]
+    assert len(line_index._INDEXES) == line_index.MAX_INDEXES
+    assert _open_descriptors() == before
+
+def test_closed_index_reopens_its_map(tmp_path):
+    path = tmp_path / "list.txt"
+    path.write_text("first\nsecond\n", encoding="utf-8")
+    with line_index.get_line_index(str(path)) as lines:
+        assert lines[0] == "first"
+    assert lines._map is None
+    assert lines.text() == "first\nsecond"
+    lines.close()
+
+def test_building_one_index_does_not_block_others(tmp_path, monkeypatch):
+    cached = tmp_path / "cached.txt"
+    cached.write_text("a\nb\n", encoding="utf-8")
+    line_index.get_line_index(str(cached)).close()
+    slow = tmp_path / "slow.txt"
+    slow.write_text("c\nd\n", encoding="utf-8")
+
+    started, release = threading.Event(), threading.Event()
+    build = line_index.build_line_offsets
+
+    def slow_build(path, size):
+        started.set()
+        release.wait(5)
+        return build(path, size)
+
+    monkeypatch.setattr(line_index, "build_line_offsets", slow_build)
+    worker = threading.Thread(target=lambda: line_index.get_line_index(str(slow)).close())
+    worker.start()
+    try:
+        assert started.wait(5)
+        # The cached file is served while the other index is still being built.
+        with line_index.get_line_index(str(cached)) as lines:
+            assert lines[1] == "b"
+    finally:
+        release.set()
+        worker.join()
+    with line_index.get_line_index(str(slow)) as lines:
+        assert lines[1] == "d"
@@ -0,0 +1,30 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.list_sampling import clean_line, is_blank_line, iter_shuffled_indices, sample_lines
+from ebu_prompthelper.nodes import EbuPromptHelperListSampler
+
+@pytest.mark.parametrize("line", ["", "   ", "1.", "12. ", "1. item", "  1. ", "item", " 3.5 apples"])
+def test_is_blank_line_agrees_with_clean_line(line):
+    assert is_blank_line(line) == (clean_line(line) == "")
+
+def test_shuffled_indices_are_a_seeded_permutation():
+    first = list(iter_shuffled_indices(100, random.Random(5)))
+    assert sorted(first) == list(range(100))
+    assert first == list(iter_shuffled_indices(100, random.Random(5)))
+
+def test_sample_lines_skips_blank_lines_and_cleans_numbers():
+    lines = ["1. red", "", "2. ", "green", "  ", "3. blue"]
+    sample = sample_lines(lines, 10, random.Random(1))
+    assert sorted(sample) == ["blue", "green", "red"]
+    assert sample_lines(lines, 2, random.Random(1)) == sample[:2]
+
+def test_list_sampler_reads_the_same_lines_from_a_file(tmp_path):
+    text = "\n".join(f"{i}. item {i}" for i in range(1, 51))
+    path = tmp_path / "list.txt"
+    path.write_text(text + "\n", encoding="utf-8")
+    node = EbuPromptHelperListSampler()
+    from_text = node.sample_list(text, 42, number_of_elements=5)
+    assert from_text == node.sample_list("", 42, number_of_elements=5, file_path=str(path))
+    assert len(from_text[0].split("\n")) == 5
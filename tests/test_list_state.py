@@ -0,0 +1,15 @@
+from ebu_prompthelper import list_state
+
+def test_alternating_walks_keep_their_permutations(tmp_path, monkeypatch):
+    monkeypatch.setenv(list_state.STATE_DIR_ENV, str(tmp_path))
+    list_state._permutation.cache_clear()
+    lists = {"a": [f"a-{i}" for i in range(50)], "b": [f"b-{i}" for i in range(60)]}
+    taken = {name: [] for name in lists}
+    for _ in range(60):
+        for name, items in lists.items():
+            taken[name].append(list_state.step_list(name, items, name, seed=7))
+    for name, items in lists.items():
+        assert sorted(item for item in taken[name] if item) == sorted(items)
+        assert list_state.step_list(name, items, name, seed=7) == ""
+    # Both shuffles were built once and then served from the cache.
+    assert list_state._permutation.cache_info().misses == 2
@@ -0,0 +1,32 @@
+from ebu_prompthelper import file_cache
+from ebu_prompthelper.nodes import EbuPromptHelperLoadDirectory
+
+def _make_tree(tmp_path):
+    (tmp_path / "b.txt").write_text("bee", encoding="utf-8")
+    (tmp_path / "a.txt").write_text("ay", encoding="utf-8")
+    (tmp_path / "notes.md").write_text("skipped", encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.txt").write_text("sea", encoding="utf-8")
+
+def test_loads_matching_files_in_name_order(tmp_path):
+    _make_tree(tmp_path)
+    node = EbuPromptHelperLoadDirectory()
+    assert node.load_directory(str(tmp_path), "*.txt", "commas") == ("ay, bee", ["ay", "bee"], ["a.txt", "b.txt"])
+    joined, contents, names = node.load_directory(str(tmp_path), "**/*.txt", "newlines")
+    assert joined == "ay\nbee\nsea"
+    assert names == ["a.txt", "b.txt", "sub/c.txt"]
+
+def test_unreadable_files_are_left_out(tmp_path):
+    _make_tree(tmp_path)
+    (tmp_path / "bad.txt").write_bytes(b"\xff\xfe\xfa")
+    assert EbuPromptHelperLoadDirectory().load_directory(str(tmp_path), "*.txt", "spaces")[2] == ["a.txt", "b.txt"]
+
+def test_is_changed_prefetches_and_tracks_the_files(tmp_path):
+    _make_tree(tmp_path)
+    file_cache.FILE_CACHE.clear()
+    first = EbuPromptHelperLoadDirectory.IS_CHANGED(str(tmp_path), "*.txt")
+    for path in file_cache.matching_files(str(tmp_path), "*.txt"):
+        file_cache.submit_read(path).result()
+    assert len(file_cache.FILE_CACHE._entries) == 2
+    (tmp_path / "d.txt").write_text("dee", encoding="utf-8")
+    assert EbuPromptHelperLoadDirectory.IS_CHANGED(str(tmp_path), "*.txt") != first
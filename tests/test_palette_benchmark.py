@@ -0,0 +1,14 @@
+from ebu_prompthelper import color_math, make_palette_analogous, palette_benchmark
+
+def test_end_to_end_baseline_matches_current_generators():
+    results = palette_benchmark.bench_end_to_end(iterations=3)
+    assert [row["generator"] for row in results] == [label for label, _, _ in palette_benchmark.GENERATORS]
+    assert all(row["identical"] for row in results)
+
+def test_baseline_path_restores_the_tables():
+    table = make_palette_analogous.ANALOGOUS_TABLE
+    with palette_benchmark.baseline_palette_path():
+        assert not isinstance(make_palette_analogous.ANALOGOUS_TABLE, color_math.PaletteTable)
+        assert make_palette_analogous.find_closest_color_name is not color_math.find_closest_color_name
+    assert make_palette_analogous.ANALOGOUS_TABLE is table
+    assert make_palette_analogous.find_closest_color_name is color_math.find_closest_color_name
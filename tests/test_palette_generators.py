@@ -0,0 +1,17 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.make_palette_double_complementary import (
+    TETRADIC_TABLE, generate_double_complementary_palette_4, generate_double_complementary_palette_5)
+
+@pytest.mark.parametrize("generator", [generate_double_complementary_palette_4, generate_double_complementary_palette_5])
+def test_tetradic_raises_when_no_base_is_usable(generator):
+    # HONEYDEW's tetradic palettes repeat a color name at both sizes.
+    with pytest.raises(ValueError):
+        generator(["HONEYDEW"], rng=random.Random(1))
+
+def test_tetradic_falls_back_to_a_usable_base():
+    # One usable base among many unusable ones is still found after the capped attempts.
+    palette = generate_double_complementary_palette_5(["HONEYDEW"] * 500 + ["CRIMSON"], rng=random.Random(2))
+    assert palette == list(TETRADIC_TABLE["CRIMSON"][5])
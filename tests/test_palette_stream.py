@@ -0,0 +1,29 @@
+import random
+
+from ebu_prompthelper import palette_stream
+from ebu_prompthelper.nodes import EbuPromptHelperRandomColorPalette, EbuPromptHelperRandomColorPaletteStream
+
+PALETTE_INPUTS = [True] * 8 + ["4 colors", "None", "None"]
+
+def test_changing_seeds_continue_one_stream_without_repeats():
+    node = EbuPromptHelperRandomColorPaletteStream()
+    window = 128
+    node.next_palette(*PALETTE_INPUTS, 0, window, True)
+    seeds = random.Random(1).sample(range(1 << 32), 1000)
+    outputs = [node.next_palette(*PALETTE_INPUTS, seed, window, False) for seed in seeds]
+    assert [output[-1] for output in outputs] == list(range(1, 1001))
+    keys = [frozenset(output[0].split(", ")) for output in outputs]
+    for i, key in enumerate(keys):
+        assert key not in keys[max(0, i - window + 1):i]
+
+def test_first_palette_matches_the_single_palette_node():
+    node = EbuPromptHelperRandomColorPaletteStream()
+    first = node.next_palette(*PALETTE_INPUTS, 42, 16, True)
+    assert first[:-1] == EbuPromptHelperRandomColorPalette().generate_palette(*PALETTE_INPUTS, 42)
+    assert first[-1] == 0
+
+def test_stream_dedupes_color_sets_in_any_order():
+    draws = iter([(["A", "B"], "t"), (["B", "A"], "t"), (["A", "C"], "t")])
+    stream = palette_stream.PaletteStream(0, 4)
+    assert stream.next(lambda rng: next(draws))[0] == ["A", "B"]
+    assert stream.next(lambda rng: next(draws))[0] == ["A", "C"]
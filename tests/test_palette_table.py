@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.color_data import BASE_COLOR_CANDIDATES
+from ebu_prompthelper.make_palette_complementary import COMPLEMENTARY_TABLE
+from ebu_prompthelper.make_palette_modified_compound import COMPOUND_TABLE
+from ebu_prompthelper.nodes import EbuPromptHelperRandomColorPalette
+from ebu_prompthelper.palette_table import PALETTE_TYPES, eligible_base_colors, palette_core, palette_satisfies
+
+def _pick_palettes(palette_type, palette_size, prefer, avoid, count=100):
+    node = EbuPromptHelperRandomColorPalette
+    settings = node.palette_settings(*[palette_type == t for t in PALETTE_TYPES], palette_size, prefer, avoid)
+    # The base colors the node draws from; None when this palette type cannot meet the settings.
+    return settings[0][palette_type], [node.pick_palette(*settings, rng=random.Random(seed)) for seed in range(count)]
+
+# Preferences that only a Broad Neutral extra could meet, which 3-color palettes truncate away.
+@pytest.mark.parametrize("palette_type, prefer", [
+    ("triadic", "Neutrals"),
+    ("split complementary", "Metallics"),
+    ("analogous", "Neutrals"),
+])
+def test_three_color_eligibility_ignores_truncated_extras(palette_type, prefer):
+    for name in eligible_base_colors(palette_type, 3, prefer, "None"):
+        assert palette_satisfies(palette_core(palette_type, 3, name), prefer, "None")
+    base_colors, picks = _pick_palettes(palette_type, "3 colors", prefer, "None")
+    if not base_colors:
+        return  # No base can meet the preference; the node warns and uses the other types.
+    for palette, chosen_type in picks:
+        assert chosen_type == palette_type
+        assert len(set(palette)) == 3
+        assert palette_satisfies(palette, prefer, "None")
+
+def test_three_color_complementary_bases_have_four_unique_names():
+    eligible = set(eligible_base_colors("complementary", 3, "Purples", "None"))
+    for name in eligible:
+        assert len(set(COMPLEMENTARY_TABLE[name][4])) == 4
+    base_colors, picks = _pick_palettes("complementary", "3 colors", "Purples", "None")
+    if base_colors:
+        assert all(palette_satisfies(palette, "Purples", "None") for palette, _ in picks)
+
+def test_compound_eligibility_uses_the_sampled_colors():
+    # A 4-color compound palette is a sample of the 5-name core, so a base whose core has one
+    # avoided color can still produce conforming palettes by leaving it out.
+    eligible = set(eligible_base_colors("compound", 4, "None", "Blues"))
+    sampled_out = [name for name in eligible if not palette_satisfies(COMPOUND_TABLE[name], "None", "Blues")]
+    assert sampled_out
+    for name in eligible:
+        assert len(set(COMPOUND_TABLE[name])) == 5
+
+@pytest.mark.parametrize("palette_type", ["analogous", "complementary", "compound",
+                                          "split complementary", "tetradic", "triadic"])
+@pytest.mark.parametrize("palette_size", ["3 colors", "4 colors", "5 colors"])
+@pytest.mark.parametrize("prefer, avoid", [("Greys", "None"), ("Warm Colors", "None"), ("None", "Reds")])
+def test_eligible_bases_always_conform(palette_type, palette_size, prefer, avoid):
+    base_colors, picks = _pick_palettes(palette_type, palette_size, prefer, avoid, count=40)
+    if not base_colors:
+        return
+    assert set(base_colors) <= set(BASE_COLOR_CANDIDATES)
+    for palette, _ in picks:
+        assert len(set(palette)) == len(palette)
+        assert palette_satisfies(palette, prefer, avoid)
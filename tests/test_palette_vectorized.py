@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from ebu_prompthelper import palette_vectorized
+from ebu_prompthelper.palette_table import palette_core
+
+needs_numpy = pytest.mark.skipif(not palette_vectorized.use_numpy(), reason="NumPy backend unavailable")
+
+def _scalar(palette_type, size, count, seed, base_colors=None):
+    rng = random.Random(seed)
+    generator = palette_vectorized.GENERATORS[(palette_type, size)]
+    return [generator(base_colors, rng=rng) for _ in range(count)]
+
+@pytest.mark.parametrize("palette_type, size", sorted(palette_vectorized.GENERATORS))
+def test_palettes_match_the_scalar_generators(palette_type, size):
+    assert palette_vectorized.generate_palettes(palette_type, size, 200, seed=4) == _scalar(palette_type, size, 200, 4)
+
+@pytest.mark.parametrize("palette_type, size", [("complementary", 4), ("compound", 5), ("tetradic", 5)])
+def test_indices_match_the_scalar_generators_with_fallbacks(palette_type, size):
+    # Mostly unusable bases, so some palettes come from the generators' fallbacks.
+    base_colors = ["HONEYDEW"] * 60 + ["SCARLET"]
+    expected = _scalar(palette_type, size, 50, 7, base_colors)
+    indices = palette_vectorized.generate_palettes(palette_type, size, 50, seed=7, base_colors=base_colors,
+                                                   as_indices=True)
+    assert [[palette_vectorized.COLOR_NAMES[i] for i in row] for row in list(indices)] == expected
+
+@pytest.mark.parametrize("numpy_rng", [False, True])
+def test_unusable_tetradic_bases_raise(numpy_rng):
+    with pytest.raises(ValueError):
+        palette_vectorized.generate_palettes("tetradic", 5, 3, seed=1, base_colors=["HONEYDEW"], numpy_rng=numpy_rng)
+
+@needs_numpy
+@pytest.mark.parametrize("palette_type", palette_vectorized.ARRAY_PALETTE_TYPES)
+@pytest.mark.parametrize("size", [4, 5])
+def test_numpy_rng_palettes_have_unique_names(palette_type, size):
+    palettes = palette_vectorized.generate_palettes(palette_type, size, 2000, seed=3, as_indices=True, numpy_rng=True)
+    assert palettes.shape == (2000, size)
+    assert all(len(set(row)) == size for row in palettes.tolist())
+
+@needs_numpy
+def test_numpy_rng_palettes_are_seeded_and_respect_base_colors():
+    base_colors = ["CRIMSON", "COBALT BLUE"]
+    first = palette_vectorized.generate_palettes("tetradic", 4, 500, seed=9, base_colors=base_colors, numpy_rng=True)
+    assert first == palette_vectorized.generate_palettes("tetradic", 4, 500, seed=9, base_colors=base_colors,
+                                                         numpy_rng=True)
+    cores = {tuple(palette_core("tetradic", 4, name)) for name in base_colors}
+    assert {tuple(palette) for palette in first} <= cores
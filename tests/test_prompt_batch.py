@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from ebu_prompthelper import prompt_batch
+from ebu_prompthelper.nodes import EbuPromptHelperPromptBatch
+
+TEMPLATE = "a {red|blue} car, __color1__, __hair_color__ hair, __weather__"
+
+def test_prompts_are_seeded_and_reproducible_one_at_a_time():
+    prompts = prompt_batch.render_prompts(TEMPLATE, 20, seed=5)
+    assert prompts == prompt_batch.render_prompts(TEMPLATE, 20, seed=5)
+    # Prompt i is rendered with seed + i, so it can be reproduced on its own.
+    assert [prompt_batch.render_prompts(TEMPLATE, 1, seed=5 + i)[0] for i in range(20)] == prompts
+    assert len(set(prompts)) > 1
+    assert not any("__" in prompt for prompt in prompts)
+
+def test_context_groups_only_run_when_used(monkeypatch):
+    calls = []
+    monkeypatch.setitem(prompt_batch.CONTEXT_GROUPS, "weather",
+                        lambda seed, settings: calls.append(seed) or {"weather": "spring"})
+    assert prompt_batch.render_prompts("{a|b}", 3, seed=0) and not calls
+    assert prompt_batch.render_prompts("__weather__ __weather__", 3, seed=0) == ["spring spring"] * 3
+    assert len(calls) == 3
+
+def test_invalid_settings_and_templates_raise():
+    with pytest.raises(ValueError):
+        prompt_batch.render_prompts("x", 1, settings={"not_a_setting": 1})
+    with pytest.raises(ValueError):
+        prompt_batch.render_prompts("{x", 1)
+
+def test_node_renders_and_writes_jsonl(tmp_path):
+    output_file = tmp_path / "prompts.jsonl"
+    node = EbuPromptHelperPromptBatch()
+    (prompts,) = node.render_batch(TEMPLATE, 10, 3, "4 colors", "None", "None", "male", "", str(output_file))
+    assert prompts == prompt_batch.render_prompts(TEMPLATE, 10, seed=3, settings={"character": "male"})
+    records = [json.loads(line) for line in output_file.read_text(encoding="utf-8").splitlines()]
+    assert [(r["index"], r["seed"], r["prompt"]) for r in records] == [(i, 3 + i, p) for i, p in enumerate(prompts)]
+    assert node.render_batch("{x", 10, 3, "4 colors", "None", "None", "male") == ([],)
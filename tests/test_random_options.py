@@ -0,0 +1,27 @@
+import random
+
+from ebu_prompthelper.nodes import EbuPromptHelperRandomize
+from ebu_prompthelper.random_options import parse_options, split_options
+
+def test_split_options_by_delimiter():
+    assert split_options(" a \n\n b ") == ["a", "b"]
+    assert split_options("a, b,,c", "commas") == ["a", "b", "c"]
+    assert split_options("a; b;", "semi-colons") == ["a", "b"]
+
+def test_parse_options_weights_and_caching():
+    sampler = parse_options("red\n3>>green\n0>>never\n 0.5 >> blue ")
+    assert sampler.options == ("red", "green", "blue")
+    assert sampler.cum_weights == [1, 4, 4.5]
+    # Unchanged options text is parsed once.
+    assert parse_options("red\n3>>green\n0>>never\n 0.5 >> blue ") is sampler
+    assert parse_options("0>>never") is None
+    assert parse_options("") is None
+
+def test_randomize_is_seeded():
+    node = EbuPromptHelperRandomize()
+    options = "cat\ndog\n2>>bird"
+    runs = [node.randomize_text("a pet", "pet", options, seed, True, "newlines") for seed in range(40)]
+    assert runs == [node.randomize_text("a pet", "pet", options, seed, True, "newlines") for seed in range(40)]
+    assert {selected for _, selected in runs} == {"cat", "dog", "bird"}
+    assert all(text == f"a {selected}" for text, selected in runs)
+    assert node.randomize_text("a pet", "pet", "0>>cat", 1, True, "newlines") == ("a pet", "")
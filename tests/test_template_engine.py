@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.nodes import EbuPromptHelperTemplate
+from ebu_prompthelper.template_engine import parse_template, render_template
+
+def _render(text, seed=0, **kwargs):
+    return render_template(text, random.Random(seed), **kwargs)
+
+def test_escapes_are_literal():
+    assert _render(r"\{a\|b\} \_\_x\_\_ \\") == "{a|b} __x__ \\"
+    # A backslash before any other character is kept.
+    assert _render(r"a\nb") == r"a\nb"
+
+def test_nested_choices_and_weights():
+    results = {_render("{a {big|small} cat|0>>never}", seed) for seed in range(50)}
+    assert results == {"a big cat", "a small cat"}
+
+def test_nested_wildcards(tmp_path):
+    (tmp_path / "animal.txt").write_text("# comment\n__size__ cat\n", encoding="utf-8")
+    (tmp_path / "size.txt").write_text("{big|small}\n", encoding="utf-8")
+    results = {_render("a __animal__", seed, wildcard_dir=str(tmp_path)) for seed in range(50)}
+    assert results == {"a big cat", "a small cat"}
+
+def test_unresolved_and_recursive_wildcards_are_left_as_written(tmp_path):
+    (tmp_path / "loop.txt").write_text("__loop__\n", encoding="utf-8")
+    assert _render("__missing__", wildcard_dir=str(tmp_path)) == "__missing__"
+    assert _render("__loop__", wildcard_dir=str(tmp_path)) == "__loop__"
+    # Names that would leave the wildcard directory are not read.
+    (tmp_path.parent / "secret.txt").write_text("leaked\n", encoding="utf-8")
+    assert _render("__sub/../../secret__", wildcard_dir=str(tmp_path)) == "__sub/../../secret__"
+
+def test_variables_take_precedence():
+    assert _render("hello __name__", variables={"name": "{not|parsed}"}) == "hello {not|parsed}"
+
+@pytest.mark.parametrize("text", ["{a|b", "x {a|{b}", "{"])
+def test_unclosed_choices_raise(text):
+    with pytest.raises(ValueError):
+        parse_template(text)
+
+def test_node_returns_malformed_templates_unchanged():
+    assert EbuPromptHelperTemplate().render("{a|b", 0) == ("{a|b",)
+
+def test_stray_closing_brace_and_bar_are_literal():
+    assert _render("a}b|c") == "a}b|c"
+
+def test_malformed_wildcard_lines_are_used_as_written(tmp_path):
+    (tmp_path / "bad.txt").write_text("{oops\n", encoding="utf-8")
+    assert _render("__bad__", wildcard_dir=str(tmp_path)) == "{oops"
@@ -0,0 +1,32 @@
+from ebu_prompthelper.nodes import EbuPromptHelperRandomize, EbuPromptHelperReplace
+from ebu_prompthelper.text_replace import compile_word_matcher, replace_words
+
+def test_longest_word_wins_at_each_position():
+    assert replace_words("a woman and a man", "man|woman", "person") == "a person and a person"
+    assert replace_words("catalog cat", "cat|catalog", "X") == "X X"
+
+def test_case_insensitive_matching():
+    assert replace_words("Man MAN man", "man", "x", case_sensitive=False) == "x x x"
+    assert replace_words("Man MAN man", "man", "x", case_sensitive=True) == "Man MAN x"
+
+def test_empty_entries_are_ignored():
+    assert replace_words("a b", "|a||", "c") == "c b"
+    assert compile_word_matcher("||") is None
+    assert replace_words("a b", "||", "c") == "a b"
+
+def test_replacement_text_is_not_rescanned():
+    assert replace_words("cat dog", "cat|dog", "dog") == "dog dog"
+    assert replace_words("cat", "cat", "catcat") == "catcat"
+    # Backslashes and group references in the replacement are taken literally.
+    assert replace_words("cat", "cat", r"\1\n") == r"\1\n"
+
+def test_very_long_words():
+    word = "x" * 3000
+    assert EbuPromptHelperReplace().replace_text(f"a {word} b", word, "y", True) == ("a y b",)
+    text, selected = EbuPromptHelperRandomize().randomize_text(f"a {word} b", word, "y", 0, True, "newlines")
+    assert (text, selected) == ("a y b", "y")
+
+def test_deeply_nested_words_keep_longest_match():
+    # Too deeply nested for the trie regex, so the matcher falls back to a plain alternation.
+    words = "|".join("a" * k for k in range(1, 600))
+    assert replace_words("b" + "a" * 700 + "b", words, "Z") == "bZZb"
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from ebu_prompthelper.nodes import EbuPromptHelperRandomize
+from ebu_prompthelper.weighted_sampler import WeightedSampler
+
+def test_pick_repeated_matches_choice_over_the_expanded_list():
+    weighted = [("a", 3), ("b", 1), ("c", 5)]
+    expanded = [option for option, weight in weighted for _ in range(weight)]
+    sampler = WeightedSampler(weighted)
+    for seed in range(200):
+        assert sampler.pick_repeated(random.Random(seed)) == random.Random(seed).choice(expanded)
+
+def test_pick_matches_choices():
+    weighted = [("a", 0.5), ("b", 2), ("c", 1.25)]
+    sampler = WeightedSampler(weighted)
+    options, weights = zip(*weighted)
+    for seed in range(200):
+        assert sampler.pick(random.Random(seed)) == random.Random(seed).choices(options, weights)[0]
+        # Fractional weights make pick_repeated use pick.
+        assert sampler.pick_repeated(random.Random(seed)) == sampler.pick(random.Random(seed))
+
+def test_invalid_weights_raise():
+    with pytest.raises(ValueError):
+        WeightedSampler([])
+    with pytest.raises(ValueError):
+        WeightedSampler([("a", 0)])
+
+def test_randomize_matches_expanding_the_weighted_options():
+    # The node used to list each option `weight` times and take random.choice with the seed.
+    node = EbuPromptHelperRandomize()
+    expanded = ["cat"] * 4 + ["dog"] + ["bird"] * 2
+    for seed in range(100):
+        selected = node.randomize_text("x", "x", "4>>cat\ndog\n2>>bird", seed, True, "newlines")[1]
+        assert selected == random.Random(seed).choice(expanded)
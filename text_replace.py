@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import re
+from functools import lru_cache
+
+# ----------------------------
+# Multi-Word Matching
+# ----------------------------
+def _trie_pattern(trie):
+    """
+    Regex for a trie. Child branches are tried before ending at a node, so the first match found
+    at a position is the longest word that matches there. Built bottom-up without recursion, so
+    word length is not limited by the recursion limit.
+    """
+    patterns = {}  # id(node) -> pattern of the words below that node
+    stack = [(trie, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for ch, child in node.items() if ch)
+            continue
+        branches = [re.escape(ch) + patterns.pop(id(child)) for ch, child in node.items() if ch]
+        if not branches:
+            pattern = ''
+        elif len(branches) == 1 and '' not in node:
+            pattern = branches[0]
+        else:
+            group = '(?:' + '|'.join(branches) + ')'
+            pattern = group + '?' if '' in node else group
+        patterns[id(node)] = pattern
+    return patterns[id(trie)]
+
+@lru_cache(maxsize=256)
+def compile_word_matcher(word_to_replace, case_sensitive=True):
+    """
+    Compile the '|'-separated words of word_to_replace into one regex that finds all of them in a
+    single left-to-right pass, preferring the longest word at each position. The words are merged
+    into a trie so matching cost depends on word length, not on how many words there are.
+    Empty words are ignored; returns None if there are none. Compiled matchers are kept in an
+    LRU cache keyed by (word_to_replace, case_sensitive).
+    """
+    words = word_to_replace.split("|")
+    if not case_sensitive:
+        words = [word.lower() for word in words]
+    trie = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    if not trie:
+        return None
+    flags = 0 if case_sensitive else re.IGNORECASE
+    try:
+        return re.compile(_trie_pattern(trie), flags)
+    except (RecursionError, re.error):
+        # Very deeply nested tries (many long words sharing prefixes) exceed the regex compiler's
+        # limits; an alternation tried longest word first matches the same text.
+        unique_words = sorted({word for word in words if word}, key=len, reverse=True)
+        return re.compile('|'.join(re.escape(word) for word in unique_words), flags)
+
+def replace_words(text, word_to_replace, replace_with, case_sensitive=True):
+    """
+    Replace every occurrence of the '|'-separated words in text with replace_with (taken literally),
+    in one pass. Replacement text is never rescanned for further matches.
+    """
+    matcher = compile_word_matcher(word_to_replace, case_sensitive)
+    if matcher is None:
+        return text
+    return matcher.sub(lambda _: replace_with, text)
@@ -269,7 +269,7 @@ fall_weather = {
     ]
 }
 
-def generate_weather_description(abstract_datetime_str):
+def generate_weather_description(abstract_datetime_str, rng=random):
     """
     Generates a detailed, singular weather description based on an abstract datetime string.
     The abstract_datetime_str should include keywords indicating the season ("winter", "spring",
@@ -316,4 +316,4 @@ def generate_weather_description(abstract_datetime_str):
     # Use weighted random selection.
     descriptions = [opt[0] for opt in options]
     weights = [opt[1] for opt in options]
-    return random.choices(descriptions, weights=weights, k=1)[0]
+    return rng.choices(descriptions, weights=weights, k=1)[0]
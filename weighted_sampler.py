@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+import random
+from bisect import bisect
+from itertools import accumulate
+
+class WeightedSampler:
+    """
+    Weighted random choice over a fixed list of (option, weight) pairs.
+
+    The option/weight split and the cumulative weights are computed once, so each pick is a
+    single rng.random() call plus a bisect with no allocation. Picks are identical to
+    rng.choices(options, weights)[0] for the same random state.
+    """
+    __slots__ = ("options", "cum_weights", "total", "integral", "_hi")
+
+    def __init__(self, weighted_options):
+        if not weighted_options:
+            raise ValueError("WeightedSampler needs at least one option.")
+        options, weights = zip(*weighted_options)
+        self.options = options
+        self.cum_weights = list(accumulate(weights))
+        self.total = self.cum_weights[-1] + 0.0
+        self.integral = all(isinstance(w, int) for w in weights)
+        if self.total <= 0.0:
+            raise ValueError("Total of weights must be greater than zero.")
+        self._hi = len(options) - 1
+
+    def __len__(self):
+        return len(self.options)
+
+    def pick(self, rng=random):
+        """Return one option, drawn from rng with probability proportional to its weight."""
+        return self.options[bisect(self.cum_weights, rng.random() * self.total, 0, self._hi)]
+
+    def pick_repeated(self, rng=random):
+        """
+        Return one option as if each were listed `weight` times and one entry were taken with
+        rng.choice, without building that list. Identical to that rng.choice call when all
+        weights are integers; fractional weights fall back to pick().
+        """
+        if not self.integral:
+            return self.pick(rng)
+        return self.options[bisect(self.cum_weights, rng.randrange(self.cum_weights[-1]))]